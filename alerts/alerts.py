@@ -3,59 +3,50 @@
 
 Generates in-app alerts based on the latest DataFrame signals.
 Pure logic: reads DataFrame, returns list of message strings.
+
+The threshold rules are `alerts.rules.DEFAULT_RULES`, compiled once and
+evaluated in a single vectorized pass; user-defined rules and de-duplication
+across refreshes live in `alerts.rules.AlertEngine`.
 """
 from __future__ import annotations
 
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 from config import BUY_THRESHOLD
+from alerts.rules import DEFAULT_RULES, RuleSet
+from features.topk import Ranker
 
 __all__ = ["generate_alerts"]
 
+_RULES = RuleSet(DEFAULT_RULES)
+
 
-def generate_alerts(df: pd.DataFrame) -> list[str]:
-    """Return list of alert messages for the UI to display."""
+def generate_alerts(df: pd.DataFrame, ranker: Optional[Ranker] = None) -> list[str]:
+    """Return list of alert messages for the UI to display.
+
+    Pass the data version's shared `Ranker` to reuse its SmartScore order.
+    """
     alerts: list[str] = []
+    ranker = ranker or Ranker(df)
 
     # 1️⃣ New Buy Opportunities
-    buy_df = df[df['tag'] == '🟢 BUY']
-    if not buy_df.empty:
-        top_buys = buy_df.nlargest(5, 'smartscore')
-        tickers = top_buys['ticker'].tolist()
+    top_buys = ranker.top(5, 'smartscore', mask=(df['tag'] == '🟢 BUY').to_numpy())
+    if len(top_buys):
+        tickers = df['ticker'].take(top_buys).tolist()
         alerts.append(
             f"🚀 Top Buy Candidates: {', '.join(tickers)}"
         )
 
-    # 2️⃣ Momentum Spike
-    if 'momentum_score' in df.columns:
-        high_mom = df[df['momentum_score'] >= 90]
-        if not high_mom.empty:
-            symbols = high_mom['ticker'].tolist()
-            alerts.append(
-                f"📈 High Momentum Alert: {', '.join(symbols[:5])}" + (
-                    '...' if len(symbols) > 5 else ''
-                )
-            )
-
-    # 3️⃣ Volume Surge
-    if 'volume_score' in df.columns:
-        high_vol = df[df['volume_score'] >= 90]
-        if not high_vol.empty:
-            symbols = high_vol['ticker'].tolist()
-            alerts.append(
-                f"🔔 Volume Spike Alert: {', '.join(symbols[:5])}" + (
-                    '...' if len(symbols) > 5 else ''
-                )
-            )
-
-    # 4️⃣ Mixed Signals: low value but strong momentum
-    if {'value_score', 'momentum_score'}.issubset(df.columns):
-        mixed = df[(df['value_score'] <= 30) & (df['momentum_score'] >= 70)]
-        if not mixed.empty:
-            syms = mixed['ticker'].tolist()
+    # 2️⃣ Momentum Spike · 3️⃣ Volume Surge · 4️⃣ Mixed Signals (low value, strong momentum)
+    hits, available = _RULES.evaluate(df)
+    for r, rule in enumerate(_RULES.rules):
+        rows = np.flatnonzero(hits[:, r])
+        if available[r] and len(rows):
+            symbols = df['ticker'].take(rows[:rule.limit]).tolist()
             alerts.append(
-                f"⚖️ Contrast Alert (Value & Momentum): {', '.join(syms[:5])}" + (
-                    '...' if len(syms) > 5 else ''
-                )
+                f"{rule.message}: {', '.join(symbols)}" + ('...' if len(rows) > rule.limit else '')
             )
 
     return alerts
@@ -0,0 +1,403 @@
+# alerts/rules.py
+"""Alert Rule Engine
+
+Declarative, user-defined alert rules compiled into one vectorized pass.
+
+A rule is plain data (JSON-friendly)::
+
+    {"name": "Contrast", "message": "⚖️ Contrast Alert",
+     "when": {"all": ["value_score <= 30", "momentum_score >= 70"]},
+     "cooldown": 86400}
+
+``when`` is a condition — ``"column op value"``, ``{"column", "op",
+"value"}`` or ``[column, op, value]`` — or an ``{"all": [...]}`` /
+``{"any": [...]}`` composition of conditions.  In the string form an
+unquoted decimal literal (``70``, ``-1.5``, ``1e3``) is a number and
+anything else — including ``nan`` / ``inf`` and every quoted value, as in
+``"name == '70'"`` — is compared as text.
+
+`RuleSet` compiles every rule to disjunctive normal form over the set of
+*distinct* conditions.  Evaluation compares each column once against all
+of its thresholds (one broadcast per column and operator), then resolves
+every conjunction and every rule with two small matrix products, so the
+cost grows with the number of distinct columns, not with the rule count.
+
+`AlertEngine` adds persistent state: per rule it remembers which tickers
+were active and when each one last fired, emits only tickers that newly
+match, holds re-triggers back for the rule's cooldown, and evaluates each
+data version once no matter how many reruns, sessions or dashboard
+processes ask: evaluation re-reads the state file under a cross-process
+lock, and a version another process already evaluated returns its
+persisted events instead of firing again.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Final, Iterable, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+from config import ALERT_RULES_FILE, SNAPSHOT_DIR
+from storage.filelock import file_lock
+
+__all__ = [
+    "Condition",
+    "All",
+    "AnyOf",
+    "AlertRule",
+    "AlertEvent",
+    "RuleSet",
+    "AlertEngine",
+    "parse_rule",
+    "load_rules",
+    "DEFAULT_RULES",
+]
+
+OPS: Final[dict[str, Callable[[Any, Any], np.ndarray]]] = {
+    ">":  np.greater,
+    ">=": np.greater_equal,
+    "<":  np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+_NUMBER: Final[re.Pattern[str]] = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+DEFAULT_COOLDOWN: Final[float] = 24 * 3600.0  # seconds before a ticker may re-fire
+STATE_FILE: Final[Path] = SNAPSHOT_DIR / "alerts" / "state.json"
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📐 Rule format
+# ────────────────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Condition:
+    """``column op value``; NaN never matches an ordering comparison.
+
+    Text values compare as strings against the non-null cells of the column.
+    """
+
+    column: str
+    op: str
+    value: Union[float, str]
+
+    def __post_init__(self) -> None:
+        if self.op not in OPS:
+            raise ValueError(f"Unknown operator {self.op!r}; expected one of {sorted(OPS)}")
+
+
+@dataclass(frozen=True)
+class All:
+    parts: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class AnyOf:
+    parts: tuple["Node", ...]
+
+
+Node = Union[Condition, All, AnyOf]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """One alert: fires for the tickers matching *when*.
+
+    Args:
+        name: Unique rule name (keys the persisted state).
+        when: Condition tree.
+        message: Message prefix (default: the name).
+        cooldown: Seconds before the same ticker may fire again.
+        limit: Tickers listed in the message before "...".
+    """
+
+    name: str
+    when: Node
+    message: str = ""
+    cooldown: float = DEFAULT_COOLDOWN
+    limit: int = 5
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """Tickers that newly triggered one rule."""
+
+    rule: AlertRule
+    tickers: tuple[str, ...]
+
+    @property
+    def message(self) -> str:
+        shown = self.tickers[: self.rule.limit]
+        more = "..." if len(self.tickers) > self.rule.limit else ""
+        return f"{self.rule.message or self.rule.name}: {', '.join(shown)}{more}"
+
+
+def _number(text: str) -> Union[float, str]:
+    """Decimal literal as float; quoted or other text (``nan``, ``inf``) as str."""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    return float(text) if _NUMBER.fullmatch(text) else text
+
+
+def _parse_node(spec: Any) -> Node:
+    if isinstance(spec, (Condition, All, AnyOf)):
+        return spec
+    if isinstance(spec, str):
+        # Longest operators first so ">=" is not read as ">"
+        for op in sorted(OPS, key=len, reverse=True):
+            column, sep, value = spec.partition(f" {op} ")
+            if sep:
+                return Condition(column.strip(), op, _number(value))
+        raise ValueError(f"Cannot parse condition {spec!r}")
+    if isinstance(spec, Mapping):
+        if "all" in spec:
+            return All(tuple(_parse_node(p) for p in spec["all"]))
+        if "any" in spec:
+            return AnyOf(tuple(_parse_node(p) for p in spec["any"]))
+        return Condition(spec["column"], spec["op"], spec["value"])
+    if isinstance(spec, (list, tuple)) and len(spec) == 3:
+        return Condition(spec[0], spec[1], spec[2])
+    raise ValueError(f"Cannot parse condition {spec!r}")
+
+
+def parse_rule(spec: Mapping[str, Any] | AlertRule) -> AlertRule:
+    """Build an `AlertRule` from its dict form."""
+    if isinstance(spec, AlertRule):
+        return spec
+    return AlertRule(
+        name=spec["name"],
+        when=_parse_node(spec["when"]),
+        message=spec.get("message", ""),
+        cooldown=float(spec.get("cooldown", DEFAULT_COOLDOWN)),
+        limit=int(spec.get("limit", 5)),
+    )
+
+
+def load_rules(path: Path = ALERT_RULES_FILE) -> list[AlertRule]:
+    """User rules from a JSON list of rule dicts (none if the file is absent)."""
+    try:
+        specs = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return []
+    return [parse_rule(spec) for spec in specs]
+
+
+# Built-in threshold alerts shown on every render (`generate_alerts`)
+DEFAULT_RULES: Final[list[dict[str, Any]]] = [
+    {"name": "high_momentum", "message": "📈 High Momentum Alert",
+     "when": "momentum_score >= 90"},
+    {"name": "volume_spike", "message": "🔔 Volume Spike Alert",
+     "when": "volume_score >= 90"},
+    {"name": "contrast", "message": "⚖️ Contrast Alert (Value & Momentum)",
+     "when": {"all": ["value_score <= 30", "momentum_score >= 70"]}},
+]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Compilation & vectorized evaluation
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _dnf(node: Node) -> list[frozenset[Condition]]:
+    """Node as an OR of ANDs of conditions."""
+    if isinstance(node, Condition):
+        return [frozenset([node])]
+    if isinstance(node, AnyOf):
+        return [conj for part in node.parts for conj in _dnf(part)]
+    terms = [frozenset()]
+    for part in node.parts:
+        terms = [a | b for a in terms for b in _dnf(part)]
+    return terms
+
+
+class RuleSet:
+    """Rules compiled to a (conditions × conjunctions × rules) program."""
+
+    def __init__(self, rules: Iterable[AlertRule | Mapping[str, Any]]) -> None:
+        self.rules = [parse_rule(r) for r in rules]
+        names = [r.name for r in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Alert rule names must be unique")
+
+        conjs: dict[frozenset[Condition], int] = {}
+        rule_conjs: list[list[int]] = []
+        for rule in self.rules:
+            rule_conjs.append([conjs.setdefault(c, len(conjs)) for c in _dnf(rule.when)])
+        self.conditions = sorted({c for conj in conjs for c in conj}, key=repr)
+        pos = {c: i for i, c in enumerate(self.conditions)}
+
+        # needs[q, l]: conjunction q requires condition l; member[q, r]: q is a term of rule r
+        self._needs = np.zeros((len(conjs), len(self.conditions)), dtype=np.float32)
+        for conj, q in conjs.items():
+            self._needs[q, [pos[c] for c in conj]] = 1
+        self._member = np.zeros((len(conjs), len(self.rules)), dtype=np.float32)
+        for r, qs in enumerate(rule_conjs):
+            self._member[qs, r] = 1
+
+        # Conditions grouped by (column, op, numeric?) → one broadcast each
+        groups: dict[tuple[str, str, bool], list[int]] = {}
+        for i, c in enumerate(self.conditions):
+            numeric = not isinstance(c.value, str)
+            groups.setdefault((c.column, c.op, numeric), []).append(i)
+        self._groups = [
+            (col, op, numeric, np.asarray(idx), np.asarray([self.conditions[i].value for i in idx],
+                                                            dtype=np.float64 if numeric else object))
+            for (col, op, numeric), idx in groups.items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Match matrix ``(rows, rules)`` and per-rule availability.
+
+        A rule is unavailable when every one of its terms needs a column the
+        frame does not have; such terms never match.
+        """
+        n = len(df)
+        matched = np.zeros((n, len(self.conditions)), dtype=bool)
+        missing = np.zeros(len(self.conditions), dtype=bool)
+        for col, op, numeric, idx, values in self._groups:
+            if col not in df.columns:
+                missing[idx] = True
+                continue
+            if numeric:
+                series = df[col]
+                if not pd.api.types.is_numeric_dtype(series.dtype):
+                    series = pd.to_numeric(series.astype(object), errors="coerce")
+                column = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                with np.errstate(invalid="ignore"):
+                    matched[:, idx] = OPS[op](column[:, None], values[None, :])
+            else:
+                # Nulls would raise in ordering comparisons with str: like
+                # NaN they only satisfy "!="
+                column = df[col].to_numpy(dtype=object)
+                present = np.flatnonzero(pd.notna(column))
+                matched[:, idx] = op == "!="
+                text = column[present].astype(str)
+                matched[present[:, None], idx[None, :]] = OPS[op](text[:, None], values[None, :].astype(str))
+
+        # A term holds when none of its conditions fail; a rule when any term holds
+        failed = (~matched).astype(np.float32) @ self._needs.T
+        terms = failed == 0
+        usable = (self._needs @ missing.astype(np.float32)) == 0
+        terms &= usable
+        hits = (terms.astype(np.float32) @ self._member) > 0
+        available = (usable.astype(np.float32) @ self._member) > 0
+        return hits, available
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔁 Stateful engine
+# ────────────────────────────────────────────────────────────────────────────────
+
+class AlertEngine:
+    """`RuleSet` plus persisted per-rule state (active tickers, last fire).
+
+    Args:
+        rules: Rules or their dict specs.
+        state_path: JSON state file; None keeps state in memory only.
+        clock: Time source (seconds).
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[AlertRule | Mapping[str, Any]],
+        state_path: Path | None = STATE_FILE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ruleset = RuleSet(rules)
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._active: dict[str, np.ndarray] = {}
+        self._fired: dict[str, dict[str, float]] = {}
+        self._version: str | None = None
+        self._events: list[AlertEvent] = []
+        self._load()
+
+    def _load(self) -> None:
+        """Replace the in-memory state with the persisted one, if any."""
+        if self.state_path is None or not self.state_path.exists():
+            return
+        state = json.loads(self.state_path.read_text())
+        self._version = state.get("version")
+        self._active, self._fired = {}, {}
+        for name, rule_state in state.get("rules", {}).items():
+            self._active[name] = np.asarray(rule_state.get("active", []), dtype=object)
+            self._fired[name] = dict(rule_state.get("fired", {}))
+        by_name = {r.name: r for r in self.ruleset.rules}
+        self._events = [
+            AlertEvent(by_name[name], tuple(tickers))
+            for name, tickers in state.get("events", [])
+            if name in by_name
+        ]
+
+    def _save(self, now: float) -> None:
+        if self.state_path is None:
+            return
+        cooldowns = {r.name: r.cooldown for r in self.ruleset.rules}
+        rules = {}
+        for name, cooldown in cooldowns.items():
+            fired = {t: ts for t, ts in self._fired.get(name, {}).items() if now - ts < cooldown}
+            active = self._active.get(name)
+            if fired or (active is not None and len(active)):
+                rules[name] = {"active": [] if active is None else active.tolist(), "fired": fired}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        events = [[e.rule.name, list(e.tickers)] for e in self._events]
+        tmp.write_text(json.dumps({"version": self._version, "rules": rules, "events": events}))
+        os.replace(tmp, self.state_path)
+
+    def evaluate(self, df: pd.DataFrame, version: str | None = None) -> list[AlertEvent]:
+        """Events for tickers that newly match, honouring cooldowns.
+
+        A *version* already evaluated — here or by another process sharing
+        the state file — returns the same events again, so reruns,
+        concurrent sessions and dashboard workers never re-fire.
+        """
+        with self._lock:
+            if version is not None and version == self._version:
+                return self._events
+            if self.state_path is None:
+                return self._fire(df, version)
+            with file_lock(self.state_path.with_suffix(".lock")):
+                self._load()
+                if version is not None and version == self._version:
+                    return self._events
+                return self._fire(df, version)
+
+    def _fire(self, df: pd.DataFrame, version: str | None) -> list[AlertEvent]:
+        """Fire *version* against the current state and persist; locks held."""
+        now = self.clock()
+        hits, _ = self.ruleset.evaluate(df)
+        tickers = df["ticker"].to_numpy(dtype=object)
+        any_hit = hits.any(axis=0)
+        events: list[AlertEvent] = []
+        for r, rule in enumerate(self.ruleset.rules):
+            previous = self._active.get(rule.name)
+            if not any_hit[r]:
+                if previous is not None and len(previous):
+                    self._active[rule.name] = previous[:0]
+                continue
+            current = tickers[hits[:, r]]
+            fresh = current if previous is None else current[~np.isin(current, previous)]
+            self._active[rule.name] = current
+            if not len(fresh):
+                continue
+            fired = self._fired.setdefault(rule.name, {})
+            emit = [t for t in fresh if now - fired.get(t, -np.inf) >= rule.cooldown]
+            if emit:
+                fired.update(dict.fromkeys(emit, now))
+                events.append(AlertEvent(rule, tuple(emit)))
+        self._version, self._events = version, events
+        self._save(now)
+        return events
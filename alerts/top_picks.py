@@ -5,19 +5,31 @@ Creates a snapshot of top N stocks by SmartScore and saves to CSV in snapshots d
 """
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 from config import SNAPSHOT_DIR, BUY_THRESHOLD
+from features.topk import Ranker
 
 __all__ = ["generate_weekly_top_picks"]
 
 
-def generate_weekly_top_picks(df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
-    """Return top N stocks tagged BUY sorted by SmartScore and save to CSV."""
-    buys = df[df["tag"] == '🟢 BUY']
-    top = buys.nlargest(n, "smartscore")[
-        ["ticker", "name", "current_price", "smartscore", "tag"]
-    ].reset_index(drop=True)
+def generate_weekly_top_picks(
+    df: pd.DataFrame,
+    n: int = 10,
+    ranker: Optional[Ranker] = None,
+    save_to: Optional[Path] = SNAPSHOT_DIR / "weekly_top10.csv",
+) -> pd.DataFrame:
+    """Return top N stocks tagged BUY sorted by SmartScore and save to CSV.
+
+    Pass ``save_to=None`` to skip the snapshot file (batch runs write their own).
+    """
+    ranker = ranker or Ranker(df)
+    rows = ranker.top(n, "smartscore", mask=(df["tag"] == '🟢 BUY').to_numpy())
+    top = df[["ticker", "name", "current_price", "smartscore", "tag"]].take(rows).reset_index(drop=True)
     # Save snapshot
-    filepath = SNAPSHOT_DIR / "weekly_top10.csv"
-    top.to_csv(filepath, index=False)
+    if save_to is not None:
+        save_to.parent.mkdir(parents=True, exist_ok=True)
+        top.to_csv(save_to, index=False)
     return top
@@ -0,0 +1,255 @@
+# backtest/backtest.py
+"""Backtest
+
+Replays a sequence of historical watchlist snapshots through the scoring
+engine and evaluates the SmartScore / tag logic on what happened next.
+
+Snapshots are first aligned into a date × ticker `Panel` (prices,
+sub-scores, smartscore, tag codes).  Everything after that is array
+maths over the whole panel at once:
+
+* forward returns over ``horizon`` snapshots;
+* mean forward return and hit rate (share of positive forward returns)
+  of the BUY / WATCH / AVOID cohorts, the whole universe and a top-N
+  SmartScore portfolio;
+* turnover of the top-N portfolio and of the tags between rebalances.
+
+No I/O except `panel_from_store`, which reads a `SnapshotStore`.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Final, Iterable, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from signals.memo import MEMO
+from signals.smartscore import _SCORE_COLS
+from storage.snapshot_store import SnapshotStore
+from tagging.tagger import TAG_AVOID, TAG_BUY, TAG_WATCH
+
+__all__ = [
+    "COMPONENTS",
+    "TAGS",
+    "Panel",
+    "BacktestResult",
+    "build_panel",
+    "panel_from_store",
+    "forward_returns",
+    "top_n_members",
+    "run_backtest",
+]
+
+# Sub-scores combined by SMART_WEIGHTS, in weight-key order
+COMPONENTS: Final[tuple[str, ...]] = tuple(_SCORE_COLS[k] for k in SMART_WEIGHTS)
+TAGS: Final[tuple[str, ...]] = (TAG_BUY, TAG_WATCH, TAG_AVOID)
+
+_COL_PRICE: Final[str] = "current_price"
+_NO_TAG: Final[int] = -1
+
+Snapshots = Union[Mapping[object, pd.DataFrame], Iterable[tuple[object, pd.DataFrame]]]
+
+
+@dataclass(frozen=True)
+class Panel:
+    """Snapshots aligned on a date × ticker grid (NaN / -1 where absent)."""
+
+    dates: pd.DatetimeIndex
+    tickers: pd.Index
+    price: np.ndarray        # (D, T) float64
+    components: np.ndarray   # (D, T, K) float32, K = len(COMPONENTS)
+    smartscore: np.ndarray   # (D, T) float32
+    tag: np.ndarray          # (D, T) int8 codes into TAGS
+
+    @property
+    def present(self) -> np.ndarray:
+        return self.tag != _NO_TAG
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Per-date backtest series; columns are cohorts (tags, universe, top-N)."""
+
+    horizon: int
+    top_n: int
+    returns: pd.DataFrame    # mean forward return per cohort
+    hit_rate: pd.DataFrame   # share of positive forward returns per cohort
+    counts: pd.DataFrame     # positions with a known forward return
+    turnover: pd.DataFrame   # top-N membership / tag churn vs previous date
+
+    def summary(self) -> pd.DataFrame:
+        """One row per cohort: mean/excess return, pooled hit rate, size."""
+        counts = self.counts.sum()
+        hits = (self.hit_rate * self.counts).sum()
+        excess = self.returns.sub(self.returns["universe"], axis=0)
+        out = pd.DataFrame({
+            "mean_return": self.returns.mean(),
+            "excess_return": excess.mean(),
+            "hit_rate": hits / counts.where(counts > 0),
+            "avg_positions": self.counts.mean(),
+            "periods": self.returns.notna().sum(),
+        })
+        out["turnover"] = np.nan
+        out.loc[f"top_{self.top_n}", "turnover"] = self.turnover["top_n"].mean()
+        return out
+
+
+def _as_items(snapshots: Snapshots) -> list[tuple[pd.Timestamp, pd.DataFrame]]:
+    items = snapshots.items() if isinstance(snapshots, Mapping) else snapshots
+    return sorted(((pd.Timestamp(d), df) for d, df in items), key=lambda kv: kv[0])
+
+
+def build_panel(
+    snapshots: Snapshots,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+    rescore: bool = True,
+) -> Panel:
+    """Align *snapshots* (``{date: frame}`` or ``(date, frame)`` pairs).
+
+    With *rescore* the cleaned frames go through the scoring engine with the
+    given weights and thresholds; otherwise their stored scores are used.
+    Sub-scores are memoized (`signals.memo`), so re-building the panel with
+    other weights or thresholds only recomputes SmartScores and tags.
+    """
+    items = _as_items(snapshots)
+    if not items:
+        raise ValueError("No snapshots to build a panel from")
+    dates = pd.DatetimeIndex([d for d, _ in items])
+
+    tickers, price, comps, smart, tags, day = [], [], [], [], [], []
+    for i, (_, df) in enumerate(items):
+        if rescore:
+            scores = MEMO.compute(df, weights, buy_th, watch_th)
+        else:
+            scores = {c: df[c].to_numpy() for c in (*COMPONENTS, "smartscore", "tag")}
+        tickers.append(df["ticker"].to_numpy(dtype=object))
+        price.append(df[_COL_PRICE].to_numpy(dtype=np.float64))
+        comps.append(np.column_stack([np.asarray(scores[c], dtype=np.float32) for c in COMPONENTS]))
+        smart.append(np.asarray(scores["smartscore"], dtype=np.float32))
+        tags.append(np.asarray(scores["tag"], dtype=object))
+        day.append(np.full(len(df), i, dtype=np.int64))
+
+    rows = np.concatenate(day)
+    cols, universe = pd.factorize(np.concatenate(tickers))
+    shape = (len(dates), len(universe))
+
+    price_m = np.full(shape, np.nan)
+    price_m[rows, cols] = np.concatenate(price)
+    comp_m = np.full((*shape, len(COMPONENTS)), np.nan, dtype=np.float32)
+    comp_m[rows, cols] = np.concatenate(comps)
+    smart_m = np.full(shape, np.nan, dtype=np.float32)
+    smart_m[rows, cols] = np.concatenate(smart)
+    tag_m = np.full(shape, _NO_TAG, dtype=np.int8)
+    tag_m[rows, cols] = pd.Categorical(np.concatenate(tags), categories=list(TAGS)).codes
+    return Panel(dates, pd.Index(universe), price_m, comp_m, smart_m, tag_m)
+
+
+def panel_from_store(
+    store: SnapshotStore | None = None,
+    start: dt.date | str | None = None,
+    end: dt.date | str | None = None,
+    **kwargs,
+) -> Panel:
+    """`build_panel` over the last snapshot of each stored day."""
+    store = store or SnapshotStore()
+    lo = pd.Timestamp(start).date() if start is not None else dt.date.min
+    hi = pd.Timestamp(end).date() if end is not None else dt.date.max
+    days = [d for d in store.dates() if lo <= d <= hi]
+    return build_panel(((d, store.day(d)) for d in days), **kwargs)
+
+
+def forward_returns(price: np.ndarray, horizon: int = 1) -> np.ndarray:
+    """``price[t + horizon] / price[t] - 1`` along axis 0 (NaN at the end)."""
+    out = np.full(price.shape, np.nan)
+    if 0 < horizon < len(price):
+        base = np.where(price[:-horizon] > 0, price[:-horizon], np.nan)
+        out[:-horizon] = price[horizon:] / base - 1.0
+    return out
+
+
+def top_n_members(smartscore: np.ndarray, present: np.ndarray, n: int) -> np.ndarray:
+    """Boolean (D, T) mask of the *n* highest SmartScores per date.
+
+    Ties keep the earlier ticker (stable sort), as ``nlargest`` does.
+    """
+    score = np.where(present & ~np.isnan(smartscore), smartscore.astype(np.float64), -np.inf)
+    order = np.argsort(-score, axis=1, kind="stable")[:, :n]
+    members = np.zeros(score.shape, dtype=bool)
+    np.put_along_axis(members, order, True, axis=1)
+    return members & np.isfinite(score)
+
+
+def _cohort(mask: np.ndarray, fwd: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mean forward return, hit rate and count of *mask* per date."""
+    known = mask & ~np.isnan(fwd)
+    count = known.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(known, fwd, 0.0).sum(axis=1) / count
+        hits = (known & (fwd > 0)).sum(axis=1) / count
+    return mean, hits, count
+
+
+def _turnover(members: np.ndarray) -> np.ndarray:
+    """Share of each date's members that were not members the date before."""
+    out = np.full(len(members), np.nan)
+    if len(members) > 1:
+        kept = (members[1:] & members[:-1]).sum(axis=1)
+        size = members[1:].sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:] = 1.0 - kept / size
+    return out
+
+
+def _tag_turnover(tag: np.ndarray) -> np.ndarray:
+    """Share of tickers present on consecutive dates whose tag changed."""
+    out = np.full(len(tag), np.nan)
+    if len(tag) > 1:
+        both = (tag[1:] != _NO_TAG) & (tag[:-1] != _NO_TAG)
+        changed = (both & (tag[1:] != tag[:-1])).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:] = changed / both.sum(axis=1)
+    return out
+
+
+def run_backtest(
+    panel: Panel,
+    horizon: int = 5,
+    top_n: int = 10,
+    step: int = 1,
+) -> BacktestResult:
+    """Evaluate cohorts and a top-N portfolio on *panel*.
+
+    Args:
+        panel: Aligned snapshots from `build_panel` / `panel_from_store`.
+        horizon: Holding period in snapshots for the forward return.
+        top_n: Size of the SmartScore portfolio.
+        step: Rebalance every *step* snapshots (``step=horizon`` gives
+            non-overlapping holding periods).
+    """
+    fwd = forward_returns(panel.price, horizon)[::step]
+    tag = panel.tag[::step]
+    present = tag != _NO_TAG
+    members = top_n_members(panel.smartscore[::step], present, top_n)
+
+    cohorts = {name: tag == code for code, name in enumerate(TAGS)}
+    cohorts["universe"] = present
+    cohorts[f"top_{top_n}"] = members
+
+    stats = {name: _cohort(mask, fwd) for name, mask in cohorts.items()}
+    dates = panel.dates[::step]
+    returns, hit_rate, counts = (
+        pd.DataFrame({name: s[k] for name, s in stats.items()}, index=dates) for k in range(3)
+    )
+    return BacktestResult(
+        horizon=horizon,
+        top_n=top_n,
+        returns=returns,
+        hit_rate=hit_rate,
+        counts=counts,
+        turnover=pd.DataFrame({"top_n": _turnover(members), "tag": _tag_turnover(tag)}, index=dates),
+    )
@@ -0,0 +1,248 @@
+# backtest/sweep.py
+"""Weight Sweep
+
+Evaluates thousands of SMART_WEIGHTS candidates and BUY/WATCH threshold
+pairs at once instead of editing `config.py` and rerunning the pipeline
+per candidate.
+
+The six sub-scores are stacked into one matrix once; each chunk of
+candidate weight vectors becomes a single matrix multiply giving every
+candidate's SmartScore.  Because SmartScores are rounded to cents, tag
+counts for *all* threshold pairs come from one histogram per candidate.
+Chunks are sized to stay inside ``memory_mb``.
+
+Reported per (candidate, threshold pair):
+
+* BUY / WATCH / AVOID counts on the current scored frame;
+* overlap of the candidate's top-N with the configured weights' top-N;
+* with a history `Panel`: pooled forward return and hit rate of the BUY
+  cohort, and mean forward return / hit rate of the top-N portfolio.
+"""
+from __future__ import annotations
+
+from typing import Final, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtest import COMPONENTS, Panel, forward_returns
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from signals.engine import compute_scores
+
+__all__ = ["weight_candidates", "threshold_pairs", "sweep"]
+
+_KEYS: Final[tuple[str, ...]] = tuple(SMART_WEIGHTS)
+_CENTS: Final[int] = 100 * 100 + 1  # SmartScore levels 0.00 … 100.00
+_BYTES_PER_CELL: Final[int] = 32    # score + cents + bin index + scratch
+_BYTES_PER_CANDIDATE: Final[int] = _CENTS * 8  # one live `_at_least` histogram
+
+
+def weight_candidates(
+    n: int,
+    seed: int = 0,
+    base: Mapping[str, float] = SMART_WEIGHTS,
+    concentration: float = 20.0,
+) -> pd.DataFrame:
+    """*n* weight vectors around *base* (first row is *base* itself).
+
+    Drawn from a Dirichlet centred on the base proportions; higher
+    *concentration* keeps candidates closer to it.  Weights sum to 100.
+    """
+    rng = np.random.default_rng(seed)
+    alpha = np.array([base[k] for k in _KEYS], dtype=np.float64)
+    alpha = alpha / alpha.sum()
+    draws = rng.dirichlet(alpha * concentration + 1e-3, size=max(n - 1, 0)) * 100
+    rows = np.vstack([alpha * 100, draws])[:n]
+    return pd.DataFrame(rows.round(2), columns=list(_KEYS))
+
+
+def threshold_pairs(
+    buy: Iterable[float] = range(60, 95, 5),
+    watch: Iterable[float] = range(40, 85, 5),
+) -> pd.DataFrame:
+    """All (buy_th, watch_th) pairs with ``watch_th < buy_th``."""
+    pairs = [(b, w) for b in buy for w in watch if w < b]
+    return pd.DataFrame(pairs, columns=["buy_th", "watch_th"], dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# 🧮 Matrix kernels
+# ---------------------------------------------------------------------------
+
+def _stack(scored: pd.DataFrame) -> np.ndarray:
+    """(T, K) sub-score matrix, computing the scores if *scored* lacks them."""
+    if not all(c in scored.columns for c in COMPONENTS):
+        scored = pd.DataFrame(compute_scores(scored))
+    return np.nan_to_num(np.column_stack([scored[c].to_numpy(dtype=np.float64) for c in COMPONENTS]))
+
+
+def _normalize(weights: np.ndarray) -> np.ndarray:
+    if (weights < 0).any() or not (weights.sum(axis=1) > 0).all():
+        raise ValueError("Candidate weights must be non-negative with a positive sum")
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def _cents(x: np.ndarray, norm: np.ndarray) -> np.ndarray:
+    """SmartScores in cents of every candidate: ``(M, K) @ (K, R) → (M, R)``.
+
+    Same maths as `smartscore_from` (missing sub-scores count as 0,
+    rounded to two decimals).
+    """
+    return np.rint(norm @ x.T * 100).astype(np.int64)
+
+
+def _at_least(cents: np.ndarray, values: np.ndarray | None = None) -> np.ndarray:
+    """``out[m, c]`` = total of *values* (count if None) where candidate *m*
+    scores at least ``c / 100``; one histogram per candidate, accumulated
+    in place (a single ``(M, _CENTS)`` array)."""
+    hist = np.empty((len(cents), _CENTS), dtype=np.int64 if values is None else np.float64)
+    for m, row in enumerate(cents):
+        hist[m, ::-1] = np.bincount(row, weights=values, minlength=_CENTS)
+    np.cumsum(hist, axis=1, out=hist)
+    return hist[:, ::-1]
+
+
+def _at(totals: np.ndarray, th: np.ndarray) -> np.ndarray:
+    """(M, P) totals at thresholds *th* (score ≥ th)."""
+    level = np.clip(np.ceil(np.round(th * 100, 6)).astype(np.int64), 0, _CENTS - 1)
+    return np.where(th > 100, 0, totals[:, level])
+
+
+def _top_n(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the *n* best scores along the last axis."""
+    n = min(n, scores.shape[-1])
+    return np.argpartition(-scores, n - 1, axis=-1)[..., :n]
+
+
+def _spread(per_candidate: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Repeat a per-candidate value across the threshold-pair axis."""
+    return np.broadcast_to(np.asarray(per_candidate)[:, None], shape)
+
+
+class _History:
+    """Panel arrays the backtest metrics need, prepared once per sweep."""
+
+    def __init__(self, panel: Panel, horizon: int) -> None:
+        fwd = forward_returns(panel.price, horizon)
+        known = panel.present & ~np.isnan(fwd)
+        # Rows with a forward return, for the BUY cohort histograms
+        self.x = np.nan_to_num(panel.components[known].astype(np.float64))
+        self.fwd = fwd[known]
+        self.hit = (self.fwd > 0).astype(np.float64)
+        # Full grid, for the top-N portfolio
+        d, t, k = panel.components.shape
+        self.grid = np.nan_to_num(panel.components.reshape(d * t, k).astype(np.float64))
+        self.absent = ~panel.present.ravel()
+        self.shape = (d, t)
+        self.grid_fwd = fwd
+
+    @property
+    def cells(self) -> int:
+        return len(self.x) + len(self.grid)
+
+    def metrics(self, norm: np.ndarray, buy: np.ndarray, top_n: int) -> dict[str, np.ndarray]:
+        cents = _cents(self.x, norm)
+        count = _at(_at_least(cents), buy)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = {
+                "bt_buy_count": count,
+                "bt_buy_return": _at(_at_least(cents, self.fwd), buy) / count,
+                "bt_buy_hit_rate": _at(_at_least(cents, self.hit), buy) / count,
+            }
+
+        scores = _cents(self.grid, norm).astype(np.float32)     # (M, D*T)
+        scores[:, self.absent] = -np.inf
+        scores = scores.reshape(len(norm), *self.shape)         # (M, D, T)
+        top = _top_n(scores, top_n)                             # (M, D, N)
+        picked = np.take_along_axis(np.broadcast_to(self.grid_fwd, scores.shape), top, axis=-1)
+        held = np.isfinite(np.take_along_axis(scores, top, axis=-1)) & ~np.isnan(picked)
+        size = held.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_day = np.where(held, picked, 0.0).sum(axis=-1) / size
+            hit_day = (held & (picked > 0)).sum(axis=-1) / size
+        valid = size > 0
+        days = np.maximum(valid.sum(axis=1), 1)
+        shape = count.shape
+        out["bt_top_return"] = _spread(np.where(valid, per_day, 0.0).sum(axis=1) / days, shape)
+        out["bt_top_hit_rate"] = _spread(np.where(valid, hit_day, 0.0).sum(axis=1) / days, shape)
+        return out
+
+
+# ---------------------------------------------------------------------------
+# 🚀 Public API
+# ---------------------------------------------------------------------------
+
+def sweep(
+    scored: pd.DataFrame,
+    weights: pd.DataFrame | None = None,
+    thresholds: pd.DataFrame | None = None,
+    top_n: int = 10,
+    panel: Panel | None = None,
+    horizon: int = 5,
+    memory_mb: int = 256,
+) -> pd.DataFrame:
+    """Evaluate every weight candidate × threshold pair.
+
+    Args:
+        scored: Current scored (or just cleaned) watchlist frame.
+        weights: Candidates, one column per SMART_WEIGHTS key
+            (default: `weight_candidates(1000)`).
+        thresholds: ``buy_th`` / ``watch_th`` pairs
+            (default: the configured pair).
+        top_n: Portfolio size for the overlap and backtest metrics.
+        panel: Optional history from `backtest.build_panel`; adds ``bt_*``
+            columns.
+        horizon: Forward-return horizon for the backtest metrics.
+        memory_mb: Upper bound for the per-chunk working set.
+
+    Returns:
+        One row per (candidate, pair) with the weights, thresholds,
+        ``n_buy`` / ``n_watch`` / ``n_avoid``, ``top_n_overlap`` and, with a
+        panel, ``bt_buy_count``, ``bt_buy_return``, ``bt_buy_hit_rate``
+        (pooled over all dates), ``bt_top_return`` and ``bt_top_hit_rate``
+        (mean over rebalance dates).
+    """
+    weights = weight_candidates(1000) if weights is None else weights
+    if thresholds is None:
+        thresholds = pd.DataFrame({"buy_th": [float(BUY_THRESHOLD)], "watch_th": [float(WATCH_THRESHOLD)]})
+    w = weights[list(_KEYS)].to_numpy(dtype=np.float64)
+    buy = thresholds["buy_th"].to_numpy(dtype=np.float64)
+    watch = thresholds["watch_th"].to_numpy(dtype=np.float64)
+    norm = _normalize(w)
+
+    x = _stack(scored)
+    base = _normalize(np.array([[SMART_WEIGHTS[k] for k in _KEYS]], dtype=np.float64))
+    base_top = np.zeros(len(x), dtype=bool)
+    base_top[_top_n(_cents(x, base), top_n)[0]] = True
+
+    history = _History(panel, horizon) if panel is not None else None
+    cells = len(x) + (history.cells if history is not None else 0)
+    chunk = max(1, (memory_mb << 20) // (_BYTES_PER_CELL * cells + _BYTES_PER_CANDIDATE))
+
+    parts: list[dict[str, np.ndarray]] = []
+    for lo in range(0, max(len(w), 1), chunk):  # no candidates: one empty chunk keeps the columns
+        nc = norm[lo:lo + chunk]
+        cents = _cents(x, nc)                                  # (M, T)
+        at_least = _at_least(cents)
+        n_buy = _at(at_least, buy)
+        n_watch = _at(at_least, watch) - n_buy
+        del at_least  # before the next chunk allocates its histogram
+        overlap = base_top[_top_n(cents, top_n)].sum(axis=-1) / min(top_n, len(x))
+        part = {
+            "candidate": _spread(np.arange(lo, lo + len(nc)), n_buy.shape),
+            "n_buy": n_buy,
+            "n_watch": n_watch,
+            "n_avoid": len(x) - n_buy - n_watch,
+            "top_n_overlap": _spread(overlap, n_buy.shape),
+        }
+        if history is not None:
+            part.update(history.metrics(nc, buy, top_n))
+        parts.append(part)
+
+    out = pd.DataFrame({key: np.concatenate([part[key].ravel() for part in parts]) for key in parts[0]})
+    p = len(buy)
+    out.insert(1, "buy_th", np.tile(buy, len(w)))
+    out.insert(2, "watch_th", np.tile(watch, len(w)))
+    for i, key in enumerate(_KEYS):
+        out.insert(3 + i, key, np.repeat(w[:, i], p))
+    return out
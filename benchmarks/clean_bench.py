@@ -0,0 +1,76 @@
+# benchmarks/clean_bench.py
+"""Clean benchmark
+
+Times ``clean_watchlist`` against the previous per-column implementation
+(``astype(str)`` + six ``str.replace`` passes per column) on a synthetic
+raw sheet (`benchmarks.synthetic`), and checks that both produce identical
+frames.
+
+Usage::
+
+    python -m benchmarks.clean_bench --rows 100000 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_raw
+from clean.clean import _NUMERIC_COLS_ORIG, _snake_case, clean_watchlist
+from clean.schema import apply_schema
+
+
+def _legacy_coerce(series: pd.Series) -> pd.Series:
+    s = series.astype(str)
+    s = s.str.replace(r"₹", "", regex=False)
+    s = s.str.replace(r",", "", regex=False)
+    s = s.str.replace(r"%", "", regex=False)
+    s = s.str.replace(r"▲", "", regex=False)
+    s = s.str.replace(r"▼", "-", regex=False)
+    s = s.str.strip()
+    return pd.to_numeric(s, errors="coerce")
+
+
+def legacy_clean_watchlist(raw: pd.DataFrame) -> pd.DataFrame:
+    """The implementation `clean_watchlist` replaced, kept as the baseline."""
+    df = raw.copy()
+    df = df.loc[:, ~df.columns.str.contains(r"^Unnamed")]
+    df.columns = [_snake_case.__wrapped__(c) for c in df.columns]
+    if "enter_ticker" in df.columns:
+        df.rename(columns={"enter_ticker": "ticker"}, inplace=True)
+    df.dropna(subset=["ticker"], inplace=True)
+    for orig in _NUMERIC_COLS_ORIG:
+        col = _snake_case.__wrapped__(orig)
+        if col in df.columns:
+            df[col] = _legacy_coerce(df[col])
+    return apply_schema(df.reset_index(drop=True))
+
+
+def _best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>9}  {'legacy s':>9}  {'batched s':>9}  {'speedup':>7}")
+    for rows in args.rows:
+        raw = synthetic_raw(rows)
+        pd.testing.assert_frame_equal(legacy_clean_watchlist(raw), clean_watchlist(raw))
+        legacy = _best_of(legacy_clean_watchlist, raw, args.repeat)
+        batched = _best_of(clean_watchlist, raw, args.repeat)
+        print(f"{rows:>9}  {legacy:>9.3f}  {batched:>9.3f}  {legacy / batched:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmarks/import_budget.py
+"""Import-time budget
+
+Guards the dashboard's cold start.  A fresh interpreter imports the startup
+modules — the project modules ``dashboard/app.py`` imports at module level,
+read from its source since importing the script would run it — under
+``python -X importtime``; the check fails when
+
+* the cumulative import time exceeds ``--budget-ms`` (best of ``--repeat``
+  runs, so one slow disk read does not fail it), or
+* a module that should load on first use (HTTP client, signal engine,
+  feature / alert / watchlist modules) is imported at startup.
+
+The heaviest project modules are listed either way, to show where a
+regression came from.
+
+Usage::
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 300 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+__all__ = ["ImportProfile", "profile_imports", "check"]
+
+ROOT: Final[Path] = Path(__file__).resolve().parent.parent
+APP: Final[Path] = ROOT / "dashboard" / "app.py"
+BUDGET_MS: Final[float] = 350.0  # ~235 ms measured (pandas + pyarrow) plus headroom
+# Loaded on first use by the dashboard; importing any of them at startup is a regression
+DEFERRED: Final[tuple[str, ...]] = (
+    "requests",
+    "ingest.fetch",
+    "signals.engine",
+    "features",
+    "alerts",
+    "watchlist_builder",
+)
+_LINE: Final[re.Pattern[str]] = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+_PROJECT: Final[frozenset[str]] = frozenset(
+    p.name for p in ROOT.iterdir() if p.is_dir() and any(p.glob("*.py"))
+) | {p.stem for p in ROOT.glob("*.py")}
+
+
+def _entry_imports(path: Path) -> tuple[str, ...]:
+    """Project modules *path* imports at module level (not in functions)."""
+    modules: list[str] = []
+    for node in ast.parse(path.read_text(), str(path)).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    own = [m for m in modules if m.split(".")[0] in _PROJECT]
+    return tuple(dict.fromkeys(own))
+
+
+STARTUP: Final[tuple[str, ...]] = _entry_imports(APP)
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """One ``-X importtime`` run: cumulative µs per imported module."""
+
+    total_us: int
+    cumulative_us: dict[str, int]
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    def heaviest(self, n: int = 10) -> list[tuple[str, int]]:
+        """Project modules by cumulative import time, heaviest first."""
+        own = [(m, us) for m, us in self.cumulative_us.items() if m.split(".")[0] in _PROJECT]
+        return sorted(own, key=lambda item: -item[1])[:n]
+
+
+def _parse(stderr: str) -> ImportProfile:
+    cumulative: dict[str, int] = {}
+    total = 0
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        _, cum, indent, module = match.groups()
+        cumulative[module] = int(cum)
+        if len(indent) == 1:  # top-level import: its cumulative covers the subtree
+            total += int(cum)
+    return ImportProfile(total, cumulative)
+
+
+def profile_imports(modules: tuple[str, ...] = STARTUP) -> ImportProfile:
+    """Import *modules* in a fresh interpreter and parse its import times."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {', '.join(modules)} failed:\n{proc.stderr[-2000:]}")
+    return _parse(proc.stderr)
+
+
+def check(profile: ImportProfile, budget_ms: float = BUDGET_MS) -> list[str]:
+    """Budget violations of *profile* (empty when within budget)."""
+    problems: list[str] = []
+    if profile.total_ms > budget_ms:
+        problems.append(f"startup imports took {profile.total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    for deferred in DEFERRED:
+        loaded = [m for m in profile.cumulative_us if m == deferred or m.startswith(deferred + ".")]
+        if loaded:
+            problems.append(f"{deferred} is imported at startup ({len(loaded)} modules)")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=list(STARTUP), help="startup modules to import")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3, help="runs; the fastest is checked")
+    args = parser.parse_args(argv)
+
+    runs = [profile_imports(tuple(args.modules)) for _ in range(max(args.repeat, 1))]
+    best = min(runs, key=lambda p: p.total_us)
+    print(f"startup imports: {best.total_ms:.1f} ms (best of {len(runs)}, budget {args.budget_ms:.0f} ms)")
+    for module, us in best.heaviest():
+        print(f"  {us / 1000:>8.1f} ms  {module}")
+
+    problems = check(best, args.budget_ms)
+    for line in problems:
+        print(f"OVER BUDGET  {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
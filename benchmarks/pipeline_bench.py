@@ -0,0 +1,238 @@
+# benchmarks/pipeline_bench.py
+"""Pipeline benchmark
+
+Times and memory-profiles every pipeline stage on synthetic universes
+(`benchmarks.synthetic`) of growing size, to find where scaling breaks:
+
+    ingest parse → clean → add_* chain (each stage) → tagging →
+    fused engine → sector leaderboard → alerts → top-K
+
+Each stage runs on the previous stage's output, prepared once.  The time
+is the best of ``--repeat`` runs; memory is the tracemalloc peak of one
+extra run (NumPy and pandas buffers included).  ``ns/row`` makes scaling
+cliffs visible: it should stay flat as the universe grows.
+
+Results are written as JSON and compared with ``benchmarks/baseline.json``
+(committed for the 1k and 10k universes) when it exists, or with
+``--baseline``; a stage counts as a regression when it is slower (or uses
+more memory) than the baseline by more than ``--threshold`` and by more
+than the noise floor.  Sizes missing from the baseline are not compared.
+Every stage runs in memory; nothing is written outside a temp directory.
+
+Usage::
+
+    python -m benchmarks.pipeline_bench --rows 1000 10000 100000 1000000
+    python -m benchmarks.pipeline_bench --rows 1000 10000 --save-baseline
+    python -m benchmarks.pipeline_bench --baseline other-results.json
+    python -m benchmarks.pipeline_bench --no-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Final
+
+import numpy as np
+import pandas as pd
+
+from alerts.alerts import generate_alerts
+from benchmarks.synthetic import SIZES, synthetic_csv
+from clean.clean import clean_watchlist
+from features.buy_zone_map import add_buy_zone
+from features.dma_crossover import add_dma_crossover
+from features.eps_growth_screener import add_eps_growth_score
+from features.sector_analytics import sector_aggregates
+from features.topk import Ranker
+from ingest.ingest import SheetSource, fetch_watchlist
+from signals.confirmation import add_confirmation
+from signals.engine import score_frame
+from signals.momentum import add_momentum
+from signals.smartscore import add_smartscore
+from signals.timing import add_timing
+from signals.value import add_value
+from signals.volume import add_volume
+from tagging.tagger import apply_tags
+
+BASELINE: Final[Path] = Path(__file__).with_name("baseline.json")
+NOISE_FLOOR_S: Final[float] = 0.005  # absolute slowdown below this is noise
+NOISE_FLOOR_MB: Final[float] = 1.0
+
+# The legacy chain, in the order the fused engine mirrors
+_CHAIN: Final[list[tuple[str, Callable[[pd.DataFrame], pd.DataFrame]]]] = [
+    ("add_momentum", add_momentum),
+    ("add_value", add_value),
+    ("add_volume", add_volume),
+    ("add_timing", add_timing),
+    ("add_confirmation", add_confirmation),
+    ("add_buy_zone", add_buy_zone),
+    ("add_dma_crossover", add_dma_crossover),
+    ("add_eps_growth_score", add_eps_growth_score),
+    ("add_smartscore", add_smartscore),
+    ("apply_tags", apply_tags),
+]
+
+
+def _top_k(df: pd.DataFrame) -> None:
+    ranker = Ranker(df)
+    ranker.top(50, mask=(df["tag"] == "🟢 BUY").to_numpy())
+    ranker.top_by("discover", 5, then="7_days_returns")
+
+
+def _stages(csv_path: Path) -> list[tuple[str, Callable[[Any], Any], Callable[[], Any]]]:
+    """``(name, fn, make_input)`` in pipeline order; inputs are built lazily."""
+    cache: dict[str, Any] = {}
+
+    def output_of(name: str) -> Callable[[], Any]:
+        return lambda: cache[name]
+
+    source = SheetSource(csv=str(csv_path))
+    stages: list[tuple[str, Callable[[Any], Any], Callable[[], Any]]] = [
+        ("ingest_parse", lambda src: fetch_watchlist(src).frame, lambda: source),
+        ("clean", clean_watchlist, output_of("ingest_parse")),
+    ]
+    previous = "clean"
+    for name, fn in _CHAIN:
+        stages.append((name, fn, output_of(previous)))
+        previous = name
+    stages += [
+        ("score_frame", score_frame, output_of("clean")),
+        ("sector_leaderboard", sector_aggregates, output_of("score_frame")),
+        ("alerts", generate_alerts, output_of("score_frame")),
+        ("top_k", _top_k, output_of("score_frame")),
+    ]
+
+    def recording(name: str, fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def run(arg: Any) -> Any:
+            out = fn(arg)
+            cache[name] = out
+            return out
+        return run
+
+    return [(name, recording(name, fn), make) for name, fn, make in stages]
+
+
+def _measure(fn: Callable[[Any], Any], arg: Any, repeat: int) -> tuple[float, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def run(sizes: list[int], repeat: int = 3, stages: set[str] | None = None, seed: int = 0) -> dict[str, Any]:
+    """Benchmark every stage at every size; returns the JSON document."""
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            csv_path = Path(tmp) / f"watchlist-{rows}.csv"
+            csv_path.write_bytes(synthetic_csv(rows, seed))
+            for name, fn, make_input in _stages(csv_path):
+                arg = make_input()
+                if stages and name not in stages:
+                    fn(arg)  # later stages still need its output
+                    continue
+                seconds, peak_mb = _measure(fn, arg, repeat if rows < 1_000_000 else 1)
+                results.append({
+                    "rows": rows,
+                    "stage": name,
+                    "seconds": round(seconds, 6),
+                    "ns_per_row": round(seconds / rows * 1e9, 1),
+                    "peak_mb": round(peak_mb, 2),
+                })
+                print(f"{rows:>9}  {name:<22} {seconds:>9.4f}s  {seconds / rows * 1e9:>9.1f} ns/row"
+                      f"  {peak_mb:>9.1f} MB", flush=True)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def cliffs(results: list[dict[str, Any]], factor: float = 2.0) -> list[str]:
+    """Stages whose ns/row grows by more than *factor* between two sizes."""
+    found: list[str] = []
+    by_stage: dict[str, list[dict[str, Any]]] = {}
+    for r in results:
+        by_stage.setdefault(r["stage"], []).append(r)
+    for stage, rows in by_stage.items():
+        rows.sort(key=lambda r: r["rows"])
+        for a, b in zip(rows, rows[1:]):
+            if a["ns_per_row"] > 0 and b["ns_per_row"] > factor * a["ns_per_row"] and b["seconds"] > NOISE_FLOOR_S:
+                found.append(f"{stage}: {a['ns_per_row']:.0f} → {b['ns_per_row']:.0f} ns/row "
+                             f"({a['rows']:,} → {b['rows']:,} rows)")
+    return found
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.25) -> list[str]:
+    """Regressions of *current* against *baseline* (same stage and size)."""
+    base = {(r["rows"], r["stage"]): r for r in baseline["results"]}
+    regressions: list[str] = []
+    for r in current["results"]:
+        b = base.get((r["rows"], r["stage"]))
+        if b is None:
+            continue
+        slower = r["seconds"] - b["seconds"]
+        if slower > NOISE_FLOOR_S and r["seconds"] > b["seconds"] * (1 + threshold):
+            regressions.append(f"{r['stage']} @ {r['rows']:,}: {b['seconds']:.4f}s → {r['seconds']:.4f}s")
+        bigger = r["peak_mb"] - b["peak_mb"]
+        if bigger > NOISE_FLOOR_MB and r["peak_mb"] > b["peak_mb"] * (1 + threshold):
+            regressions.append(f"{r['stage']} @ {r['rows']:,}: {b['peak_mb']:.1f} MB → {r['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", default=None, help="only report these stages")
+    parser.add_argument("--out", type=Path, default=Path("bench-results.json"))
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help=f"compare against this results file (default: {BASELINE.name} if present)")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the results to {BASELINE}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown / growth")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore", FutureWarning)  # legacy add_* deprecations, once per call
+    baseline = args.baseline
+    if baseline is None and not args.save_baseline and BASELINE.exists():
+        baseline = BASELINE
+    doc = run(args.rows, args.repeat, set(args.stages) if args.stages else None)
+    args.out.write_text(json.dumps(doc, indent=2))
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(doc, indent=2) + "\n")
+
+    for line in cliffs(doc["results"]):
+        print(f"scaling cliff  {line}")
+    if baseline is not None and not args.no_baseline:
+        regressions = compare(doc, json.loads(baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION  {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+# benchmarks/synthetic.py
+"""Synthetic Watchlist Universe
+
+Raw watchlist sheets of any size with the real headers and the formatting
+quirks `clean_watchlist` has to undo:
+
+* ``₹`` prices with thousands separators (``₹1,234.50``);
+* ``▲``/``▼`` signed percentages (``▼3.25%``);
+* blank separator rows, an empty ``Unnamed`` column and the banner rows
+  above the header that `SheetSource.skiprows` skips;
+* Sector / Category / Discover / EPS Tier text columns.
+
+Prices, moving averages and 52-week levels are drawn around one price per
+ticker, so the technical sub-scores see realistic relationships.
+
+Usage::
+
+    python -m benchmarks.synthetic --rows 100000 --out /tmp/watchlist.csv
+"""
+from __future__ import annotations
+
+import argparse
+import io
+from pathlib import Path
+from typing import Final
+
+import numpy as np
+import pandas as pd
+
+from clean.clean import _NUMERIC_COLS_ORIG
+from config import DISCOVER_TIERS, EPS_TIERS
+
+__all__ = ["synthetic_csv", "synthetic_raw", "SIZES"]
+
+SIZES: Final[tuple[int, ...]] = (1_000, 10_000, 100_000, 1_000_000)
+BANNER_ROWS: Final[int] = 3
+
+_SECTORS: Final[list[str]] = [
+    "IT", "Bank", "Pharma", "Auto", "FMCG", "Metals", "Energy", "Realty",
+    "Telecom", "Chemicals", "Capital Goods", "Media",
+]
+_CATEGORIES: Final[list[str]] = ["Large", "Mid", "Small", "Micro"]
+# Price-like columns, drawn around each ticker's price
+_PRICE_COLS: Final[dict[str, float]] = {
+    "Current Price": 0.0,
+    "Prev Close": 0.01,
+    "20 Day Avg": 0.04,
+    "50 Day Avg": 0.08,
+    "200 Day Avg": 0.15,
+}
+_VOLUME_COLS: Final[tuple[str, ...]] = ("Volume", "7 Days Volume", "30 Days Volume", "3 Months Volume")
+_PLAIN_COLS: Final[tuple[str, ...]] = (
+    "PE", "EPS (Current)", "EPS (Last Qtr)", "EPS (TTM)", "RVOL",
+    "1-day vs. 90-day", "7-day vs. 90-day", "30-day vs. 90-day",
+)
+
+
+def _rupees(values: np.ndarray) -> np.ndarray:
+    return np.array([f"₹{v:,.2f}" for v in values], dtype=object)
+
+
+def _signed_pct(values: np.ndarray) -> np.ndarray:
+    return np.array([f"{'▲' if v >= 0 else '▼'}{abs(v):.2f}%" for v in values], dtype=object)
+
+
+def _plain(values: np.ndarray) -> np.ndarray:
+    return np.array([f"{v:,.2f}" for v in values], dtype=object)
+
+
+def _frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    price = np.exp(rng.normal(6, 1.2, rows))
+    data: dict[str, object] = {
+        "Enter Ticker": [f"TK{i}" for i in range(rows)],
+        "Name": [f"Company {i}" for i in range(rows)],
+        "Unnamed: 2": np.full(rows, np.nan),
+        "Sector": rng.choice(_SECTORS, rows),
+        "Category": rng.choice(_CATEGORIES, rows),
+        "Discover": rng.choice(DISCOVER_TIERS, rows),
+        "EPS Tier": rng.choice(EPS_TIERS, rows),
+    }
+    low = price * rng.uniform(0.5, 1.0, rows)
+    high = price * rng.uniform(1.0, 1.8, rows)
+    for col in _NUMERIC_COLS_ORIG:
+        if col in _PRICE_COLS:
+            data[col] = _rupees(price * (1 + rng.normal(0, _PRICE_COLS[col], rows)))
+        elif col == "52 Week LOW":
+            data[col] = _rupees(low)
+        elif col == "52 Week HIGH":
+            data[col] = _rupees(high)
+        elif col == "% From Low":
+            data[col] = _signed_pct((price / low - 1) * 100)
+        elif col == "% From High":
+            data[col] = _signed_pct((price / high - 1) * 100)
+        elif col in _VOLUME_COLS:
+            data[col] = _plain(np.round(np.exp(rng.normal(11, 2, rows))))
+        elif col in _PLAIN_COLS:
+            data[col] = _plain(np.abs(rng.normal(20, 15, rows)))
+        else:  # returns and % changes
+            data[col] = _signed_pct(rng.normal(2, 25, rows))
+    raw = pd.DataFrame(data)
+    blank = rng.random(rows) < 0.03  # blank separator rows
+    raw.loc[blank, :] = np.nan
+    return raw
+
+
+def synthetic_csv(rows: int, seed: int = 0) -> bytes:
+    """The sheet's CSV export: banner rows, header, quirky values."""
+    body = _frame(rows, seed).to_csv(index=False)
+    banner = "".join(f"M.A.N.T.R.A. watchlist banner {i}\n" for i in range(BANNER_ROWS))
+    return (banner + body).encode()
+
+
+def synthetic_raw(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw watchlist as `fetch_watchlist` parses it (₹, %, ▲/▼, commas)."""
+    return pd.read_csv(io.BytesIO(synthetic_csv(rows, seed)), skiprows=BANNER_ROWS)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic watchlist CSV.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args(argv)
+    args.out.write_bytes(synthetic_csv(args.rows, args.seed))
+
+
+if __name__ == "__main__":
+    main()
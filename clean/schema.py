@@ -0,0 +1,153 @@
+# clean/schema.py
+"""SCHEMA
+
+Declared storage dtypes for the cleaned and scored watchlist frame:
+
+* returns and 0–100 scores → ``float32`` (prices, averages, volumes, PE and
+  EPS keep ``float64``: float32 cannot hold them to the paisa/share);
+* low-cardinality text (sector, category, discover, EPS tier, tag) →
+  pandas ``category``;
+* ``ticker_id`` → ``int32`` dictionary code of the ticker within the
+  frame (first-seen order), unless a `TickerRegistry` is passed; the
+  snapshot history re-encodes it with its persisted registry on append, so
+  stored IDs stay stable across processes and restarts.
+
+Maths in the signal modules and the engine still run in float64; only the
+stored columns are narrowed.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Final, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from tagging.tagger import TAG_AVOID, TAG_BUY, TAG_WATCH
+
+__all__ = [
+    "RETURN_COLS",
+    "SCORE_COLS",
+    "CATEGORY_COLS",
+    "SCORE_DTYPE",
+    "TAG_DTYPE",
+    "TickerRegistry",
+    "apply_schema",
+    "cast_scores",
+]
+
+SCORE_DTYPE: Final = np.float32
+
+RETURN_COLS: Final[tuple[str, ...]] = (
+    "1_day_change", "3_days_returns", "7_days_returns", "30_days_returns",
+    "3_months", "6_months", "1_year", "3_year", "5_year",
+    "pct_from_low", "pct_from_high", "eps_pct_change",
+    "1-day_vs._90-day", "7-day_vs._90-day", "30-day_vs._90-day",
+)
+
+SCORE_COLS: Final[tuple[str, ...]] = (
+    "momentum_score", "value_score", "volume_score", "timing_score",
+    "confirmation_score", "buy_zone_score", "eps_growth_score", "smartscore",
+)
+
+CATEGORY_COLS: Final[tuple[str, ...]] = ("sector", "category", "discover", "eps_tier")
+
+TAG_DTYPE: Final = pd.CategoricalDtype([TAG_BUY, TAG_WATCH, TAG_AVOID])
+
+
+class TickerRegistry:
+    """Append-only ticker → int32 dictionary.
+
+    IDs are stable for the life of the registry; `to_frame` / `from_frame`
+    let callers persist it next to stored snapshots.  Subclasses backed by
+    shared storage override `_reload` / `_register` (called with the lock
+    held).
+    """
+
+    def __init__(self, tickers: Iterable[str] = ()) -> None:
+        self._lock = threading.Lock()
+        self._index = pd.Index([], dtype=object)
+        self.encode(pd.Series(list(tickers), dtype=object))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._reload()
+        return len(self._index)
+
+    def _reload(self) -> None:
+        """Adopt tickers registered elsewhere (no-op in memory)."""
+
+    def _register(self, fresh: np.ndarray) -> None:
+        """Append *fresh* tickers."""
+        self._index = self._index.append(pd.Index(pd.unique(fresh), dtype=object))
+
+    def encode(self, tickers: pd.Series) -> np.ndarray:
+        """Return int32 IDs for *tickers*, registering unseen ones."""
+        values = tickers.to_numpy(dtype=object)
+        with self._lock:
+            codes = self._index.get_indexer(values)
+            new = codes < 0
+            if new.any():
+                self._register(values[new])
+                codes[new] = self._index.get_indexer(values[new])
+        return codes.astype(np.int32)
+
+    def lookup(self, tickers: pd.Series) -> np.ndarray:
+        """Return int32 IDs for *tickers* without registering; -1 if unknown."""
+        values = tickers.to_numpy(dtype=object)
+        with self._lock:
+            codes = self._index.get_indexer(values)
+            if (codes < 0).any():
+                self._reload()
+                codes = self._index.get_indexer(values)
+            return codes.astype(np.int32)
+
+    def decode(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.asarray(ids)
+        with self._lock:
+            if ids.size and ids.max() >= len(self._index):
+                self._reload()
+            return self._index.to_numpy()[ids]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"ticker_id": np.arange(len(self._index), dtype=np.int32), "ticker": self._index})
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "TickerRegistry":
+        return cls(frame.sort_values("ticker_id")["ticker"])
+
+
+def apply_schema(df: pd.DataFrame, registry: TickerRegistry | None = None) -> pd.DataFrame:
+    """Narrow *df* to the declared dtypes in place and return it.
+
+    ``ticker_id`` comes from *registry* if given, else from the frame's own
+    tickers, so cleaning touches no shared state.
+    """
+    for col in RETURN_COLS + SCORE_COLS:
+        if col in df.columns and df[col].dtype != SCORE_DTYPE:
+            df[col] = df[col].astype(SCORE_DTYPE)
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    if "tag" in df.columns and df["tag"].dtype != TAG_DTYPE:
+        df["tag"] = df["tag"].astype(TAG_DTYPE)
+    if "ticker" in df.columns and "ticker_id" not in df.columns:
+        if registry is None:
+            ids = pd.factorize(df["ticker"])[0].astype(np.int32)
+        else:
+            ids = registry.encode(df["ticker"])
+        df.insert(df.columns.get_loc("ticker") + 1, "ticker_id", ids)
+    return df
+
+
+def cast_scores(scores: Mapping[str, np.ndarray]) -> dict[str, object]:
+    """Return engine outputs converted to their declared storage dtypes."""
+    out: dict[str, object] = {}
+    for col, values in scores.items():
+        if col in SCORE_COLS:
+            out[col] = np.asarray(values, dtype=SCORE_DTYPE)
+        elif col == "tag":
+            out[col] = pd.Categorical(values, dtype=TAG_DTYPE)
+        else:
+            out[col] = values
+    return out
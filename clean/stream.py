@@ -0,0 +1,166 @@
+# clean/stream.py
+"""STREAMING CLEAN
+
+Chunked variant of ``clean_watchlist(pd.read_csv(source, skiprows=3))`` for
+very large (multi-exchange) universes.  The CSV is read in chunks as raw
+strings, headers are normalized once, and every chunk is cleaned, coerced
+and written straight into preallocated typed column buffers, so at most one
+chunk of raw text is alive at a time.
+
+The result matches the in-memory path exactly, including the dtypes that
+``read_csv`` would infer over the whole file (blank separator rows included).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import IO, Final, Union
+
+import numpy as np
+import pandas as pd
+
+from clean.clean import _coerce_numeric, _watchlist_layout
+from clean.schema import apply_schema
+
+__all__ = ["clean_watchlist_stream"]
+
+CsvSource = Union[str, "bytes", IO[str], IO[bytes]]
+
+_TRUE: Final[frozenset[str]] = frozenset({"True", "TRUE", "true"})
+_FALSE: Final[frozenset[str]] = frozenset({"False", "FALSE", "false"})
+
+
+class _Buffer:
+    """Growable typed column buffer (amortised doubling)."""
+
+    def __init__(self, dtype: type | str, capacity: int) -> None:
+        self.data = np.empty(max(capacity, 1), dtype=dtype)
+        self.size = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        end = self.size + len(values)
+        if end > self.data.size:
+            grown = np.empty(max(end, 2 * self.data.size), dtype=self.data.dtype)
+            grown[: self.size] = self.data[: self.size]
+            self.data = grown
+        self.data[self.size:end] = values
+        self.size = end
+
+    def values(self) -> np.ndarray:
+        return self.data[: self.size]
+
+
+@dataclass
+class _Inference:
+    """What ``read_csv`` would infer for a column over the whole file."""
+
+    numeric: bool = True
+    integer: bool = True
+    boolean: bool = True
+    has_nan: bool = False
+    seen: bool = False
+
+    def update(self, col: pd.Series) -> None:
+        notna = col.notna()
+        self.has_nan |= not notna.all()
+        vals = col[notna]
+        if vals.empty:
+            return
+        self.seen = True
+        if self.numeric:
+            parsed = pd.to_numeric(vals, errors="coerce")
+            self.numeric = bool(parsed.notna().all())
+            self.integer &= self.numeric and parsed.dtype.kind in "iu"
+        if self.boolean:
+            self.boolean = bool(vals.isin(_TRUE | _FALSE).all())
+
+    @property
+    def dtype(self) -> str:
+        if not self.seen:
+            return "float64"
+        if self.numeric:
+            return "int64" if self.integer and not self.has_nan else "float64"
+        if self.boolean:
+            return "bool" if not self.has_nan else "object"
+        return "object"
+
+
+@dataclass
+class _Column:
+    name: str
+    coerce: bool
+    buffer: _Buffer
+    inference: _Inference = field(default_factory=_Inference)
+    parsed_int: bool = True  # every coerced chunk came out integer
+
+
+def _finish(col: _Column) -> np.ndarray:
+    values = col.buffer.values()
+    source = col.inference.dtype
+    if col.coerce:
+        # `_coerce_numeric` output; int only if read_csv/to_numeric kept ints
+        if source == "int64" or (source in ("object", "bool") and col.parsed_int):
+            return values.astype(np.int64)
+        return values
+    if col.inference.seen and not col.inference.numeric and col.inference.boolean:
+        flags = np.isin(values, list(_TRUE))
+        if source == "bool":
+            return flags
+        out = flags.astype(object)
+        out[pd.isna(values)] = np.nan
+        return out
+    if source == "object":
+        return values
+    parsed = pd.to_numeric(pd.Series(values, dtype=object))
+    return parsed.to_numpy(dtype=source)
+
+
+def clean_watchlist_stream(
+    source: CsvSource,
+    skiprows: int = 3,
+    chunksize: int = 50_000,
+    expected_rows: int = 0,
+) -> pd.DataFrame:
+    """Read and clean a watchlist CSV chunk by chunk.
+
+    Args:
+        source: Path, URL or file-like object accepted by ``pd.read_csv``.
+        skiprows: Banner rows above the header (as in ``fetch_watchlist_raw``).
+        chunksize: Rows parsed per chunk; bounds peak raw-text memory.
+        expected_rows: Optional size hint used to preallocate the buffers.
+
+    Returns:
+        Same frame as ``clean_watchlist(pd.read_csv(source, skiprows=skiprows))``.
+    """
+    capacity = expected_rows or chunksize
+    reader = pd.read_csv(source, skiprows=skiprows, chunksize=chunksize, dtype=str)
+
+    columns: list[_Column] = []
+    for chunk in reader:
+        if not columns:
+            # Normalize headers once
+            keep, names, numeric = _watchlist_layout(tuple(chunk.columns))
+            for name in names:
+                coerce = name in numeric
+                columns.append(_Column(name, coerce, _Buffer(np.float64 if coerce else object, capacity)))
+            if "ticker" not in {c.name for c in columns}:
+                raise KeyError("ticker")
+            ticker = next(i for i, c in enumerate(columns) if c.name == "ticker")
+
+        block = chunk.iloc[:, list(keep)]
+        mask = block.iloc[:, ticker].notna().to_numpy()
+        for i, col in enumerate(columns):
+            series = block.iloc[:, i]
+            col.inference.update(series)
+            kept = series[mask]
+            if col.coerce:
+                parsed = _coerce_numeric(kept)
+                if len(parsed):
+                    col.parsed_int &= parsed.dtype.kind in "iu"
+                col.buffer.extend(parsed.to_numpy(dtype=np.float64))
+            else:
+                col.buffer.extend(kept.to_numpy(dtype=object))
+        del chunk, block
+
+    if not columns:
+        return pd.DataFrame()
+    return apply_schema(pd.DataFrame({col.name: _finish(col) for col in columns}))
@@ -39,12 +39,26 @@ SMART_WEIGHTS: Final[dict[str, int]] = {
 BUY_THRESHOLD:   Final[int] = 80
 WATCH_THRESHOLD: Final[int] = 60
 
+# Seconds between background refreshes of the scored frame
+REFRESH_SECONDS: Final[int] = int(os.getenv("REFRESH_SECONDS", "1800"))
+
 # ────────────────────────────────────────────────────────────────
 # 📂  Project Paths
 # ────────────────────────────────────────────────────────────────
 ROOT: Final[Path] = Path(__file__).resolve().parent
+# Created on first write by whichever store writes there, never at import
 SNAPSHOT_DIR: Final[Path] = ROOT / "snapshots"
-SNAPSHOT_DIR.mkdir(exist_ok=True)
+
+# Memory bound of the in-process sub-score stage cache (signals/memo.py)
+SCORE_MEMO_BYTES: Final[int] = int(os.getenv("SCORE_MEMO_MB", "256")) * 2**20
+
+# Per-stage pipeline metrics (MANTRA_METRICS=0 turns them off)
+METRICS_ENABLED: Final[bool] = os.getenv("MANTRA_METRICS", "1") != "0"
+# Per-stage peak memory via tracemalloc (MANTRA_METRICS_MEMORY=1; slows allocation)
+METRICS_TRACE_MEMORY: Final[bool] = os.getenv("MANTRA_METRICS_MEMORY", "0") == "1"
+
+# User-defined alert rules (JSON list, see alerts/rules.py)
+ALERT_RULES_FILE: Final[Path] = Path(os.getenv("ALERT_RULES", str(SNAPSHOT_DIR / "alert_rules.json")))
 
 # ────────────────────────────────────────────────────────────────
 # 🎨  UI constants
@@ -66,7 +80,12 @@ __all__ = [
     "SMART_WEIGHTS",
     "BUY_THRESHOLD",
     "WATCH_THRESHOLD",
+    "REFRESH_SECONDS",
+    "SCORE_MEMO_BYTES",
+    "METRICS_ENABLED",
+    "METRICS_TRACE_MEMORY",
     "SNAPSHOT_DIR",
+    "ALERT_RULES_FILE",
     "APP_TITLE",
     "LIGHT_THEME",
     "DISCOVER_TIERS",
@@ -5,28 +5,20 @@ Entry point: pulls data → runs all signals/features → renders UI.
 """
 from __future__ import annotations
 
-import pandas as pd
+from typing import TYPE_CHECKING
+
 import streamlit as st
 
-from config import APP_TITLE, LIGHT_THEME, BUY_THRESHOLD, WATCH_THRESHOLD, DISCOVER_TIERS
-from ingest.ingest import get_raw_frames
-from clean.clean import clean_watchlist
-from signals.momentum import add_momentum
-from signals.value import add_value
-from signals.volume import add_volume
-from signals.timing import add_timing
-from signals.confirmation import add_confirmation
-from signals.smartscore import add_smartscore
-from tagging.tagger import apply_tags
-from alerts.alerts import generate_alerts
-from alerts.alert_ui import show_alerts
-from features.buy_zone_map import add_buy_zone
-from features.dma_crossover import add_dma_crossover
-from features.eps_growth_screener import add_eps_growth_score
-from features.sector_leaderboard import sector_leaderboard_table
-from features.discover_top10 import discover_top10
-from watchlist_builder.suggestor import build_watchlist
+from config import APP_TITLE, BUY_THRESHOLD, LIGHT_THEME, DISCOVER_TIERS, SMART_WEIGHTS, WATCH_THRESHOLD
+from dashboard.data_handle import DataHandle
+from dashboard.loader import current_version, load_industry, load_previous, load_rotation, load_version
+from metrics.metrics import METRICS, enabled as metrics_enabled, set_role as set_metrics_role
+from tagging.tagger import TAG_BUY
+
+if TYPE_CHECKING:
+    from alerts.rules import AlertEngine
 
+set_metrics_role("dashboard")
 st.set_page_config(page_title=APP_TITLE, layout="wide")
 st.markdown(
     f"""
@@ -43,46 +35,67 @@ st.markdown(
 )
 st.title(APP_TITLE)
 
-@st.cache_data(ttl=1800)
-def load_data() -> pd.DataFrame:
-    raw_watch, _ = get_raw_frames()
-    df = clean_watchlist(raw_watch)
-    df = add_momentum(df)
-    df = add_value(df)
-    df = add_volume(df)
-    df = add_timing(df)
-    df = add_confirmation(df)
-    df = add_buy_zone(df)
-    df = add_dma_crossover(df)
-    df = add_eps_growth_score(df)
-    df = add_smartscore(df)
-    df = apply_tags(df, BUY_THRESHOLD, WATCH_THRESHOLD)
-    return df
-
-stocks_df = load_data()
+@st.cache_resource(max_entries=2)
+def get_handle(version: str) -> DataHandle:
+    # One shared, read-only frame (+ memoized views) per data version for
+    # every session: live segment of the refresh worker, else disk cache
+    return DataHandle(version, load_version(version), load_industry(), load_rotation(), load_previous(version))
+
+@st.cache_resource
+def get_alert_engine() -> AlertEngine:
+    # User rules (ALERT_RULES_FILE) with de-dup state shared by all sessions
+    from alerts.rules import AlertEngine, load_rules
+
+    return AlertEngine(load_rules())
+
+def render_alerts(messages: list[str]) -> None:
+    # Alert UI loads on first render, not at startup
+    from alerts.alert_ui import show_alerts
+
+    show_alerts(messages)
+
+data = get_handle(current_version())
+
+# Per-session SmartScore weights / thresholds: re-weighted from the cached
+# sub-scores, no signal re-run; the configured ones serve `data` itself
+with st.sidebar.expander("⚖️ SmartScore Tuning"):
+    weights = {
+        key: st.slider(key.replace("_", " ").title(), 0, 50, default, key=f"weight_{key}")
+        for key, default in SMART_WEIGHTS.items()
+    }
+    buy_th   = st.slider("BUY threshold",   0, 100, BUY_THRESHOLD)
+    watch_th = st.slider("WATCH threshold", 0, 100, WATCH_THRESHOLD)
+if sum(weights.values()) == 0:
+    st.sidebar.warning("All weights are zero; using the configured weights.")
+    weights = SMART_WEIGHTS
+view = data.rescored(weights, buy_th, watch_th)
 
 # Sidebar filters
 st.sidebar.header("Filters")
-sector_sel   = st.sidebar.multiselect("Sector",   stocks_df["sector"].dropna().unique())
-category_sel = st.sidebar.multiselect("Category", stocks_df["category"].dropna().unique())
-tag_sel      = st.sidebar.multiselect("Tag",      stocks_df["tag"].dropna().unique())
+sector_sel   = st.sidebar.multiselect("Sector",   view.options("sector"))
+category_sel = st.sidebar.multiselect("Category", view.options("category"))
+tag_sel      = st.sidebar.multiselect("Tag",      view.options("tag"))
 score_min, score_max = st.sidebar.slider("SmartScore", 0, 100, (0, 100))
 
-filtered = (
-    stocks_df
-    .loc[
-        (sector_sel == [] or stocks_df["sector"].isin(sector_sel)) &
-        (category_sel == [] or stocks_df["category"].isin(category_sel)) &
-        (tag_sel == [] or stocks_df["tag"].isin(tag_sel)) &
-        stocks_df["smartscore"].between(score_min, score_max)
-    ]
-)
+# Change and newly-triggered alerts follow the published scores, not the what-if
+render_alerts(view.alerts() + data.change_alerts() + data.new_alerts(get_alert_engine()))
 
-alerts = generate_alerts(stocks_df)
-show_alerts(alerts)
+changes = data.changes()
+if changes is not None:
+    with st.expander("🔀 Changes Since Last Refresh"):
+        st.dataframe(changes.matrix(), use_container_width=True)
+        st.markdown("**Tag transitions**")
+        st.dataframe(changes.transitions, use_container_width=True)
+        st.markdown("**Biggest SmartScore moves**")
+        st.dataframe(changes.movers, use_container_width=True)
+        col_add, col_rm = st.columns(2)
+        col_add.markdown("**New tickers**")
+        col_add.dataframe(changes.added, use_container_width=True)
+        col_rm.markdown("**Removed tickers**")
+        col_rm.dataframe(changes.removed, use_container_width=True)
 
 with st.expander("🌐 Sector Leaderboard", expanded=True):
-    st.dataframe(sector_leaderboard_table(stocks_df), use_container_width=True)
+    st.dataframe(view.sector_leaderboard(), use_container_width=True)
 
 st.subheader("📋 Stock Screener")
 display_cols = [
@@ -90,17 +103,26 @@ display_cols = [
     "smartscore", "tag", "momentum_score", "value_score",
     "volume_score", "buy_zone_score", "dma20_above_50", "dma50_above_200"
 ]
-st.dataframe(filtered[display_cols].sort_values("smartscore", ascending=False),
-             use_container_width=True)
+# Answered from the per-version filter index, already in SmartScore order
+filtered = view.filter(sector_sel, category_sel, tag_sel, (score_min, score_max), columns=display_cols)
+st.dataframe(filtered, use_container_width=True)
 
 with st.expander("🏅 Discover Tier Top Movers", expanded=False):
-    top_dict = discover_top10(stocks_df, n=5)
+    top_dict = view.discover_top(n=5)
     for tier, df_tier in top_dict.items():
         if not df_tier.empty:
             st.markdown(f"**{tier}**")
             st.table(df_tier[["ticker", "smartscore", "7_days_returns"]])
 
+if metrics_enabled():
+    with st.expander("⏱️ Pipeline Metrics (this process)", expanded=False):
+        st.caption("cpu_s: CPU time of the thread running each stage; max_rss_growth_mb: resident "
+                   "memory a run still held when it ended; max_peak_mb: highest traced memory "
+                   "during a run (MANTRA_METRICS_MEMORY=1 only).")
+        st.dataframe(METRICS.frame(), use_container_width=True)
+        st.dataframe(METRICS.cache_frame(), use_container_width=True)
+
 st.sidebar.markdown("---")
 if st.sidebar.button("🚀 Build Auto Watchlist (Top 50)"):
-    wl = build_watchlist(stocks_df, tag="🟢 BUY", max_items=50)
+    wl = view.watchlist(tag=TAG_BUY, max_items=50)
     st.sidebar.dataframe(wl[["ticker", "smartscore"]])
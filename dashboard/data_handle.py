@@ -0,0 +1,223 @@
+# dashboard/data_handle.py
+"""Shared Data Handle
+
+One read-only scored frame per data version, shared by every session and
+rerun of the dashboard (the app keeps it in ``st.cache_resource``, so it is
+neither pickled nor copied per rerun).
+
+Derived views — sidebar options, filtered screener, alerts, sector
+leaderboard, Discover tier tops, auto watchlist — are computed once per
+version and memoized on the handle.  `rescored` hands out a derived handle
+for other SmartScore weights / thresholds (re-weighted from the cached
+sub-score matrix, no signal re-run) with views of its own.  Everything
+returned is shared: callers must treat it as read-only.
+
+The feature, alert and watchlist modules behind the views are imported when
+a view is first built, not when the dashboard starts.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable, Mapping, Optional, TypeVar
+
+import pandas as pd
+
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+
+if TYPE_CHECKING:
+    from alerts.rules import AlertEngine
+    from dashboard.filters import FilterIndex
+    from features.snapshot_diff import SnapshotDiff
+    from features.topk import Ranker
+    from signals.reweight import SubScoreMatrix
+
+__all__ = ["DataHandle"]
+
+T = TypeVar("T")
+
+_FILTER_CACHE: int = 128  # distinct sidebar combinations kept per version
+_RESCORED_CACHE: int = 8  # distinct weight / threshold settings kept per version
+
+
+class DataHandle:
+    """Immutable scored frame for one data *version* plus memoized views.
+
+    *industry* (`industry_metrics`) and *rotation* (`rotation_scores`) are
+    joined into the sector leaderboard when given; *previous* is the frame
+    this version replaced, for the change views.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        frame: pd.DataFrame,
+        industry: Optional[pd.DataFrame] = None,
+        rotation: Optional[pd.DataFrame] = None,
+        previous: Optional[pd.DataFrame] = None,
+    ) -> None:
+        self.version = version
+        self._frame = frame
+        self._industry = industry
+        self._rotation = rotation
+        self._previous = previous
+        self._lock = threading.Lock()
+        self._views: dict[Hashable, object] = {}
+        self._filters: OrderedDict[Hashable, pd.DataFrame] = OrderedDict()
+        self._rescored: OrderedDict[Hashable, DataHandle] = OrderedDict()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The shared scored frame (read-only)."""
+        return self._frame
+
+    def _memo(self, key: Hashable, build: Callable[[], T]) -> T:
+        try:
+            return self._views[key]  # type: ignore[return-value]
+        except KeyError:
+            pass
+        value = build()
+        with self._lock:
+            return self._views.setdefault(key, value)  # type: ignore[return-value]
+
+    # -- views -----------------------------------------------------------------
+
+    def options(self, column: str) -> list:
+        """Distinct non-null values of *column* for a sidebar multiselect."""
+        return self._memo(("options", column), lambda: list(self._frame[column].dropna().unique()))
+
+    @property
+    def ranker(self) -> Ranker:
+        """Shared score orders for every top-N view of this version."""
+        from features.topk import Ranker
+
+        return self._memo("ranker", lambda: Ranker(self._frame))
+
+    def alerts(self) -> list[str]:
+        from alerts.alerts import generate_alerts
+
+        return self._memo("alerts", lambda: generate_alerts(self._frame, self.ranker))
+
+    def changes(self) -> Optional[SnapshotDiff]:
+        """Tag transitions, score movers and universe changes since *previous*."""
+        if self._previous is None:
+            return None
+        from features.snapshot_diff import diff_snapshots
+
+        return self._memo("changes", lambda: diff_snapshots(self._previous, self._frame))
+
+    def change_alerts(self) -> list[str]:
+        from features.snapshot_diff import transition_alerts
+
+        diff = self.changes()
+        return [] if diff is None else self._memo("change_alerts", lambda: transition_alerts(diff))
+
+    def new_alerts(self, engine: AlertEngine) -> list[str]:
+        """Messages for tickers that newly triggered *engine*'s rules.
+
+        The engine evaluates each version once, so every session sees the
+        same events for this version.
+        """
+        return [event.message for event in engine.evaluate(self._frame, self.version)]
+
+    def sector_leaderboard(self) -> pd.DataFrame:
+        from features.sector_analytics import sector_leaderboard_view
+
+        return self._memo(
+            "sector_leaderboard",
+            lambda: sector_leaderboard_view(self._frame, self._industry, self._rotation),
+        )
+
+    def discover_top(self, n: int = 5) -> dict[str, pd.DataFrame]:
+        from features.discover_top10 import discover_top10
+
+        return self._memo(("discover_top", n), lambda: discover_top10(self._frame, n=n, ranker=self.ranker))
+
+    def watchlist(self, tag: Optional[str] = None, min_score: Optional[float] = None,
+                  max_items: int = 50) -> pd.DataFrame:
+        from watchlist_builder.suggestor import build_watchlist
+
+        return self._memo(
+            ("watchlist", tag, min_score, max_items),
+            lambda: build_watchlist(self._frame, tag=tag, min_score=min_score, max_items=max_items,
+                                    ranker=self.ranker),
+        )
+
+    @property
+    def sub_scores(self) -> SubScoreMatrix:
+        """Float32 sub-score matrix for re-weighting, built on first use."""
+        from signals.reweight import SubScoreMatrix
+
+        return self._memo("sub_scores", lambda: SubScoreMatrix(self._frame))
+
+    def rescored(
+        self,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> DataHandle:
+        """Handle on this version with SmartScores and tags for *weights* and
+        the thresholds; *self* for the configured ones.
+
+        The last `_RESCORED_CACHE` settings are kept, so sessions exploring
+        the same weighting share its views.
+        """
+        key = (tuple(sorted(weights.items())), buy_th, watch_th)
+        if key == (tuple(sorted(SMART_WEIGHTS.items())), BUY_THRESHOLD, WATCH_THRESHOLD):
+            return self
+        with self._lock:
+            if key in self._rescored:
+                self._rescored.move_to_end(key)
+                return self._rescored[key]
+
+        frame = self.sub_scores.rescore(self._frame, weights, buy_th, watch_th)
+        handle = DataHandle(f"{self.version}?{key!r}", frame, self._industry, self._rotation, self._previous)
+        with self._lock:
+            handle = self._rescored.setdefault(key, handle)
+            self._rescored.move_to_end(key)
+            if len(self._rescored) > _RESCORED_CACHE:
+                self._rescored.popitem(last=False)
+        return handle
+
+    @property
+    def index(self) -> FilterIndex:
+        """Screener filter index, built on first use."""
+        from dashboard.filters import FilterIndex
+
+        return self._memo("filter_index", lambda: FilterIndex(self._frame))
+
+    def filter(
+        self,
+        sectors: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        score_range: tuple[float, float] = (0, 100),
+        columns: Iterable[str] | None = None,
+    ) -> pd.DataFrame:
+        """Screener rows matching the sidebar, by SmartScore descending.
+
+        Empty selections mean "all"; *columns* limits what is copied out.
+        Answered from the `FilterIndex`; the last `_FILTER_CACHE` distinct
+        combinations are kept, so sessions share each other's results.
+        """
+        cols = tuple(columns) if columns is not None else None
+        key = (tuple(sectors), tuple(categories), tuple(tags), tuple(score_range), cols)
+        with self._lock:
+            if key in self._filters:
+                self._filters.move_to_end(key)
+                return self._filters[key]
+
+        rows = self.index.query(
+            {"sector": key[0], "category": key[1], "tag": key[2]},
+            score_range,
+        )
+        if cols is None:
+            result = self._frame.take(rows)
+        else:
+            result = self._frame.iloc[rows, self._frame.columns.get_indexer(cols)]
+
+        with self._lock:
+            self._filters[key] = result
+            if len(self._filters) > _FILTER_CACHE:
+                self._filters.popitem(last=False)
+        return result
@@ -0,0 +1,92 @@
+# dashboard/filters.py
+"""Screener Filter Index
+
+Per-version index that answers the sidebar filters without scanning the
+frame on every rerun:
+
+* rows are ranked once by SmartScore (descending, NaN last), so a score
+  range is a contiguous slice found with two ``searchsorted`` calls;
+* every value of each categorical column has a bitmap in rank space;
+  a multiselect is the OR of its values' bitmaps over that slice, and
+  different columns are ANDed.
+
+`FilterIndex.query` therefore returns row positions already in score
+order.  Built once per data version (see `DataHandle`).
+"""
+from __future__ import annotations
+
+from typing import Final, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["FilterIndex", "FILTER_COLUMNS"]
+
+FILTER_COLUMNS: Final[tuple[str, ...]] = ("sector", "category", "tag")
+
+
+class FilterIndex:
+    """SmartScore-ordered rank array plus per-value bitmaps.
+
+    Args:
+        df: Scored frame.
+        columns: Categorical columns the sidebar filters on.
+        score: Column that orders the results and takes range queries.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        columns: Iterable[str] = FILTER_COLUMNS,
+        score: str = "smartscore",
+    ) -> None:
+        values = df[score].to_numpy(dtype=np.float64)
+        # Stable descending order with NaN last: sort -score ascending
+        self._order = np.argsort(-values, kind="stable")
+        self._neg = -values[self._order]
+        self._bitmaps: dict[str, dict[object, np.ndarray]] = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col].to_numpy()[self._order])
+            ranked = {value: codes == i for i, value in enumerate(uniques)}
+            self._bitmaps[col] = ranked
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _range(self, lo: float, hi: float) -> tuple[int, int]:
+        """Rank slice whose scores are within ``[lo, hi]``."""
+        start = int(np.searchsorted(self._neg, -hi, side="left"))
+        stop = int(np.searchsorted(self._neg, -lo, side="right"))
+        return start, max(start, stop)
+
+    def query(
+        self,
+        selections: Mapping[str, Iterable[object]] | None = None,
+        score_range: tuple[float, float] = (0, 100),
+    ) -> np.ndarray:
+        """Row positions matching every non-empty selection, best score first.
+
+        Args:
+            selections: ``{column: values}``; an empty or missing selection
+                means "all".  Values not present in the frame match nothing.
+            score_range: Inclusive SmartScore bounds.
+        """
+        start, stop = self._range(*score_range)
+        mask: np.ndarray | None = None
+        for col, selected in (selections or {}).items():
+            selected = list(selected)
+            if not selected:
+                continue
+            bitmaps = self._bitmaps.get(col)
+            if bitmaps is None:
+                raise KeyError(f"{col!r} is not indexed")
+            hit = np.zeros(stop - start, dtype=bool)
+            for value in selected:
+                bitmap = bitmaps.get(value)
+                if bitmap is not None:
+                    hit |= bitmap[start:stop]
+            mask = hit if mask is None else mask & hit
+        ranked = self._order[start:stop]
+        return ranked if mask is None else ranked[mask]
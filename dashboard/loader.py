@@ -0,0 +1,208 @@
+# dashboard/loader.py
+"""Dashboard data loader
+
+Wraps ingest → clean → score for the UI with a persistent, stale-while-
+revalidate cache:
+
+* the cleaned and scored frames are stored under ``SNAPSHOT_DIR/cache``,
+  keyed by the sha256 of the source CSV (plus the scoring config for the
+  scored frame);
+* on startup the last good scored frame is served straight from disk and,
+  if it is older than ``max_age``, a background thread re-fetches the sheet
+  and rebuilds it only when the content actually changed;
+* every newly built scored frame is also appended to the snapshot history
+  (``SNAPSHOT_DIR/history``);
+* the Industry Analysis tab, fetched alongside, is cleaned and cached as
+  the ``industry`` stage for the sector leaderboard.
+
+Only a completely cold cache (first run ever) blocks on Google Sheets.
+
+When the refresh worker (``python -m pipeline.refresher``) is running, its
+published `SharedFrame` segment is served instead and the dashboard never
+refreshes by itself.
+
+The fetch / clean / score / sector modules are imported on first use, so a
+worker that only serves the live segment or the disk cache never loads
+``requests`` or the signal engine.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+
+import pandas as pd
+
+from config import BUY_THRESHOLD, REFRESH_SECONDS, SMART_WEIGHTS, WATCH_THRESHOLD
+from metrics.metrics import cache_event, stage, write_prometheus
+from storage.frame_cache import FrameCache
+from storage.shared_frame import SharedFrame
+from storage.snapshot_store import SnapshotStore
+
+__all__ = [
+    "current_version",
+    "warm_start",
+    "load_version",
+    "load_previous",
+    "load_industry",
+    "load_rotation",
+    "refresh",
+]
+
+log = logging.getLogger(__name__)
+
+_CACHE = FrameCache()
+_HISTORY = SnapshotStore()
+_SEGMENT = SharedFrame()
+_LIVE: str = "live:"
+_REFRESH_LOCK = threading.Lock()
+_SPAWN_LOCK = threading.Lock()
+_revalidating = threading.Event()
+
+# The scored frame also depends on the scoring config
+_CONFIG_SALT: str = hashlib.sha256(
+    json.dumps([SMART_WEIGHTS, BUY_THRESHOLD, WATCH_THRESHOLD], sort_keys=True).encode()
+).hexdigest()[:12]
+
+
+def _scored_key(source_hash: str) -> str:
+    return f"{source_hash[:32]}-{_CONFIG_SALT}"
+
+
+def refresh() -> str:
+    """Fetch the sheet and rebuild stale stages; return the scored key."""
+    with _REFRESH_LOCK, stage("refresh"):
+        key = _refresh()
+    write_prometheus()
+    return key
+
+
+def _refresh() -> str:
+    from clean.clean import clean_watchlist
+    from ingest.ingest import fetch_sheets
+    from signals.memo import MEMO
+
+    with stage("ingest.fetch"):
+        results = fetch_sheets()
+    if "industry" in results:
+        _store_industry(results["industry"].frame, results["industry"].content_hash)
+    result = results["watchlist"]
+    key = _scored_key(result.content_hash)
+    if _CACHE.has("scored", key):
+        cache_event("scored", hit=True)
+        _CACHE.mark_latest("scored", key)
+        return key
+    cache_event("scored", hit=False)
+
+    clean_key = result.content_hash[:32]
+    cleaned = _CACHE.get("clean", clean_key)
+    if cleaned is None:
+        cleaned = clean_watchlist(result.frame)
+        _CACHE.put("clean", clean_key, cleaned)
+    scored = MEMO.score_frame(cleaned, SMART_WEIGHTS, BUY_THRESHOLD, WATCH_THRESHOLD)
+    _CACHE.put("scored", key, scored, replaces=_CACHE.latest_key("scored"))
+    try:
+        with stage("history.append", rows_in=len(scored)):
+            _HISTORY.append(scored)
+    except Exception:  # history is best effort; serving comes first
+        log.exception("Snapshot history append failed")
+    return key
+
+
+def _store_industry(raw: pd.DataFrame, content_hash: str) -> None:
+    from clean.clean import clean_industry
+
+    key = content_hash[:32]
+    if _CACHE.has("industry", key):
+        _CACHE.mark_latest("industry", key)
+        return
+    try:
+        _CACHE.put("industry", key, clean_industry(raw))
+    except Exception:  # the leaderboard simply goes without industry metrics
+        log.exception("Industry tab could not be cleaned")
+
+
+def _revalidate() -> None:
+    try:
+        refresh()
+    except Exception:  # keep serving the last good frame
+        log.exception("Background refresh failed")
+    finally:
+        _revalidating.clear()
+
+
+def warm_start(max_age: float = REFRESH_SECONDS) -> str:
+    """Return the key of the frame to serve now.
+
+    Serves the last good frame if there is one and revalidates it in the
+    background when older than *max_age*; otherwise builds it synchronously.
+    """
+    key = _CACHE.latest_key("scored")
+    if key is None:
+        return refresh()
+    if _CACHE.latest_age("scored") > max_age:
+        with _SPAWN_LOCK:
+            if not _revalidating.is_set():
+                _revalidating.set()
+                threading.Thread(target=_revalidate, name="mantra-revalidate", daemon=True).start()
+    return key
+
+
+def current_version(max_age: float = REFRESH_SECONDS) -> str:
+    """Return the key of the frame to serve now.
+
+    The refresh worker's newest segment while it is alive; otherwise (no
+    worker, or no heartbeat for more than two intervals) `warm_start`.
+    """
+    version = _SEGMENT.version()
+    if version is not None and _SEGMENT.age() <= 2 * max_age:
+        return f"{_LIVE}{version}"
+    return warm_start(max_age)
+
+
+def load_version(key: str) -> pd.DataFrame:
+    """Read the scored frame stored under *key*.
+
+    A live segment is mapped, not copied: its numeric and categorical
+    columns are shared read-only with every other process on that version
+    (`SharedFrame.frame`).
+    """
+    if key.startswith(_LIVE):
+        return _SEGMENT.frame(int(key[len(_LIVE):]))
+    df = _CACHE.get("scored", key)
+    if df is None:
+        raise KeyError(f"No scored frame cached for {key}")
+    return df
+
+
+def load_industry() -> pd.DataFrame | None:
+    """Latest cleaned Industry Analysis tab, indexed for the sector join."""
+    key = _CACHE.latest_key("industry")
+    if key is None:
+        return None
+    from features.sector_analytics import industry_metrics
+
+    return industry_metrics(_CACHE.get("industry", key))
+
+
+def load_rotation() -> pd.DataFrame:
+    """Sector rotation scores over the last `ROTATION_LOOKBACK` stored days."""
+    from features.sector_analytics import ROTATION_LOOKBACK, rotation_scores, sector_history
+
+    return rotation_scores(sector_history(_HISTORY, days=ROTATION_LOOKBACK), ROTATION_LOOKBACK)
+
+
+def load_previous(key: str) -> pd.DataFrame | None:
+    """The frame the one served under *key* replaced, with only the columns
+    the diff needs: the prior live segment, or the cached scored frame its
+    refresh superseded.  None when there is none (first frame, pruned)."""
+    from features.snapshot_diff import DIFF_COLUMNS
+
+    if key.startswith(_LIVE):
+        try:
+            return _SEGMENT.frame(int(key[len(_LIVE):]) - 1, columns=DIFF_COLUMNS)
+        except FileNotFoundError:
+            return None
+    previous = _CACHE.previous_key("scored", key)
+    return None if previous is None else _CACHE.get("scored", previous, columns=DIFF_COLUMNS)
@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 def add_buy_zone(df: pd.DataFrame) -> pd.DataFrame:
     """Return df with new `buy_zone_score` column (0–100)."""
     work = df.copy()
@@ -42,7 +45,7 @@ def add_buy_zone(df: pd.DataFrame) -> pd.DataFrame:
     # Combine metrics as average then percentile scale
     raw = sum(m.fillna(0) for m in metrics) / len(metrics)
     # percentile rank to 0–100
-    work['buy_zone_score'] = raw.rank(pct=True).mul(100).round(2)
+    work['buy_zone_score'] = rank_series(raw, nan="keep").mul(100).round(2).astype(SCORE_DTYPE)
     return work
 
 __all__ = ['add_buy_zone']
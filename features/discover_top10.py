@@ -7,30 +7,30 @@ Pure function only; returns a dict of DataFrames keyed by tier.
 """
 from __future__ import annotations
 
+from typing import Optional
+
 import pandas as pd
 from config import DISCOVER_TIERS
+from features.topk import Ranker
 
 __all__ = ["discover_top10"]
 
-def discover_top10(df: pd.DataFrame, n: int = 5) -> dict[str, pd.DataFrame]:
+def discover_top10(
+    df: pd.DataFrame, n: int = 5, ranker: Optional[Ranker] = None
+) -> dict[str, pd.DataFrame]:
     """Return top N movers per Discover tier.
 
+    All tiers are ranked in one grouped pass (see `Ranker.top_by`).
+
     Returns:
         { tier_name: DataFrame of top N rows }
     """
-    results: dict[str, pd.DataFrame] = {}
-    for tier in DISCOVER_TIERS:
-        if "discover" not in df.columns:
-            results[tier] = pd.DataFrame()
-            continue
-        tier_df = df[df["discover"] == tier]
-        if tier_df.empty:
-            results[tier] = pd.DataFrame()
-            continue
-        # rank by smartscore, then by 7-day returns
-        ranked = tier_df.sort_values(
-            by=["smartscore", "7_days_returns"],
-            ascending=[False, False]
-        ).head(n)
-        results[tier] = ranked.reset_index(drop=True)
-    return results
+    if "discover" not in df.columns:
+        return {tier: pd.DataFrame() for tier in DISCOVER_TIERS}
+    ranker = ranker or Ranker(df)
+    # rank by smartscore, then by 7-day returns
+    tops = ranker.top_by("discover", n, "smartscore", then="7_days_returns")
+    return {
+        tier: df.take(tops[tier]).reset_index(drop=True) if tier in tops else pd.DataFrame()
+        for tier in DISCOVER_TIERS
+    }
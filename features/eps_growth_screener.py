@@ -10,6 +10,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ['add_eps_growth_score']
 
 def add_eps_growth_score(df: pd.DataFrame) -> pd.DataFrame:
@@ -22,11 +25,10 @@ def add_eps_growth_score(df: pd.DataFrame) -> pd.DataFrame:
         eps_col = 'eps_change'
     else:
         # No EPS change data; assign neutral
-        work['eps_growth_score'] = 50.0
+        work['eps_growth_score'] = SCORE_DTYPE(50.0)
         return work
 
     # Percentile rank of EPS growth (higher is better)
-    eps_vals = work[eps_col].fillna(0)
-    eps_pct = eps_vals.rank(pct=True)
-    work['eps_growth_score'] = (eps_pct * 100).round(2)
+    eps_pct = rank_series(work[eps_col], nan="zero")
+    work['eps_growth_score'] = (eps_pct * 100).round(2).astype(SCORE_DTYPE)
     return work
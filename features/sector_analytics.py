@@ -0,0 +1,229 @@
+# features/sector_analytics.py
+"""Sector Analytics
+
+Everything the sector leaderboard shows, computed with vectorized grouped
+reductions instead of per-sector ``groupby.apply``:
+
+* `sector_aggregates` — avg SmartScore, count, % up over 1Y, 1Y volatility,
+  3Y/5Y average return and rank, from one ``factorize`` + ``bincount`` pass;
+* `industry_metrics` — the cleaned Industry Analysis tab indexed by a
+  normalized sector key, ready for an indexed join;
+* `sector_history` / `rotation_scores` — per-day sector averages read from
+  the snapshot history (each immutable snapshot is reduced once and kept
+  in a bounded LRU) and a rotation score: how far each sector's latest
+  average is above or below its own trailing window;
+* `sector_leaderboard_view` — aggregates + rotation + industry metrics in
+  one frame, built once per data version (see `DataHandle`).
+
+Pure computation except for the snapshot reads in `sector_history`.
+"""
+from __future__ import annotations
+
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Final
+
+import numpy as np
+import pandas as pd
+
+from storage.snapshot_store import SnapshotStore
+
+__all__ = [
+    "sector_aggregates",
+    "industry_metrics",
+    "sector_history",
+    "rotation_scores",
+    "sector_leaderboard_view",
+]
+
+ROTATION_LOOKBACK: Final[int] = 20  # snapshot days in the trailing window
+
+_KEY: Final[str] = "_sector_key"
+
+# (store root, date, seq, column) → per-sector mean of that snapshot, LRU;
+# holds a few lookback windows so long-running processes stay bounded
+_DAILY_CACHE: Final[int] = 4 * ROTATION_LOOKBACK
+_DAILY: OrderedDict[tuple[str, object, int, str], pd.Series] = OrderedDict()
+_DAILY_LOCK = threading.Lock()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧮 Grouped reductions
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _group_stats(codes: np.ndarray, values: np.ndarray, groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-group mean and sample std (ddof=1) of the non-NaN *values*."""
+    ok = ~np.isnan(values)
+    c, v = codes[ok], values[ok]
+    n = np.bincount(c, minlength=groups).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(c, weights=v, minlength=groups) / n
+        # Two-pass variance: sum of squared deviations from the group mean
+        ss = np.bincount(c, weights=(v - mean[c]) ** 2, minlength=groups)
+        std = np.sqrt(ss / (n - 1))
+    std[n < 2] = np.nan
+    return mean, std
+
+
+def sector_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """Leaderboard aggregates per sector, best average SmartScore first.
+
+    Same columns and values as the former ``groupby`` version: rows without
+    a sector are ignored, ``pct_up_1y`` counts a missing 1Y return as not up.
+    """
+    cols = ["sector", "avg_smartscore", "count", "pct_up_1y",
+            "volatility_1y", "avg_return_3y", "avg_return_5y", "rank"]
+    if "sector" not in df.columns:
+        return pd.DataFrame(columns=cols)
+    codes, sectors = pd.factorize(df["sector"], sort=True)
+    ok = codes >= 0
+    codes, g = codes[ok], len(sectors)
+
+    score_mean, _ = _group_stats(codes, _column(df, "smartscore")[ok], g)
+    ret_1y = _column(df, "1_year")[ok]
+    mean_1y, std_1y = _group_stats(codes, ret_1y, g)
+    mean_3y, _ = _group_stats(codes, _column(df, "3_year")[ok], g)
+    mean_5y, _ = _group_stats(codes, _column(df, "5_year")[ok], g)
+    count = np.bincount(codes, minlength=g)
+    up = np.bincount(codes, weights=(ret_1y > 0), minlength=g)
+
+    summary = pd.DataFrame({
+        "sector":         np.asarray(sectors),
+        "avg_smartscore": np.round(score_mean, 2),
+        "count":          count,
+        "pct_up_1y":      np.round(up / np.maximum(count, 1) * 100, 2),
+        "volatility_1y":  np.round(std_1y, 2),
+        "avg_return_3y":  np.round(mean_3y, 2),
+        "avg_return_5y":  np.round(mean_5y, 2),
+    })
+    # Rank sectors by avg_smartscore
+    summary["rank"] = summary["avg_smartscore"].rank(ascending=False).astype(int)
+    return summary.sort_values("rank")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏭 Industry Analysis join
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _normalize(values: pd.Series) -> pd.Index:
+    return pd.Index(values.astype("string").str.strip().str.casefold(), name=_KEY)
+
+
+def industry_metrics(industry: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned Industry Analysis frame indexed by normalized sector name.
+
+    The first column of the tab names the sector; duplicates keep the
+    first row.  Build it once per industry version and reuse it.
+    """
+    if industry is None or industry.empty:
+        return pd.DataFrame(index=pd.Index([], name=_KEY, dtype="string"))
+    out = industry.set_axis(_normalize(industry.iloc[:, 0]), axis=0).iloc[:, 1:]
+    return out[~out.index.duplicated(keep="first")]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔄 Rotation across snapshots
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _daily_means(store: SnapshotStore, date, seq: int, column: str) -> pd.Series:
+    key = (str(store.root), date, seq, column)
+    with _DAILY_LOCK:
+        cached = _DAILY.get(key)
+        if cached is not None:
+            _DAILY.move_to_end(key)
+    if cached is None:
+        day = store.day(date, columns=["sector", column], seq=seq)
+        codes, sectors = pd.factorize(day["sector"], sort=True)
+        ok = codes >= 0
+        mean, _ = _group_stats(codes[ok], _column(day, column)[ok], len(sectors))
+        cached = pd.Series(mean, index=pd.Index(np.asarray(sectors), name="sector"), name=date)
+        with _DAILY_LOCK:
+            cached = _DAILY.setdefault(key, cached)
+            while len(_DAILY) > _DAILY_CACHE:
+                _DAILY.popitem(last=False)
+    return cached
+
+
+def sector_history(
+    store: SnapshotStore,
+    column: str = "smartscore",
+    days: int | None = None,
+) -> pd.DataFrame:
+    """Per-sector mean of *column* for the last snapshot of each stored day.
+
+    Returns a date × sector frame, oldest first (only the last *days* days
+    when given).
+    """
+    last: dict[object, int] = {}
+    for date, seq in store.snapshots():
+        last[date] = seq
+    picked = list(last.items())[-days:] if days else list(last.items())
+    if not picked:
+        return pd.DataFrame()
+    series = [_daily_means(store, date, seq, column) for date, seq in picked]
+    out = pd.concat(series, axis=1).T
+    out.index = pd.DatetimeIndex([date for date, _ in picked], name="date")
+    return out
+
+
+def rotation_scores(history: pd.DataFrame, lookback: int = ROTATION_LOOKBACK) -> pd.DataFrame:
+    """Rotation per sector from a date × sector `sector_history` frame.
+
+    ``rotation`` is the z-score of the latest average against the sector's
+    trailing *lookback* days (positive = money rotating in); ``change`` is
+    the move since the start of the window.
+    """
+    cols = ["sector", "score_now", "change", "rotation", "rotation_rank"]
+    if history.empty:
+        return pd.DataFrame(columns=cols)
+    window = history.to_numpy(dtype=np.float64)[-lookback:]
+    now = window[-1]
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # sectors absent from the window
+        mean = np.nanmean(window, axis=0)
+        std = np.nanstd(window, axis=0)
+        first = window[np.argmax(~np.isnan(window), axis=0), np.arange(window.shape[1])]
+        # Flat sectors (std at float noise level) have no rotation
+        rotation = np.where(std > 1e-6, (now - mean) / std, 0.0)
+    rotation[np.isnan(now)] = np.nan
+    out = pd.DataFrame({
+        "sector":     np.asarray(history.columns),
+        "score_now":  np.round(now, 2),
+        "change":     np.round(now - first, 2),
+        "rotation":   np.round(rotation, 2),
+    })
+    out["rotation_rank"] = out["rotation"].rank(ascending=False, method="min").astype("Int64")
+    return out
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏆 Leaderboard view
+# ────────────────────────────────────────────────────────────────────────────────
+
+def sector_leaderboard_view(
+    df: pd.DataFrame,
+    industry: pd.DataFrame | None = None,
+    rotation: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Sector aggregates with rotation scores and industry metrics joined.
+
+    Args:
+        df: Scored frame.
+        industry: `industry_metrics` output (or None to skip).
+        rotation: `rotation_scores` output (or None to skip).
+    """
+    summary = sector_aggregates(df)
+    if rotation is not None and not rotation.empty:
+        rot = rotation.set_index("sector")[["change", "rotation", "rotation_rank"]]
+        summary = summary.join(rot, on="sector")
+    if industry is not None and not industry.columns.empty:
+        summary[_KEY] = _normalize(summary["sector"]).to_numpy()
+        summary = summary.join(industry, on=_KEY, rsuffix="_industry").drop(columns=_KEY)
+    return summary.reset_index(drop=True)
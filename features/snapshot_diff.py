@@ -0,0 +1,134 @@
+# features/snapshot_diff.py
+"""Snapshot Diff
+
+What changed between two scored frames (previous refresh → current):
+
+* tag transitions (e.g. WATCH → BUY, BUY → AVOID) and their counts;
+* the biggest SmartScore moves, up and down;
+* tickers added to or removed from the universe.
+
+Both frames are joined on an integer ticker key: one ``factorize`` over
+the concatenated tickers (a single hash pass), then plain array indexing
+— no ``merge``, no per-row Python.  Duplicate tickers keep their last row;
+rows without a ticker are ignored.  Pure computation; returns DataFrames
+for the dashboard and messages for the alert feed.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+import pandas as pd
+
+from tagging.tagger import TAG_AVOID, TAG_BUY, TAG_WATCH
+
+__all__ = ["SnapshotDiff", "diff_snapshots", "transition_alerts", "DIFF_COLUMNS"]
+
+TAGS: Final[list[str]] = [TAG_BUY, TAG_WATCH, TAG_AVOID]
+DIFF_COLUMNS: Final[list[str]] = ["ticker", "name", "smartscore", "tag"]
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """Changes from a previous to the current scored frame.
+
+    Attributes:
+        transitions: Tickers whose tag changed (``tag_prev`` → ``tag``).
+        movers: Largest absolute SmartScore changes, biggest first.
+        added: Tickers only in the current frame.
+        removed: Tickers only in the previous frame.
+    """
+
+    transitions: pd.DataFrame
+    movers: pd.DataFrame
+    added: pd.DataFrame
+    removed: pd.DataFrame
+
+    def matrix(self) -> pd.DataFrame:
+        """Transition counts, previous tag (rows) × current tag (columns)."""
+        prev = pd.Categorical(self.transitions["tag_prev"], categories=TAGS)
+        cur = pd.Categorical(self.transitions["tag"], categories=TAGS)
+        ok = (prev.codes >= 0) & (cur.codes >= 0)
+        counts = np.bincount(prev.codes[ok] * len(TAGS) + cur.codes[ok], minlength=len(TAGS) ** 2)
+        return pd.DataFrame(counts.reshape(len(TAGS), len(TAGS)), index=TAGS, columns=TAGS)
+
+
+def _last_positions(codes: np.ndarray, size: int) -> np.ndarray:
+    """Row of each key in one frame (-1 if absent; last row wins; NaN tickers skipped)."""
+    pos = np.full(size, -1, dtype=np.intp)
+    rows = np.flatnonzero(codes >= 0)
+    pos[codes[rows]] = rows
+    return pos
+
+
+def _column(df: pd.DataFrame, col: str, rows: np.ndarray) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(rows), None, dtype=object)
+    return df[col].to_numpy(dtype=object)[rows]
+
+
+def _subset(df: pd.DataFrame) -> pd.DataFrame:
+    return df[[col for col in DIFF_COLUMNS if col in df.columns]].reset_index(drop=True)
+
+
+def diff_snapshots(previous: pd.DataFrame, current: pd.DataFrame, top: int = 20) -> SnapshotDiff:
+    """Compare two scored frames keyed by ``ticker``.
+
+    Args:
+        previous: Earlier scored frame (only ``DIFF_COLUMNS`` are used).
+        current: Latest scored frame.
+        top: Number of SmartScore movers to keep.
+    """
+    prev_t = previous["ticker"].to_numpy(dtype=object)
+    cur_t = current["ticker"].to_numpy(dtype=object)
+    codes, keys = pd.factorize(np.concatenate([prev_t, cur_t]))
+    prev_codes, cur_codes = codes[: len(prev_t)], codes[len(prev_t):]
+    in_prev = _last_positions(prev_codes, len(keys))
+    in_cur = _last_positions(cur_codes, len(keys))
+
+    # One row per ticker: the key's position in each frame
+    both = np.flatnonzero((in_prev >= 0) & (in_cur >= 0))
+    p, c = in_prev[both], in_cur[both]
+
+    # Scores are stored as float32 with 2 decimals; compare them as such
+    prev_score = np.round(previous["smartscore"].to_numpy(dtype=np.float64, na_value=np.nan)[p], 2)
+    cur_score = np.round(current["smartscore"].to_numpy(dtype=np.float64, na_value=np.nan)[c], 2)
+    joined = pd.DataFrame({
+        "ticker":          current["ticker"].to_numpy(dtype=object)[c],
+        "name":            _column(current, "name", c),
+        "tag_prev":        _column(previous, "tag", p),
+        "tag":             _column(current, "tag", c),
+        "smartscore_prev": prev_score,
+        "smartscore":      cur_score,
+        "delta":           np.round(cur_score - prev_score, 2),
+    })
+
+    changed = (joined["tag_prev"] != joined["tag"]).to_numpy() & joined["tag"].notna().to_numpy()
+    transitions = joined[changed].reset_index(drop=True)
+
+    magnitude = np.abs(joined["delta"].to_numpy())
+    order = np.argsort(-np.nan_to_num(magnitude, nan=-1.0), kind="stable")
+    order = order[~np.isnan(magnitude[order])][:top]
+    movers = joined.take(order).reset_index(drop=True)
+
+    added = current.iloc[in_cur[(in_prev < 0) & (in_cur >= 0)]]
+    removed = previous.iloc[in_prev[(in_cur < 0) & (in_prev >= 0)]]
+    return SnapshotDiff(transitions, movers, _subset(added), _subset(removed))
+
+
+def transition_alerts(diff: SnapshotDiff, limit: int = 5) -> list[str]:
+    """Alert messages for upgrades to BUY, downgrades from BUY and universe changes."""
+    alerts: list[str] = []
+    tr = diff.transitions
+
+    def add(label: str, tickers: pd.Series) -> None:
+        if len(tickers):
+            symbols = tickers.iloc[:limit].tolist()
+            alerts.append(f"{label}: {', '.join(symbols)}" + ('...' if len(tickers) > limit else ''))
+
+    add(f"🔼 Upgraded to {TAG_BUY}", tr.loc[tr["tag"] == TAG_BUY, "ticker"])
+    add(f"🔽 Downgraded from {TAG_BUY}", tr.loc[tr["tag_prev"] == TAG_BUY, "ticker"])
+    add("🆕 New tickers", diff.added["ticker"])
+    add("🗑️ Removed tickers", diff.removed["ticker"])
+    return alerts
@@ -0,0 +1,146 @@
+# features/topk.py
+"""Top-K Ranking Service
+
+One ranking per score per data version, shared by every "best N" view
+(alerts, weekly picks, Discover tiers, auto watchlist) instead of each of
+them calling ``nlargest`` / ``sort_values`` on the same frame.
+
+* `Ranker.order` — cached stable descending argsort of a score (NaN last);
+* `Ranker.top` — best *k* rows, optionally within a boolean mask; uses
+  ``argpartition`` for a small *k* when no full order is cached yet;
+* `Ranker.top_by` — best *n* rows per value of a categorical key (tier,
+  sector, category) in one vectorized pass over the cached order.
+
+Ties keep the earlier row, as ``nlargest(keep="first")`` does.
+Pure computation; returns row positions, callers ``take`` what they need.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Final, Hashable
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["Ranker"]
+
+# Up to this k a cold `top` call partitions instead of sorting everything
+_PARTITION_MAX: Final[int] = 64
+
+
+class Ranker:
+    """Ranking cache over one (read-only) frame."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._lock = threading.Lock()
+        self._orders: dict[str, np.ndarray] = {}
+        self._grouped: dict[tuple[Hashable, ...], dict[object, np.ndarray]] = {}
+
+    def _values(self, score: str) -> np.ndarray:
+        return self.df[score].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def order(self, score: str = "smartscore") -> np.ndarray:
+        """Row positions by *score* descending (stable, NaN last)."""
+        cached = self._orders.get(score)
+        if cached is None:
+            cached = np.argsort(-self._values(score), kind="stable")
+            with self._lock:
+                cached = self._orders.setdefault(score, cached)
+        return cached
+
+    def top(
+        self,
+        k: int,
+        score: str = "smartscore",
+        mask: np.ndarray | pd.Series | None = None,
+        dropna: bool = True,
+    ) -> np.ndarray:
+        """Positions of the *k* highest *score* rows (within *mask*).
+
+        With ``dropna`` rows whose score is NaN are skipped, like
+        ``nlargest``; otherwise they come last, like ``sort_values``.
+        """
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        values = self._values(score)
+        if mask is None and k <= _PARTITION_MAX and score not in self._orders:
+            return self._partition_top(values, k, dropna)
+
+        ranked = self.order(score)
+        if mask is not None:
+            keep = np.asarray(mask, dtype=bool)
+            ranked = ranked[keep[ranked]]
+        if dropna:
+            ranked = ranked[~np.isnan(values[ranked])]
+        return ranked[:k]
+
+    @staticmethod
+    def _partition_top(values: np.ndarray, k: int, dropna: bool) -> np.ndarray:
+        n = len(values)
+        if k >= n:
+            ranked = np.argsort(-values, kind="stable")
+        else:
+            neg = -values
+            kth = neg[np.argpartition(neg, k - 1)[k - 1]]
+            # Everything up to the k-th value, ties included, then a stable sort
+            cand = np.flatnonzero(neg <= kth) if not np.isnan(kth) else np.arange(n)
+            ranked = cand[np.argsort(neg[cand], kind="stable")]
+        if dropna:
+            ranked = ranked[~np.isnan(values[ranked])]
+        return ranked[:k]
+
+    def top_by(
+        self,
+        key: str,
+        n: int,
+        score: str = "smartscore",
+        then: str | None = None,
+    ) -> dict[object, np.ndarray]:
+        """Best *n* positions per value of *key*, ordered by *score* (then
+        *then*) descending; NaN scores sort last within their group.
+
+        Returns ``{group value: positions}`` for the groups present.
+        """
+        cache_key = (key, n, score, then)
+        cached = self._grouped.get(cache_key)
+        if cached is not None:
+            return cached
+
+        codes, groups = pd.factorize(self.df[key].to_numpy(), use_na_sentinel=True)
+        values = self._values(score)
+        ranked = self.order(score)
+        ranked = ranked[codes[ranked] >= 0]                 # drop rows without a group
+        # Group-major, score order kept inside groups (radix sort on small codes)
+        small = codes[ranked].astype(np.min_scalar_type(max(len(groups) - 1, 0)))
+        ranked = ranked[np.argsort(small, kind="stable")]
+        if not len(ranked):
+            return {}
+
+        ranked_codes = codes[ranked]
+        starts = np.flatnonzero(np.r_[True, ranked_codes[1:] != ranked_codes[:-1]])
+        sizes = np.diff(np.r_[starts, len(ranked)])
+        rank = np.arange(len(ranked)) - np.repeat(starts, sizes)
+        keep = rank < n
+
+        if then is not None:
+            # Rows tied with a group's n-th score compete on *then*: re-sort
+            # just the candidates by (group, score, then)
+            cutoff = np.full(len(groups), np.nan)
+            last = starts + np.minimum(sizes, n) - 1
+            cutoff[ranked_codes[last]] = values[ranked[last]]
+            score_r, cut_r = values[ranked], cutoff[ranked_codes]
+            keep |= (score_r >= cut_r) | (np.isnan(cut_r) & np.isnan(score_r))
+            cand = ranked[keep]
+            cand = cand[np.lexsort([-self._values(then)[cand], -values[cand], codes[cand]])]
+            cand_codes = codes[cand]
+            starts = np.flatnonzero(np.r_[True, cand_codes[1:] != cand_codes[:-1]])
+            sizes = np.diff(np.r_[starts, len(cand)])
+            keep = np.arange(len(cand)) - np.repeat(starts, sizes) < n
+            ranked, ranked_codes = cand, cand_codes
+
+        ranked, ranked_codes = ranked[keep], ranked_codes[keep]
+        bounds = np.flatnonzero(np.r_[True, ranked_codes[1:] != ranked_codes[:-1], True])
+        result = {groups[ranked_codes[lo]]: ranked[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])}
+        with self._lock:
+            return self._grouped.setdefault(cache_key, result)
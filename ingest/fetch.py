@@ -0,0 +1,157 @@
+# ingest/fetch.py
+"""FETCH LAYER
+
+HTTP transport for the ingest module.  One pooled keep-alive session per
+process, gzip negotiation, bounded retry with exponential backoff, and
+conditional GETs: the ETag / Last-Modified of every URL is remembered and a
+``304 Not Modified`` reply returns the previously parsed frame without
+touching the CSV parser.  Several URLs can be fetched concurrently.
+
+Download and parse are timed separately (``ingest.download`` /
+``ingest.parse`` stages) and every conditional GET counts as an ``ingest``
+cache hit (304) or miss.
+
+Nothing here is Google-specific, so it can be pointed at any local HTTP
+stand-in server.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Final, Mapping
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics.metrics import cache_event, stage
+
+__all__ = ["FetchResult", "SheetFetcher", "get_fetcher"]
+
+_RETRY_STATUS: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of one (possibly conditional) CSV download."""
+
+    url: str
+    frame: pd.DataFrame
+    content_hash: str          # sha256 of the response body
+    not_modified: bool = False  # True when served from a 304 reply
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class SheetFetcher:
+    """Pooled, conditional, concurrent CSV fetcher.
+
+    Args:
+        pool_size: Keep-alive connections kept per host.
+        retries: Maximum retries per request (connect, read and 5xx/429).
+        backoff: Backoff factor; waits ``backoff * 2**(n-1)`` seconds.
+        timeout: ``(connect, read)`` timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: tuple[float, float] = (5.0, 60.0),
+    ) -> None:
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=_RETRY_STATUS,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._cache: dict[tuple[str, int], FetchResult] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, skiprows: int = 0) -> FetchResult:
+        """GET *url* and parse it as CSV, short-circuiting on 304.
+
+        A 304 without a remembered frame to serve (e.g. the cache was
+        cleared meanwhile) is retried once as a plain GET.
+        """
+        key = (url, skiprows)
+        with self._lock:
+            cached = self._cache.get(key)
+        resp, body = self._get(url, cached)
+        if resp.status_code == 304:
+            if cached is not None:
+                cache_event("ingest", hit=True)
+                return FetchResult(
+                    url, cached.frame, cached.content_hash, True, cached.etag, cached.last_modified
+                )
+            with self._lock:
+                self._cache.pop(key, None)
+            resp, body = self._get(url, None)
+            if resp.status_code == 304:
+                raise requests.HTTPError(f"304 Not Modified for an unconditional GET of {url}", response=resp)
+        cache_event("ingest", hit=False)
+        resp.raise_for_status()
+
+        with stage("ingest.parse") as run:
+            frame = pd.read_csv(io.BytesIO(body), skiprows=skiprows)
+            run.rows_out = len(frame)
+        result = FetchResult(
+            url=url,
+            frame=frame,
+            content_hash=hashlib.sha256(body).hexdigest(),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def _get(self, url: str, cached: FetchResult | None) -> tuple[requests.Response, bytes]:
+        """GET *url*, conditional on *cached*'s validators when given."""
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        with stage("ingest.download"):
+            resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            return resp, resp.content
+
+    def fetch_many(self, urls: Mapping[str, str], skiprows: int = 0) -> dict[str, FetchResult]:
+        """Fetch ``{name: url}`` concurrently; returns ``{name: FetchResult}``."""
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            futures = {name: pool.submit(self.fetch, url, skiprows) for name, url in urls.items()}
+            return {name: fut.result() for name, fut in futures.items()}
+
+    def clear(self) -> None:
+        """Forget every remembered validator and parsed frame."""
+        with self._lock:
+            self._cache.clear()
+
+
+_FETCHER: SheetFetcher | None = None
+_FETCHER_LOCK = threading.Lock()
+
+
+def get_fetcher() -> SheetFetcher:
+    """Return the process-wide shared fetcher (created on first use)."""
+    global _FETCHER
+    with _FETCHER_LOCK:
+        if _FETCHER is None:
+            _FETCHER = SheetFetcher()
+        return _FETCHER
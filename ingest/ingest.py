@@ -3,53 +3,164 @@
 INGEST MODULE
 
 Fetches CSV exports of Watchlist and Industry Analysis tabs from Google Sheets.
-Uses caching to avoid redundant network calls.
+Downloads go through the shared pooled fetcher (`ingest.fetch`): both tabs are
+requested concurrently, and unchanged sheets are answered by a conditional
+GET (304) that reuses the previously parsed frame.
+
+The environment variables below only provide `DEFAULT_SOURCE`; every fetch
+function takes a `SheetSource`, so several sheets (desks, exchanges) can be
+ingested side by side.  The configured spreadsheet ID is resolved on the
+first fetch, not at import.
 """
 from __future__ import annotations
 
+import functools
+import hashlib
+import io
 import os
-from functools import lru_cache
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Final
 
 import pandas as pd
 
 from config import CSV_EXPORT_URL
+from ingest.fetch import FetchResult, get_fetcher
+from metrics.metrics import stage
 
 # Override GIDs for specific tabs
-SPREADSHEET_ID: Final[str] = os.getenv(
-    "SHEET_ID",
-    CSV_EXPORT_URL.split("/d/")[1].split("/")[0]
-)
 WATCHLIST_GID: Final[str] = os.getenv("WATCHLIST_GID", "0")
 INDUSTRY_GID: Final[str] = os.getenv("INDUSTRY_GID", "842039302")
 
-_BASE_URL: Final[str] = (
-    f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv&gid={{gid}}"
-)
+_BASE_URL: Final[str] = "https://docs.google.com/spreadsheets/d/{sheet}/export?format=csv&gid={gid}"
+
+
+@functools.lru_cache(maxsize=None)
+def _configured_sheet_id() -> str:
+    """``SHEET_ID``, else the ID inside the configured sheet URL."""
+    sheet = os.getenv("SHEET_ID")
+    return sheet if sheet is not None else CSV_EXPORT_URL.split("/d/")[1].split("/")[0]
+
+
+@dataclass(frozen=True)
+class SheetSource:
+    """Where one universe's watchlist (and industry tab) comes from.
+
+    Args:
+        name: Label used for outputs (e.g. ``"nse-desk1"``).
+        spreadsheet_id: Google Sheet ID (default: the configured sheet).
+        watchlist_gid: Tab GID of the watchlist.
+        industry_gid: Tab GID of the industry analysis.
+        skiprows: Banner rows above the header.
+        csv: Explicit watchlist CSV URL or local path; overrides the sheet.
+        industry_csv: Industry CSV URL or local path.  A source with *csv*
+            but no *industry_csv* has no industry tab.
+    """
+
+    name: str = "default"
+    spreadsheet_id: str | None = None
+    watchlist_gid: str = WATCHLIST_GID
+    industry_gid: str = INDUSTRY_GID
+    skiprows: int = 3
+    csv: str | None = None
+    industry_csv: str | None = None
+
+    def url(self, gid: str) -> str:
+        return _BASE_URL.format(sheet=self.spreadsheet_id or _configured_sheet_id(), gid=gid)
+
+    @property
+    def watchlist_url(self) -> str:
+        return self.csv or self.url(self.watchlist_gid)
+
+    @property
+    def industry_url(self) -> str | None:
+        """Industry tab location; None for a CSV source without one."""
+        if self.industry_csv is not None:
+            return self.industry_csv
+        return None if self.csv is not None else self.url(self.industry_gid)
+
+
+DEFAULT_SOURCE: Final[SheetSource] = SheetSource()
+
+
+def _is_remote(location: str) -> bool:
+    return location.startswith(("http://", "https://"))
+
+
+def _read_local(path: str, skiprows: int) -> FetchResult:
+    body = Path(path).read_bytes()
+    with stage("ingest.parse") as run:
+        frame = pd.read_csv(io.BytesIO(body), skiprows=skiprows)
+        run.rows_out = len(frame)
+    return FetchResult(url=path, frame=frame, content_hash=hashlib.sha256(body).hexdigest())
+
+
+def _fetch(location: str, skiprows: int) -> FetchResult:
+    """Read a local CSV directly; fetch a URL through the shared fetcher."""
+    if not _is_remote(location):
+        return _read_local(location, skiprows)
+    return get_fetcher().fetch(location, skiprows)
+
+
+def fetch_watchlist(source: SheetSource = DEFAULT_SOURCE) -> FetchResult:
+    """Fetch *source*'s watchlist (URL or local CSV)."""
+    return _fetch(source.watchlist_url, source.skiprows)
+
+
+def _industry_url(source: SheetSource) -> str:
+    url = source.industry_url
+    if url is None:
+        raise ValueError(f"Source {source.name!r} has no industry tab")
+    return url
+
+
+def fetch_industry(source: SheetSource = DEFAULT_SOURCE) -> FetchResult:
+    """Fetch *source*'s Industry Analysis tab (ValueError if it has none)."""
+    return _fetch(_industry_url(source), source.skiprows)
+
 
+def fetch_watchlist_raw(skiprows: int | None = None, source: SheetSource = DEFAULT_SOURCE) -> pd.DataFrame:
+    """Fetch raw Watchlist CSV and return DataFrame (*skiprows* defaults to the source's)."""
+    return _fetch(source.watchlist_url, source.skiprows if skiprows is None else skiprows).frame
 
-def _sheet_url(gid: str) -> str:
-    return _BASE_URL.format(gid=gid)
 
+def fetch_industry_raw(skiprows: int | None = None, source: SheetSource = DEFAULT_SOURCE) -> pd.DataFrame:
+    """Fetch raw Industry Analysis CSV and return DataFrame (*skiprows* defaults to the source's)."""
+    return _fetch(_industry_url(source), source.skiprows if skiprows is None else skiprows).frame
 
-@lru_cache(maxsize=2)
-def fetch_watchlist_raw(skiprows: int = 3) -> pd.DataFrame:
-    """Fetch raw Watchlist CSV and return DataFrame."""
-    url = _sheet_url(WATCHLIST_GID)
-    df = pd.read_csv(url, skiprows=skiprows)
-    return df
 
+def fetch_sheets(
+    skiprows: int | None = None,
+    source: SheetSource = DEFAULT_SOURCE,
+) -> dict[str, FetchResult]:
+    """Fetch every configured tab concurrently; keys are `watchlist`, `industry`.
 
-@lru_cache(maxsize=2)
-def fetch_industry_raw(skiprows: int = 3) -> pd.DataFrame:
-    """Fetch raw Industry Analysis CSV and return DataFrame."""
-    url = _sheet_url(INDUSTRY_GID)
-    df = pd.read_csv(url, skiprows=skiprows)
-    return df
+    Local CSV tabs are read directly; *skiprows* defaults to the source's.
+    `industry` is missing when the source has no industry tab.
+    """
+    skiprows = source.skiprows if skiprows is None else skiprows
+    tabs = {"watchlist": source.watchlist_url}
+    if source.industry_url is not None:
+        tabs["industry"] = source.industry_url
+    remote = {name: url for name, url in tabs.items() if _is_remote(url)}
+    results = get_fetcher().fetch_many(remote, skiprows)
+    results.update({name: _read_local(path, skiprows) for name, path in tabs.items() if name not in remote})
+    return {name: results[name] for name in tabs}
 
 
-def get_raw_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Return watchlist, industry raw DataFrames."""
-    return fetch_watchlist_raw(), fetch_industry_raw()
+def get_raw_frames(source: SheetSource = DEFAULT_SOURCE) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return watchlist, industry raw DataFrames (industry empty if none)."""
+    results = fetch_sheets(source=source)
+    industry = results["industry"].frame if "industry" in results else pd.DataFrame()
+    return results["watchlist"].frame, industry
 
-__all__ = ["get_raw_frames", "fetch_watchlist_raw", "fetch_industry_raw"]
+__all__ = [
+    "SheetSource",
+    "DEFAULT_SOURCE",
+    "get_raw_frames",
+    "fetch_watchlist",
+    "fetch_industry",
+    "fetch_watchlist_raw",
+    "fetch_industry_raw",
+    "fetch_sheets",
+]
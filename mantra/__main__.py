@@ -0,0 +1,5 @@
+# mantra/__main__.py
+"""``python -m mantra`` — headless batch entry point (see `mantra.cli`)."""
+from mantra.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,147 @@
+# mantra/cli.py
+"""Headless Batch CLI
+
+Runs ingest → clean → signals → tags without Streamlit, for cron jobs and
+pre-market batch runs::
+
+    python -m mantra score                               # the configured sheet
+    python -m mantra score desk1.csv desk2.csv --out runs/0915
+    python -m mantra score https://…/export?format=csv --format csv --top 20
+
+Every input (local CSV or URL, banner rows skipped like the sheet export)
+is scored as its own universe.  Per universe the output directory gets::
+
+    <out>/<name>/scored.<ext>      full scored frame
+    <out>/<name>/top_picks.<ext>   best BUY-tagged tickers by SmartScore
+    <out>/<name>/alerts.json       alert messages
+
+plus ``<out>/summary.json`` with rows, timings and errors.  Several inputs
+are scored in parallel worker processes (`pipeline.runner`).  The exit
+status is non-zero when any universe failed.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Final, Mapping
+from urllib.parse import urlparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from alerts.alerts import generate_alerts
+from alerts.top_picks import generate_weekly_top_picks
+from clean.clean import clean_watchlist
+from config import BUY_THRESHOLD, SMART_WEIGHTS, SNAPSHOT_DIR, WATCH_THRESHOLD
+from features.topk import Ranker
+from ingest.ingest import DEFAULT_SOURCE, SheetSource, fetch_watchlist
+from pipeline.runner import UniverseResult, run_universes
+from signals.engine import score_frame
+
+__all__ = ["main", "score_outputs"]
+
+FORMATS: Final[dict[str, str]] = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def _write(path: Path, df: pd.DataFrame, fmt: str) -> Path:
+    """Write *df* atomically as *fmt*."""
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    elif fmt == "arrow":
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="uncompressed")
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def score_outputs(
+    source: SheetSource,
+    out_dir: Path,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+    fmt: str = "parquet",
+    top: int = 10,
+) -> UniverseResult:
+    """Score one universe and write its scored frame, top picks and alerts."""
+    start = time.perf_counter()
+    ext = FORMATS[fmt]
+    try:
+        fetched = fetch_watchlist(source)
+        scored = score_frame(clean_watchlist(fetched.frame), weights, buy_th, watch_th)
+        dest = Path(out_dir) / source.name
+        dest.mkdir(parents=True, exist_ok=True)
+        path = _write(dest / f"scored{ext}", scored, fmt)
+        ranker = Ranker(scored)
+        _write(dest / f"top_picks{ext}", generate_weekly_top_picks(scored, top, ranker, save_to=None), fmt)
+        alerts = generate_alerts(scored, ranker)
+        (dest / "alerts.json").write_text(json.dumps(alerts, ensure_ascii=False, indent=2), encoding="utf-8")
+    except Exception as exc:  # reported per universe; the batch carries on
+        return UniverseResult(source.name, None, seconds=time.perf_counter() - start,
+                              error=f"{type(exc).__name__}: {exc}")
+    return UniverseResult(source.name, path, len(scored), fetched.content_hash, time.perf_counter() - start)
+
+
+def _sources(inputs: list[str], skiprows: int) -> list[SheetSource]:
+    """One `SheetSource` per input, named after the file (unique)."""
+    if not inputs:
+        return [DEFAULT_SOURCE]
+    sources: list[SheetSource] = []
+    seen: set[str] = set()
+    for i, location in enumerate(inputs):
+        stem = Path(urlparse(location).path).stem or f"universe{i}"
+        name = stem if stem not in seen else f"{stem}-{i}"
+        seen.add(name)
+        sources.append(SheetSource(name=name, skiprows=skiprows, csv=location))
+    return sources
+
+
+def _score(args: argparse.Namespace) -> int:
+    sources = _sources(args.inputs, args.skiprows)
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    task = functools.partial(score_outputs, fmt=args.format, top=args.top)
+    if len(sources) == 1 or args.workers == 1:
+        # No pool for a single universe: skip the worker start-up cost
+        results = {s.name: task(s, out, SMART_WEIGHTS, args.buy, args.watch) for s in sources}
+    else:
+        results = run_universes(sources, out, SMART_WEIGHTS, args.buy, args.watch,
+                                max_workers=args.workers, task=task)
+
+    summary = [
+        {"name": r.name, "rows": r.rows, "seconds": round(r.seconds, 3), "content_hash": r.content_hash,
+         "output": str(r.path) if r.path else None, "error": r.error}
+        for r in results.values()
+    ]
+    (out / "summary.json").write_text(json.dumps(summary, indent=2))
+    for r in results.values():
+        status = f"{r.rows:>8} rows  {r.seconds:6.2f}s" if r.ok else f"FAILED  {r.error}"
+        print(f"{r.name:<24} {status}")
+    return 0 if all(r.ok for r in results.values()) else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="mantra", description="M.A.N.T.R.A. headless batch tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="score watchlists and write frames, top picks and alerts")
+    score.add_argument("inputs", nargs="*", help="watchlist CSV paths or URLs (default: the configured sheet)")
+    score.add_argument("--out", default=str(SNAPSHOT_DIR / "batch"), help="output directory")
+    score.add_argument("--format", choices=sorted(FORMATS), default="parquet", help="frame output format")
+    score.add_argument("--top", type=int, default=10, help="number of top picks")
+    score.add_argument("--skiprows", type=int, default=DEFAULT_SOURCE.skiprows,
+                       help="banner rows above the header")
+    score.add_argument("--buy", type=float, default=BUY_THRESHOLD, help="BUY SmartScore threshold")
+    score.add_argument("--watch", type=float, default=WATCH_THRESHOLD, help="WATCH SmartScore threshold")
+    score.add_argument("--workers", type=int, default=None, help="worker processes for several inputs")
+    score.set_defaults(run=_score)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
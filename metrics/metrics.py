@@ -0,0 +1,382 @@
+# metrics/metrics.py
+"""Pipeline Metrics
+
+Lightweight instrumentation for every pipeline stage, for capacity
+planning:
+
+* `stage` — context manager recording wall time, CPU time of the calling
+  thread, rows in/out and the change in resident memory for one named
+  stage; with memory tracing on (``MANTRA_METRICS_MEMORY=1`` or
+  `set_trace_memory`) also its peak, from tracemalloc — traced Python
+  and NumPy allocations of the whole process, above the level at entry;
+* `instrumented` — the same as a decorator for ``df → df`` functions;
+* `cache_event` — hit/miss counters for the ingest (HTTP 304), clean and
+  scored frame caches.
+
+Aggregates live in the process-wide `METRICS` registry and are exported as
+a Prometheus text file (node-exporter textfile collector format, written
+atomically) and as one JSON log line per stage run on the
+``mantra.metrics`` logger.  Every process — refresher, dashboard workers,
+batch workers — keeps its own registry, so each writes its own
+``mantra-<role>-<pid>.prom`` with a matching ``process`` label; counters
+from different processes never overwrite one another.
+
+Disabled (``MANTRA_METRICS=0``) every hook is a single flag check: `stage`
+hands out a shared no-op context and `instrumented` calls straight through.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import atexit
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Final, Iterator, TypeVar
+
+import pandas as pd
+
+from config import METRICS_ENABLED, METRICS_TRACE_MEMORY, SNAPSHOT_DIR
+
+__all__ = [
+    "METRICS",
+    "Metrics",
+    "StageRun",
+    "stage",
+    "instrumented",
+    "cache_event",
+    "enabled",
+    "set_enabled",
+    "set_trace_memory",
+    "set_role",
+    "prom_file",
+    "write_prometheus",
+    "PROM_DIR",
+]
+
+PROM_DIR: Final[Path] = SNAPSHOT_DIR / "metrics"
+_PREFIX: Final[str] = "mantra"
+_STATM: Final[Path] = Path("/proc/self/statm")
+_PAGE: Final[int] = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+log = logging.getLogger("mantra.metrics")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled: bool = METRICS_ENABLED
+_trace: bool = METRICS_TRACE_MEMORY
+_role: str = "main"
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(on: bool) -> None:
+    """Switch instrumentation on or off for this process."""
+    global _enabled
+    _enabled = on
+
+
+def set_trace_memory(on: bool) -> None:
+    """Record per-stage peak memory with tracemalloc (started on demand)."""
+    global _trace
+    _trace = on
+
+
+def set_role(role: str) -> None:
+    """Name this process's metrics (``refresher``, ``dashboard``, ...)."""
+    global _role
+    _role = role
+
+
+def _process() -> str:
+    return f"{_role}-{os.getpid()}"
+
+
+def _rss() -> int:
+    """Current resident set size in bytes (0 where /proc is unavailable)."""
+    try:
+        return int(_STATM.read_text().split()[1]) * _PAGE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Registry
+# ────────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class StageRun:
+    """One execution of a stage; set `rows_out` inside the ``with`` block."""
+
+    name: str
+    rows_in: int | None = None
+    rows_out: int | None = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    rss_delta: int = 0
+    peak: int = 0
+    error: bool = False
+
+
+@dataclass
+class _StageTotals:
+    runs: int = 0
+    errors: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    last_wall: float = 0.0
+    max_rss_delta: int = 0
+    max_peak: int = 0
+
+
+@dataclass
+class Metrics:
+    """Thread-safe per-stage totals and per-cache hit/miss counters."""
+
+    stages: dict[str, _StageTotals] = field(default_factory=dict)
+    caches: dict[str, list[int]] = field(default_factory=dict)  # name → [hits, misses]
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, run: StageRun) -> None:
+        with self._lock:
+            t = self.stages.setdefault(run.name, _StageTotals())
+            t.runs += 1
+            t.errors += run.error
+            t.wall += run.wall
+            t.cpu += run.cpu
+            t.rows_in += run.rows_in or 0
+            t.rows_out += run.rows_out or 0
+            t.last_wall = run.wall
+            t.max_rss_delta = max(t.max_rss_delta, run.rss_delta)
+            t.max_peak = max(t.max_peak, run.peak)
+        if log.isEnabledFor(logging.INFO):
+            log.info(json.dumps({
+                "event": "stage", "stage": run.name, "wall_s": round(run.wall, 6),
+                "cpu_s": round(run.cpu, 6), "rows_in": run.rows_in, "rows_out": run.rows_out,
+                "rss_delta_bytes": run.rss_delta, "peak_bytes": run.peak, "error": run.error,
+            }))
+
+    def cache(self, name: str, hit: bool) -> None:
+        with self._lock:
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.caches.clear()
+
+    def frame(self) -> pd.DataFrame:
+        """Per-stage totals as a table (for the dashboard panel)."""
+        with self._lock:
+            rows = [
+                {
+                    "stage": name, "runs": t.runs, "errors": t.errors,
+                    "wall_s": round(t.wall, 4), "avg_wall_s": round(t.wall / t.runs, 4),
+                    "last_wall_s": round(t.last_wall, 4), "cpu_s": round(t.cpu, 4),
+                    "rows_in": t.rows_in, "rows_out": t.rows_out,
+                    # resident memory still held at the end of a run, not transient peaks
+                    "max_rss_growth_mb": round(t.max_rss_delta / 2**20, 1),
+                    # traced allocations above the level at entry (0 unless tracing)
+                    "max_peak_mb": round(t.max_peak / 2**20, 1),
+                }
+                for name, t in self.stages.items()
+            ]
+        return pd.DataFrame(rows)
+
+    def cache_frame(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{"cache": name, "hits": h, "misses": m} for name, (h, m) in self.caches.items()]
+        return pd.DataFrame(rows)
+
+    def to_prometheus(self, process: str | None = None) -> str:
+        """Prometheus text exposition of every counter.
+
+        Every sample carries ``process=`` *process* (default: this
+        process's role and pid) so files of several processes can be
+        collected side by side.
+        """
+        proc = f'process="{process or _process()}",'
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_: str, samples: Iterator[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {_PREFIX}_{name} {help_}")
+            lines.append(f"# TYPE {_PREFIX}_{name} {kind}")
+            lines.extend(f"{_PREFIX}_{name}{labels} {value:.9g}" for labels, value in samples)
+
+        with self._lock:
+            stages = {name: _StageTotals(**vars(t)) for name, t in self.stages.items()}
+            caches = {name: tuple(c) for name, c in self.caches.items()}
+
+        def per_stage(attr: str) -> Iterator[tuple[str, float]]:
+            return ((f'{{{proc}stage="{name}"}}', getattr(t, attr)) for name, t in sorted(stages.items()))
+
+        family("stage_runs_total", "counter", "Stage executions.", per_stage("runs"))
+        family("stage_errors_total", "counter", "Stage executions that raised.", per_stage("errors"))
+        family("stage_wall_seconds_total", "counter", "Wall-clock time spent in the stage.", per_stage("wall"))
+        family("stage_cpu_seconds_total", "counter",
+               "CPU time of the thread running the stage (work handed to pools is not counted).",
+               per_stage("cpu"))
+        family("stage_last_wall_seconds", "gauge", "Wall-clock time of the latest run.", per_stage("last_wall"))
+        family("stage_rows_in_total", "counter", "Rows passed into the stage.", per_stage("rows_in"))
+        family("stage_rows_out_total", "counter", "Rows returned by the stage.", per_stage("rows_out"))
+        family("stage_rss_delta_bytes", "gauge",
+               "Largest growth of resident memory across one run (held at its end; transient peaks not seen).",
+               per_stage("max_rss_delta"))
+        family("stage_peak_bytes", "gauge",
+               "Largest traced allocation peak of one run above its starting level (0 unless tracing).",
+               per_stage("max_peak"))
+        family("cache_requests_total", "counter", "Cache lookups by result.", (
+            (f'{{{proc}cache="{name}",result="{result}"}}', counts[i])
+            for name, counts in sorted(caches.items())
+            for i, result in enumerate(("hit", "miss"))
+        ))
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🪝 Hooks
+# ────────────────────────────────────────────────────────────────────────────────
+
+# tracemalloc keeps one peak; a nested stage resets it, so the peak seen
+# before the reset is carried over for the enclosing stage
+_peak_lock = threading.Lock()
+_carried_peak: int = 0
+
+
+def _peak_enter() -> tuple[int, int]:
+    """Reset the traced peak; returns (traced bytes now, peak so far)."""
+    global _carried_peak
+    with _peak_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        outer = max(peak, _carried_peak)
+        tracemalloc.reset_peak()
+        _carried_peak = 0
+        return current, outer
+
+
+def _peak_exit(outer: int) -> int:
+    """Traced peak since the matching `_peak_enter`; restores the outer one."""
+    global _carried_peak
+    with _peak_lock:
+        peak = max(tracemalloc.get_traced_memory()[1], _carried_peak)
+        _carried_peak = max(outer, peak)
+        return peak
+
+
+class _Stage:
+    __slots__ = ("run", "_wall", "_cpu", "_rss", "_traced", "_outer_peak")
+
+    def __init__(self, name: str, rows_in: int | None) -> None:
+        self.run = StageRun(name, rows_in)
+        self._traced = None
+
+    def __enter__(self) -> StageRun:
+        if _trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._traced, self._outer_peak = _peak_enter()
+        self._rss = _rss()
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self.run
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        run = self.run
+        run.wall = time.perf_counter() - self._wall
+        run.cpu = time.thread_time() - self._cpu
+        run.rss_delta = _rss() - self._rss
+        if self._traced is not None and tracemalloc.is_tracing():
+            run.peak = max(_peak_exit(self._outer_peak) - self._traced, 0)
+        run.error = exc_type is not None
+        METRICS.record(run)
+
+
+class _NullStage:
+    """Shared no-op used while metrics are off."""
+
+    __slots__ = ()
+    run = StageRun("disabled")
+
+    def __enter__(self) -> StageRun:
+        return self.run
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_STAGE: Final = _NullStage()
+
+
+def stage(name: str, rows_in: int | None = None) -> _Stage | _NullStage:
+    """Measure the enclosed block as one run of stage *name*."""
+    return _Stage(name, rows_in) if _enabled else _NULL_STAGE
+
+
+def _rows(value: Any) -> int | None:
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """Decorate a ``df → df`` function as stage *name* (rows from len())."""
+    def wrap(fn: F) -> F:
+        @functools.wraps(fn)
+        def run(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(name, _rows(args[0]) if args else None) as rec:
+                out = fn(*args, **kwargs)
+                rec.rows_out = _rows(out)
+            return out
+        return run  # type: ignore[return-value]
+    return wrap
+
+
+def cache_event(cache: str, hit: bool) -> None:
+    """Count one lookup of *cache* (``ingest``, ``clean``, ``scored``, ...)."""
+    if _enabled:
+        METRICS.cache(cache, hit)
+
+
+def prom_file() -> Path:
+    """This process's Prometheus text file under `PROM_DIR`."""
+    return PROM_DIR / f"{_PREFIX}-{_process()}.prom"
+
+
+_written: set[Path] = set()
+
+
+def _remove_written() -> None:
+    for path in _written:
+        path.unlink(missing_ok=True)
+
+
+def write_prometheus(path: Path | None = None) -> Path | None:
+    """Atomically write `METRICS` in Prometheus text format (None if off).
+
+    The default per-process file (`prom_file`) is removed at exit, so the
+    collector stops exporting series of processes that are gone.
+    """
+    if not _enabled:
+        return None
+    if path is None:
+        path = prom_file()
+        if not _written:
+            atexit.register(_remove_written)
+        _written.add(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(METRICS.to_prometheus())
+    os.replace(tmp, path)
+    return path
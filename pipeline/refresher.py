@@ -0,0 +1,171 @@
+# pipeline/refresher.py
+"""Refresh Worker
+
+Standalone process that keeps the live scored frame fresh so no dashboard
+request ever pays for a download or a rescore:
+
+    fetch (conditional GET) → clean → score → publish `SharedFrame` segment
+
+A refresh whose sheet content did not change publishes nothing but still
+beats the segment's heartbeat, so dashboards keep deferring to the worker
+instead of refreshing by themselves.  Each new
+frame is also appended to the snapshot history, and the sheet's Industry
+Analysis tab is cleaned into the frame cache for the sector leaderboard.
+
+Usage::
+
+    python -m pipeline.refresher                 # every REFRESH_SECONDS
+    python -m pipeline.refresher --interval 300
+    python -m pipeline.refresher --once
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+from typing import Mapping
+
+from clean.clean import clean_industry, clean_watchlist
+from config import BUY_THRESHOLD, REFRESH_SECONDS, SMART_WEIGHTS, WATCH_THRESHOLD
+from ingest.ingest import DEFAULT_SOURCE, SheetSource, fetch_industry, fetch_watchlist
+from metrics.metrics import set_role, stage, write_prometheus
+from signals.memo import MEMO
+from storage.frame_cache import FrameCache
+from storage.shared_frame import SharedFrame
+from storage.snapshot_store import SnapshotStore
+
+__all__ = ["RefreshWorker", "main"]
+
+log = logging.getLogger(__name__)
+
+
+class RefreshWorker:
+    """Runs the pipeline on a schedule and publishes each new scored frame.
+
+    Args:
+        source: Sheet to score.
+        interval: Seconds between refreshes.
+        segment: Where frames are published (default `SharedFrame()`).
+        history: Snapshot store to append to; None disables it.
+        industry: Frame cache for the cleaned Industry Analysis tab
+            (``industry`` stage); None, or a CSV source, skips it.
+        weights, buy_th, watch_th: Scoring config.
+    """
+
+    def __init__(
+        self,
+        source: SheetSource = DEFAULT_SOURCE,
+        interval: float = REFRESH_SECONDS,
+        segment: SharedFrame | None = None,
+        history: SnapshotStore | None = None,
+        industry: FrameCache | None = None,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> None:
+        self.source = source
+        self.interval = interval
+        self.segment = segment or SharedFrame()
+        self.history = history
+        self.industry = industry
+        self.weights = dict(weights)
+        self.buy_th = buy_th
+        self.watch_th = watch_th
+        self._last_hash: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _refresh_industry(self) -> None:
+        if self.industry is None or self.source.industry_url is None:
+            return
+        try:
+            fetched = fetch_industry(self.source)
+            key = fetched.content_hash[:32]
+            if self.industry.has("industry", key):
+                self.industry.mark_latest("industry", key)
+            else:
+                self.industry.put("industry", key, clean_industry(fetched.frame))
+        except Exception:  # the leaderboard simply keeps the last industry tab
+            log.exception("Industry refresh failed")
+
+    def run_once(self) -> int | None:
+        """Refresh now; return the published version, or None if unchanged.
+
+        Stage metrics are exported to the Prometheus text file after each run.
+        """
+        try:
+            with stage("refresh"):
+                return self._run_once()
+        finally:
+            write_prometheus()
+
+    def _run_once(self) -> int | None:
+        self._refresh_industry()
+        with stage("ingest.fetch"):
+            fetched = fetch_watchlist(self.source)
+        if fetched.content_hash == self._last_hash and self.segment.version() is not None:
+            self.segment.heartbeat()
+            return None
+        scored = MEMO.score_frame(clean_watchlist(fetched.frame), self.weights, self.buy_th, self.watch_th)
+        with stage("segment.publish", rows_in=len(scored)):
+            version = self.segment.publish(scored)
+        self._last_hash = fetched.content_hash
+        if self.history is not None:
+            try:
+                with stage("history.append", rows_in=len(scored)):
+                    self.history.append(scored)
+            except Exception:  # history is best effort; publishing comes first
+                log.exception("Snapshot history append failed")
+        log.info("Published %s v%d (%d rows)", self.source.name, version, len(scored))
+        return version
+
+    def run_forever(self) -> None:
+        """Refresh every `interval` seconds until `stop` is called."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:  # keep the last published frame and retry
+                log.exception("Refresh failed")
+            self._stop.wait(self.interval)
+
+    def start(self) -> threading.Thread:
+        """Run `run_forever` in a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="mantra-refresher", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Keep the live scored frame fresh.")
+    parser.add_argument("--interval", type=float, default=REFRESH_SECONDS, help="seconds between refreshes")
+    parser.add_argument("--once", action="store_true", help="refresh once and exit")
+    parser.add_argument("--csv", default=None, help="watchlist CSV URL or path instead of the sheet")
+    parser.add_argument("--no-history", action="store_true", help="do not append to the snapshot history")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    set_role("refresher")
+    source = SheetSource(csv=args.csv) if args.csv else DEFAULT_SOURCE
+    worker = RefreshWorker(
+        source, args.interval,
+        history=None if args.no_history else SnapshotStore(),
+        industry=FrameCache(),
+    )
+    if args.once:
+        worker.run_once()
+        return
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
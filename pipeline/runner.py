@@ -0,0 +1,132 @@
+# pipeline/runner.py
+"""Batch Runner
+
+Scores many universes (one `SheetSource` per desk / exchange) in one go:
+ingest → clean → signals → tags for each source runs in its own worker
+process.  Workers write the scored frame to an uncompressed Arrow IPC file
+under ``out_dir``; only a small `UniverseResult` crosses the process
+boundary, and `UniverseResult.load` memory-maps the file back.
+
+Sheet settings and scoring config are passed as arguments; nothing is read
+from module globals in the workers.  Callers needing more per-universe
+output (the batch CLI) pass their own picklable *task* with the signature
+of `score_universe`.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from clean.clean import clean_watchlist
+from config import BUY_THRESHOLD, SMART_WEIGHTS, SNAPSHOT_DIR, WATCH_THRESHOLD
+from ingest.ingest import SheetSource, fetch_watchlist
+from signals.engine import score_frame
+
+__all__ = ["UniverseResult", "score_universe", "run_universes"]
+
+
+@dataclass(frozen=True)
+class UniverseResult:
+    """Where one universe's scored frame was written (or why it failed)."""
+
+    name: str
+    path: Path | None
+    rows: int = 0
+    content_hash: str = ""
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def load(self, columns: Iterable[str] | None = None) -> pd.DataFrame:
+        """Memory-map the scored frame back (optionally a column subset).
+
+        Parquet and CSV outputs of the batch CLI are read normally.
+        """
+        if self.path is None:
+            raise RuntimeError(f"{self.name}: {self.error}")
+        cols = list(columns) if columns else None
+        if self.path.suffix == ".parquet":
+            return pd.read_parquet(self.path, columns=cols)
+        if self.path.suffix == ".csv":
+            return pd.read_csv(self.path, usecols=cols)
+        return feather.read_table(self.path, columns=cols, memory_map=True).to_pandas()
+
+
+def _write(path: Path, df: pd.DataFrame) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def score_universe(
+    source: SheetSource,
+    out_dir: Path,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+) -> UniverseResult:
+    """Run ingest → clean → score for one source and write the result."""
+    start = time.perf_counter()
+    try:
+        fetched = fetch_watchlist(source)
+        scored = score_frame(clean_watchlist(fetched.frame), weights, buy_th, watch_th)
+        path = Path(out_dir) / f"{source.name}.arrow"
+        _write(path, scored)
+    except Exception as exc:  # reported per universe; the batch carries on
+        return UniverseResult(source.name, None, seconds=time.perf_counter() - start,
+                              error=f"{type(exc).__name__}: {exc}")
+    return UniverseResult(source.name, path, len(scored), fetched.content_hash, time.perf_counter() - start)
+
+
+def run_universes(
+    sources: Iterable[SheetSource],
+    out_dir: Path | None = None,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+    max_workers: int | None = None,
+    task: Callable[..., UniverseResult] = score_universe,
+) -> dict[str, UniverseResult]:
+    """Score every source in a process pool.
+
+    Args:
+        sources: One `SheetSource` per universe; names must be unique.
+        out_dir: Output directory (default ``SNAPSHOT_DIR / "universes"``).
+        weights, buy_th, watch_th: Scoring config shared by all universes.
+        max_workers: Pool size (default: one per source, capped at CPUs).
+        task: Per-universe worker, called like `score_universe`; must be
+            picklable (module-level function or ``functools.partial``).
+
+    Returns:
+        ``{source.name: UniverseResult}`` in input order.
+    """
+    sources = list(sources)
+    names = [s.name for s in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate source names: {names}")
+    out = Path(out_dir) if out_dir is not None else SNAPSHOT_DIR / "universes"
+    out.mkdir(parents=True, exist_ok=True)
+    if not sources:
+        return {}
+
+    workers = max_workers or min(len(sources), os.cpu_count() or 1)
+    results: dict[str, UniverseResult] = {}
+    # spawn: workers must not inherit the parent's HTTP pool or locks
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        futures = [pool.submit(task, s, out, dict(weights), buy_th, watch_th) for s in sources]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.name] = result
+    return {name: results[name] for name in names}
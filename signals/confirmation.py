@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ["add_confirmation"]
 
 # Weights for confirmation
@@ -27,9 +30,9 @@ def add_confirmation(df: pd.DataFrame) -> pd.DataFrame:
     work = df.copy()
 
     # Extract percent values [0–100] → normalize to [0–1]
-    mom = work[_COL_MOM].fillna(0) / 100.0 if _COL_MOM in work.columns else 0
-    vol = work[_COL_VOL].fillna(0) / 100.0 if _COL_VOL in work.columns else 0
+    mom = work[_COL_MOM].astype("float64").fillna(0) / 100.0 if _COL_MOM in work.columns else 0
+    vol = work[_COL_VOL].astype("float64").fillna(0) / 100.0 if _COL_VOL in work.columns else 0
 
     raw = (_WEIGHTS["momentum"] * mom) + (_WEIGHTS["volume"] * vol)
-    work["confirmation_score"] = (raw.rank(pct=True) * 100).round(2)
+    work["confirmation_score"] = (rank_series(raw, nan="keep") * 100).round(2).astype(SCORE_DTYPE)
     return work
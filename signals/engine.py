@@ -0,0 +1,398 @@
+# signals/engine.py
+"""Fused Scoring Engine
+
+Single-pass replacement for the copy-per-stage ``add_*`` chain.  The numeric
+inputs are pulled into one contiguous float64 matrix once, every sub-score,
+the composite `smartscore` and the `tag` are computed with NumPy, and the
+results are attached to the frame in a single ``assign``.
+
+The maths mirror the individual signal/feature modules step by step, so the
+output matches running add_momentum → … → apply_tags in sequence.
+Pure functions only; no I/O.
+"""
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from clean.schema import SCORE_DTYPE, cast_scores
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from metrics.metrics import instrumented
+from signals import confirmation as _confirmation
+from signals import momentum as _momentum
+from signals import timing as _timing
+from signals import value as _value
+from signals import volume as _volume
+from signals.ranking import pct_rank, rank_columns
+from signals.smartscore import _SCORE_COLS
+from tagging.tagger import TAG_AVOID, TAG_BUY, TAG_WATCH
+
+__all__ = [
+    "SCORE_COLUMNS",
+    "score_frame",
+    "compute_scores",
+    "smartscore_from",
+    "tags_from",
+]
+
+# Columns the engine adds, in the order the legacy chain appends them
+SCORE_COLUMNS: tuple[str, ...] = (
+    "momentum_score",
+    "value_score",
+    "volume_score",
+    "timing_score",
+    "confirmation_score",
+    "buy_zone_score",
+    "dma20_above_50",
+    "dma50_above_200",
+    "eps_growth_score",
+    "smartscore",
+    "tag",
+)
+
+# Raw numeric inputs read by any stage
+_COL_PRICE: str = "current_price"
+_COL_DMA20: str = "20_day_avg"
+_COL_DMA50: str = "50_day_avg"
+_COL_DMA200: str = "200_day_avg"
+_COL_LOW52: str = "52_week_low"
+_COL_HIGH52: str = "52_week_high"
+
+_INPUT_COLS: tuple[str, ...] = (
+    *_momentum._COLUMNS_MAP.values(),
+    "pe", "eps_pct_change", "eps_change", "pct_from_high",
+    _COL_PRICE, _COL_DMA20, _COL_DMA50, _COL_DMA200, _COL_LOW52, _COL_HIGH52,
+    "rvol", "7_days_volume", "30_days_volume",
+)
+
+
+# ---------------------------------------------------------------------------
+# 🧮 Kernels
+# ---------------------------------------------------------------------------
+
+# `replace(0, pd.NA)` turns the volume-spike ratio into an object Series, and
+# pandas ranks object values with an absolute tie tolerance of 1e-13.
+_OBJECT_TIE_TOL: float = _volume._SPIKE_TIE_TOL
+
+
+def _pct_rank(x: np.ndarray, tie_tol: float = 0.0, compression: int | None = None) -> np.ndarray:
+    """`Series.rank(pct=True)` on a float array: average ties, NaN kept.
+
+    Adjacent sorted values closer than *tie_tol* are treated as ties.
+    """
+    return pct_rank(x, "keep", "average", tie_tol, compression)
+
+
+def _score(raw: np.ndarray, compression: int | None = None) -> np.ndarray:
+    """Percentile-rank *raw* and scale to a rounded 0–100 score."""
+    return _to_score(_pct_rank(raw, compression=compression))
+
+
+def _nz(x: np.ndarray) -> np.ndarray:
+    """`fillna(0)` for float arrays."""
+    return np.where(np.isnan(x), 0.0, x)
+
+
+def _no_zero(x: np.ndarray) -> np.ndarray:
+    """`replace(0, pd.NA)` for float arrays."""
+    return np.where(x == 0, np.nan, x)
+
+
+class _Inputs:
+    """Column accessor over the single contiguous input matrix."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        cols = [c for c in dict.fromkeys(_INPUT_COLS) if c in df.columns]
+        self.columns = cols
+        self.index = {c: i for i, c in enumerate(cols)}
+        self.matrix = np.asfortranarray(df[cols].to_numpy(dtype=np.float64))
+        self.n = self.matrix.shape[0]
+
+    def take(self, rows: np.ndarray) -> "_Inputs":
+        """Return an accessor over the subset *rows* (same columns)."""
+        sub = object.__new__(_Inputs)
+        sub.columns, sub.index = self.columns, self.index
+        sub.matrix = np.asfortranarray(self.matrix[rows])
+        sub.n = sub.matrix.shape[0]
+        return sub
+
+    def __contains__(self, col: str) -> bool:
+        return col in self.index
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        if col not in self.index:
+            raise KeyError(col)
+        return self.matrix[:, self.index[col]]
+
+
+# ---------------------------------------------------------------------------
+# 📈 Stage 1 – row-wise values that get percentile-ranked across the universe
+#    (see the matching signal module for the rationale of each step)
+# ---------------------------------------------------------------------------
+
+def _eps_col(inp: _Inputs) -> str | None:
+    for col in ("eps_pct_change", "eps_change"):
+        if col in inp:
+            return col
+    return None
+
+
+def _momentum_raws(inp: _Inputs) -> dict[str, np.ndarray]:
+    """Momentum: weighted sum of returns (missing → 0)."""
+    mom = np.zeros(inp.n)
+    for key, weight in _momentum._WEIGHTS.items():
+        col = _momentum._COLUMNS_MAP[key]
+        if col in inp:
+            mom += _nz(inp[col]) * weight
+    return {"momentum": mom}
+
+
+def _value_raws(inp: _Inputs) -> dict[str, np.ndarray]:
+    """Value components (also the EPS rank behind `eps_growth_score`)."""
+    raw: dict[str, np.ndarray] = {}
+    if "pe" in inp:
+        raw["pe"] = inp["pe"]
+    eps_col = _eps_col(inp)
+    if eps_col:
+        raw["eps"] = _nz(inp[eps_col])
+    if "pct_from_high" in inp:
+        raw["discount_52w"] = -_nz(inp["pct_from_high"])
+    if _COL_PRICE in inp and _COL_DMA200 in inp:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = inp[_COL_PRICE] / _no_zero(inp[_COL_DMA200])
+        ratio[~np.isfinite(ratio)] = 0.0
+        raw["below_dma200"] = 1 - ratio
+    return raw
+
+
+def _volume_raws(inp: _Inputs) -> dict[str, np.ndarray]:
+    raw: dict[str, np.ndarray] = {}
+    if _volume._COLUMN_RVOL in inp:
+        raw["rvol"] = inp[_volume._COLUMN_RVOL]
+    if _volume._COLUMN_7D_VOL in inp and _volume._COLUMN_30D_VOL in inp:
+        raw["vol_spike"] = _nz(inp[_volume._COLUMN_7D_VOL]) / _no_zero(inp[_volume._COLUMN_30D_VOL])
+    return raw
+
+
+def _timing_raws(inp: _Inputs) -> dict[str, np.ndarray]:
+    """Timing proximities (timing requires all its columns, like add_timing)."""
+    price, dma20, dma50 = inp[_COL_PRICE], inp[_COL_DMA20], inp[_COL_DMA50]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "prox_dma": _nz(((price - dma20) / price + (price - dma50) / price) / 2),
+            "prox_low": 1 - ((price - inp[_COL_LOW52]) / price),
+        }
+
+
+def _buy_zone_raws(inp: _Inputs) -> dict[str, np.ndarray]:
+    """Buy zone: mean of the five support proximities."""
+    needed = (_COL_PRICE, _COL_DMA20, _COL_DMA50, _COL_DMA200, _COL_LOW52, _COL_HIGH52)
+    if all(c in inp for c in needed):
+        price, high52 = inp[_COL_PRICE], inp[_COL_HIGH52]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = [
+                1 - (price - inp[_COL_DMA20]) / price,
+                1 - (price - inp[_COL_DMA50]) / price,
+                1 - (price - inp[_COL_DMA200]) / price,
+                (high52 - price) / high52,
+                1 - (price - inp[_COL_LOW52]) / price,
+            ]
+    else:
+        metrics = [np.full(inp.n, 0.5)] * 5
+    with np.errstate(invalid="ignore"):
+        return {"buy_zone": sum(_nz(m) for m in metrics) / len(metrics)}
+
+
+def _rank_inputs(inp: _Inputs) -> dict[str, np.ndarray]:
+    """Return ``{name: values}`` for every first-level rank in the pipeline.
+
+    Optional inputs whose source columns are missing are left out; the
+    combining stage substitutes the same neutral defaults as the modules.
+    """
+    return {
+        **_momentum_raws(inp),
+        **_value_raws(inp),
+        **_volume_raws(inp),
+        **_timing_raws(inp),
+        **_buy_zone_raws(inp),
+    }
+
+
+# Tie tolerance per rank input (0 = exact ties)
+_TIE_TOL: dict[str, float] = {"vol_spike": _OBJECT_TIE_TOL}
+
+
+def _ranked(raw: Mapping[str, np.ndarray], compression: int | None = None) -> dict[str, np.ndarray]:
+    """Percentile-rank every raw input (with its tie tolerance), all in one
+    batched `rank_columns` call."""
+    if not raw:
+        return {}
+    keys = list(raw)
+    ranks = rank_columns(
+        np.column_stack([raw[key] for key in keys]),
+        tie_tol=[_TIE_TOL.get(key, 0.0) for key in keys] if compression is None else 0.0,
+        compression=compression,
+    )
+    return {key: ranks[:, j] for j, key in enumerate(keys)}
+
+
+def _cross_pct(inp: _Inputs) -> np.ndarray:
+    """Share of bullish DMA crossovers (0, .5 or 1) used by timing."""
+    dma20, dma50, dma200 = inp[_COL_DMA20], inp[_COL_DMA50], inp[_COL_DMA200]
+    cross = (dma20 > dma50).astype(np.int64) + (dma50 > dma200).astype(np.int64)
+    return cross / 2.0
+
+
+def _dma_crossover(inp: _Inputs) -> tuple[np.ndarray, np.ndarray]:
+    if all(c in inp for c in (_COL_DMA20, _COL_DMA50, _COL_DMA200)):
+        return inp[_COL_DMA20] > inp[_COL_DMA50], inp[_COL_DMA50] > inp[_COL_DMA200]
+    off = np.zeros(inp.n, dtype=bool)
+    return off, off.copy()
+
+
+# ---------------------------------------------------------------------------
+# 🧩 Stage 2 – combine ranks (0–1) into composites.  All helpers are
+#    row-wise, so they work on the full universe or any subset of rows.
+# ---------------------------------------------------------------------------
+
+def _value_score(ranks: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+    weights = _value._WEIGHTS
+    raw = (
+        weights["pe"] * (1 - ranks["pe"] if "pe" in ranks else 0.5)
+        + weights["eps_change"] * ranks.get("eps", 0.5)
+        + weights["discount_52w"] * ranks.get("discount_52w", 0.5)
+        + weights["below_dma200"] * ranks.get("below_dma200", 0.5)
+    )
+    return _stored(np.round(np.broadcast_to(raw * 100, (n,)), 2))
+
+
+def _eps_growth_score(ranks: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+    if "eps" in ranks:
+        return _stored(np.round(ranks["eps"] * 100, 2))
+    return np.full(n, 50.0)
+
+
+def _volume_raw(ranks: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+    rvol = _nz(ranks["rvol"]) if "rvol" in ranks else np.full(n, 0.5)
+    spike = _nz(ranks["vol_spike"]) if "vol_spike" in ranks else np.full(n, 0.5)
+    return _volume._WEIGHTS["rvol"] * rvol + _volume._WEIGHTS["vol_spike"] * spike
+
+
+def _timing_raw(ranks: Mapping[str, np.ndarray], cross_pct: np.ndarray) -> np.ndarray:
+    weights = _timing._WEIGHTS
+    return (
+        weights["dma_cross"] * cross_pct
+        + weights["prox_dma"] * ranks["prox_dma"]
+        + weights["prox_low"] * ranks["prox_low"]
+    )
+
+
+def _confirmation_raw(momentum: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    weights = _confirmation._WEIGHTS
+    return weights["momentum"] * (_nz(momentum) / 100.0) + weights["volume"] * (_nz(volume) / 100.0)
+
+
+def _stored(score: np.ndarray) -> np.ndarray:
+    """Round-trip through the float32 storage dtype.
+
+    Downstream stages (confirmation, smartscore) consume scores as stored,
+    so the engine feeds them exactly the values the legacy chain reads back.
+    """
+    return score.astype(SCORE_DTYPE).astype(np.float64)
+
+
+def _to_score(pct: np.ndarray) -> np.ndarray:
+    """Scale a 0–1 percentile to a rounded 0–100 score."""
+    return _stored(np.round(pct * 100.0, 2))
+
+
+def smartscore_from(
+    scores: Mapping[str, np.ndarray],
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+) -> np.ndarray:
+    """Return the 0–100 composite for sub-score arrays keyed by column name."""
+    total_weight = sum(weights.values())
+    raw = 0.0
+    for key, weight in weights.items():
+        col = _SCORE_COLS.get(key)
+        if col and col in scores:
+            raw = raw + (_nz(np.asarray(scores[col], dtype=np.float64)) / 100.0) * weight
+    n = len(next(iter(scores.values()))) if scores else 0
+    return _stored(np.round(np.broadcast_to((raw / total_weight) * 100, (n,)), 2))
+
+
+def tags_from(
+    smartscore: np.ndarray,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+) -> np.ndarray:
+    """Vectorized `apply_tags`: bucket SmartScores into BUY / WATCH / AVOID."""
+    score = _nz(np.asarray(smartscore, dtype=np.float64))
+    return np.select(
+        [score >= buy_th, score >= watch_th],
+        [TAG_BUY, TAG_WATCH],
+        default=TAG_AVOID,
+    ).astype(object)
+
+
+# ---------------------------------------------------------------------------
+# 🚀 Public API
+# ---------------------------------------------------------------------------
+
+def compute_scores(
+    df: pd.DataFrame,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+    compression: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Return every engine output as ``{column: array}`` without touching *df*.
+
+    Scores are float64 arrays holding float32-representable values; use
+    `clean.schema.cast_scores` to narrow them for storage.  With
+    *compression* every percentile comes from a t-digest of that
+    compression (`signals.ranking`) instead of an exact sort.
+    """
+    inp = _Inputs(df)
+    n = inp.n
+    ranks = _ranked(_rank_inputs(inp), compression)
+
+    out: dict[str, np.ndarray] = {}
+    out["momentum_score"] = _to_score(ranks["momentum"])
+    out["value_score"] = _value_score(ranks, n)
+    out["volume_score"] = _score(_volume_raw(ranks, n), compression)
+    out["timing_score"] = _score(_timing_raw(ranks, _cross_pct(inp)), compression)
+    out["confirmation_score"] = _score(
+        _confirmation_raw(out["momentum_score"], out["volume_score"]), compression
+    )
+    out["buy_zone_score"] = _to_score(ranks["buy_zone"])
+    out["dma20_above_50"], out["dma50_above_200"] = _dma_crossover(inp)
+    out["eps_growth_score"] = _eps_growth_score(ranks, n)
+    out["smartscore"] = smartscore_from(out, weights)
+    out["tag"] = tags_from(out["smartscore"], buy_th, watch_th)
+    return out
+
+
+@instrumented("score.frame")
+def score_frame(
+    df: pd.DataFrame,
+    weights: Mapping[str, float] = SMART_WEIGHTS,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+    compression: int | None = None,
+) -> pd.DataFrame:
+    """Return *df* with all sub-scores, `smartscore` and `tag` attached.
+
+    Equivalent to the legacy chain::
+
+        add_momentum → add_value → add_volume → add_timing → add_confirmation
+        → add_buy_zone → add_dma_crossover → add_eps_growth_score
+        → add_smartscore → apply_tags
+
+    but copies the frame once instead of once per stage.  Scores are
+    stored as float32 and `tag` as a categorical (see `clean.schema`).
+    *compression* switches to approximate ranks (see `compute_scores`).
+    """
+    return df.assign(**cast_scores(compute_scores(df, weights, buy_th, watch_th, compression)))
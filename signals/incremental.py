@@ -0,0 +1,310 @@
+# signals/incremental.py
+"""Incremental Scoring
+
+Keeps every universe-wide percentile rank of the scoring engine in a sorted
+array so that a price update on a handful of tickers only re-ranks the rows
+whose percentile actually moved, instead of re-sorting every column.
+
+Locating *k* changed rows costs O(k log n) binary searches, but moving them
+within the sorted arrays is one O(n) shift (a memmove, ~0.1 ms per 100k
+rows); a value that appears or disappears (NaN ↔ number) changes the
+denominator of every percentile, so that column re-ranks all n rows.
+
+`RankIndex` is the building block (one per ranked input); `LiveScorer`
+wires them together in the same stages as `signals.engine` and exposes an
+"update these tickers" API.  Results are identical to re-running
+`score_frame` on the updated frame.
+"""
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from clean.schema import cast_scores
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from signals import engine as _engine
+from signals.ranking import pct_rank
+
+__all__ = ["RankIndex", "LiveScorer"]
+
+
+def _union(n: int, parts: list[np.ndarray]) -> np.ndarray:
+    """Sorted distinct row ids of *parts* (a mask: spans can cover most rows)."""
+    mark = np.zeros(n, dtype=bool)
+    for part in parts:
+        mark[part] = True
+    return np.flatnonzero(mark)
+
+
+class RankIndex:
+    """Sorted-array percentile ranks with batched point updates.
+
+    Non-NaN values are kept sorted by ``(value, row)`` next to the matching
+    row ids, so a row can be located with two binary searches.  Percentiles
+    equal `pct_rank` under its default policies (average ties, NaN kept,
+    *tie_tol* chaining), which `pct` calls when asked for every row.
+    """
+
+    def __init__(self, values: np.ndarray, tie_tol: float = 0.0) -> None:
+        self.values = np.array(values, dtype=np.float64)
+        self.tie_tol = tie_tol
+        rows = np.flatnonzero(~np.isnan(self.values))
+        order = np.lexsort((rows, self.values[rows]))
+        self._rows = rows[order]
+        self._sorted = self.values[self._rows]
+
+    def __len__(self) -> int:
+        return self._sorted.size
+
+    # -- lookups -------------------------------------------------------------
+
+    def _same_group(self, left: np.ndarray) -> np.ndarray:
+        """True where sorted positions *left* and *left + 1* are tied."""
+        gap = self._sorted[left + 1] - self._sorted[left]
+        if not self.tie_tol:
+            return gap == 0
+        with np.errstate(invalid="ignore"):
+            return ~(np.abs(gap) > self.tie_tol)
+
+    def _widen(self, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Grow half-open position ranges to whole tolerance tie chains."""
+        if not self.tie_tol:
+            return lo, hi
+        lo, hi, m = lo.copy(), hi.copy(), len(self)
+        while True:
+            grow_lo = (lo > 0) & (lo < m)
+            grow_lo[grow_lo] = self._same_group(lo[grow_lo] - 1)
+            grow_hi = (hi < m) & (hi > 0)
+            grow_hi[grow_hi] = self._same_group(hi[grow_hi] - 1)
+            if not (grow_lo.any() or grow_hi.any()):
+                return lo, hi
+            lo -= grow_lo
+            hi += grow_hi
+
+    def _bounds(self, vals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lo = np.searchsorted(self._sorted, vals, side="left")
+        hi = np.searchsorted(self._sorted, vals, side="right")
+        return self._widen(lo, hi)
+
+    def pct(self, rows: np.ndarray | None = None) -> np.ndarray:
+        """Return the percentile (0–1] of *rows* (all rows by default)."""
+        if rows is None:
+            return pct_rank(self.values, tie_tol=self.tie_tol)
+        vals = self.values[rows]
+        out = np.full(vals.shape[0], np.nan)
+        valid = ~np.isnan(vals)
+        if valid.any():
+            lo, hi = self._bounds(vals[valid])
+            out[valid] = (lo + 1 + hi) / 2.0 / len(self)
+        return out
+
+    # -- updates -------------------------------------------------------------
+
+    def _locate(self, rows: np.ndarray, vals: np.ndarray) -> np.ndarray:
+        """Sorted positions of ``(value, row)`` keys (existing or insertion)."""
+        lo = np.searchsorted(self._sorted, vals, side="left")
+        hi = np.searchsorted(self._sorted, vals, side="right")
+        # Equal values are ordered by row id; only true ties need a loop
+        single = np.flatnonzero(hi - lo == 1)
+        for i in np.flatnonzero(hi - lo > 1):
+            lo[i] += np.searchsorted(self._rows[lo[i]:hi[i]], rows[i])
+        lo[single] += self._rows[lo[single]] < rows[single]
+        return lo
+
+    def update(self, rows: np.ndarray, new_values: np.ndarray) -> np.ndarray:
+        """Set ``values[rows] = new_values``; return rows whose rank changed.
+
+        Costs two binary searches per changed row plus one O(n) shift of the
+        sorted arrays.  The returned set is every row whose percentile can
+        have moved: the changed rows plus those between old and new values,
+        or all rows when a value appeared or vanished (NaN ↔ number).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        new = np.asarray(new_values, dtype=np.float64)
+        old = self.values[rows]
+        moved = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+        rows, old, new = rows[moved], old[moved], new[moved]
+        if rows.size == 0:
+            return rows
+
+        drop = ~np.isnan(old)
+        pos = self._locate(rows[drop], old[drop])
+        self._sorted = np.delete(self._sorted, pos)
+        self._rows = np.delete(self._rows, pos)
+
+        add = ~np.isnan(new)
+        add_rows, add_vals = rows[add], new[add]
+        order = np.lexsort((add_rows, add_vals))
+        add_rows, add_vals = add_rows[order], add_vals[order]
+        pos = self._locate(add_rows, add_vals)
+        self._sorted = np.insert(self._sorted, pos, add_vals)
+        self._rows = np.insert(self._rows, pos, add_rows)
+        self.values[rows] = new
+
+        if not (drop & add).all():
+            # A value appeared or vanished: the denominator and every rank
+            # above it moved
+            return np.arange(self.values.size)
+
+        # Rows tied with or lying between any (old, new) pair
+        lo_val = np.fmin(old, new) - self.tie_tol
+        hi_val = np.fmax(old, new) + self.tie_tol
+        lo = np.searchsorted(self._sorted, lo_val, side="left")
+        hi = np.searchsorted(self._sorted, hi_val, side="right")
+        lo, hi = self._widen(lo, hi)
+        spans = [self._rows[a:b] for a, b in zip(lo, hi)]
+        return _union(self.values.size, [rows, *spans])
+
+
+class LiveScorer:
+    """Scored universe that can be refreshed a few tickers at a time.
+
+    Build it once from a cleaned watchlist, then feed it batches of changed
+    rows through `update_tickers`.  Only the percentiles that move are
+    recomputed; `frame` always equals ``score_frame`` on the current inputs.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> None:
+        self.weights, self.buy_th, self.watch_th = dict(weights), buy_th, watch_th
+        self._base = df.reset_index(drop=True).copy()
+        self._positions = pd.Index(self._base["ticker"])
+        self._inp = _engine._Inputs(self._base)
+        n = self._inp.n
+
+        self._index: dict[str, RankIndex] = {
+            key: RankIndex(vals, _engine._TIE_TOL.get(key, 0.0))
+            for key, vals in _engine._rank_inputs(self._inp).items()
+        }
+        self._ranks = {key: idx.pct() for key, idx in self._index.items()}
+        self._cross = _engine._cross_pct(self._inp)
+
+        out: dict[str, np.ndarray] = {}
+        out["momentum_score"] = _engine._to_score(self._ranks["momentum"])
+        out["value_score"] = _engine._value_score(self._ranks, n)
+        self._index["volume"] = RankIndex(_engine._volume_raw(self._ranks, n))
+        out["volume_score"] = _engine._to_score(self._index["volume"].pct())
+        self._index["timing"] = RankIndex(_engine._timing_raw(self._ranks, self._cross))
+        out["timing_score"] = _engine._to_score(self._index["timing"].pct())
+        self._index["confirmation"] = RankIndex(
+            _engine._confirmation_raw(out["momentum_score"], out["volume_score"])
+        )
+        out["confirmation_score"] = _engine._to_score(self._index["confirmation"].pct())
+        out["buy_zone_score"] = _engine._to_score(self._ranks["buy_zone"])
+        dma20, dma50 = _engine._dma_crossover(self._inp)
+        out["dma20_above_50"], out["dma50_above_200"] = dma20.copy(), dma50.copy()
+        out["eps_growth_score"] = _engine._eps_growth_score(self._ranks, n)
+        out["smartscore"] = _engine.smartscore_from(out, self.weights)
+        out["tag"] = _engine.tags_from(out["smartscore"], buy_th, watch_th)
+        self._out = {col: np.array(out[col]) for col in _engine.SCORE_COLUMNS}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Current scored frame (inputs plus every engine output)."""
+        return self._base.assign(**cast_scores(self._out))
+
+    # -- helpers -------------------------------------------------------------
+
+    def _rerank(self, key: str, rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+        dirty = self._index[key].update(rows, values)
+        if key in self._ranks:
+            self._ranks[key][dirty] = self._index[key].pct(dirty)
+        return dirty
+
+    def _store(self, col: str, rows: np.ndarray, values: np.ndarray, changed: list[np.ndarray]) -> None:
+        """``_out[col][rows] = values``; note the rows whose value moved."""
+        out = self._out[col]
+        old = out[rows]
+        out[rows] = values
+        moved = ~((old == out[rows]) | (pd.isna(old) & pd.isna(out[rows])))
+        changed.append(rows[moved])
+
+    def _sub(self, keys: tuple[str, ...], rows: np.ndarray) -> dict[str, np.ndarray]:
+        return {k: self._ranks[k][rows] for k in keys if k in self._ranks}
+
+    # -- public API ------------------------------------------------------------
+
+    def update_tickers(self, changes: pd.DataFrame) -> pd.DataFrame:
+        """Apply new values for some tickers and return the affected rows.
+
+        *changes* has a `ticker` column plus any columns of the cleaned
+        watchlist; columns not in the frame are ignored.  Tickers that are not
+        part of the universe raise `KeyError` (add them with a full rebuild).
+        Returns the rows of `frame` for the updated tickers plus every other
+        row whose scores or tag changed, in frame order.
+        """
+        changes = changes.drop_duplicates("ticker", keep="last")
+        rows = self._positions.get_indexer(changes["ticker"])
+        if (rows < 0).any():
+            missing = changes["ticker"][rows < 0].tolist()
+            raise KeyError(f"Unknown tickers: {missing}")
+
+        cols = [c for c in changes.columns if c != "ticker" and c in self._base.columns]
+        for col in cols:
+            loc = self._base.columns.get_loc(col)
+            self._base.iloc[rows, loc] = changes[col].to_numpy()
+            if col in self._inp:
+                # Read back so ranks see the stored (schema) precision
+                self._inp[col][rows] = self._base.iloc[rows, loc].to_numpy(dtype=np.float64)
+
+        sub = self._inp.take(rows)
+        n = self._inp.n
+        dirty = {
+            key: self._rerank(key, rows, vals)
+            for key, vals in _engine._rank_inputs(sub).items()
+        }
+        self._cross[rows] = _engine._cross_pct(sub)
+        dma20, dma50 = _engine._dma_crossover(sub)
+        changed = [rows]
+        self._store("dma20_above_50", rows, dma20, changed)
+        self._store("dma50_above_200", rows, dma50, changed)
+        touched = [rows]
+
+        def union(*keys: str) -> np.ndarray:
+            return _union(n, [dirty.get(k, rows[:0]) for k in keys])
+
+        d = dirty["momentum"]
+        self._store("momentum_score", d, _engine._to_score(self._ranks["momentum"][d]), changed)
+        touched.append(d)
+
+        d = union("pe", "eps", "discount_52w", "below_dma200")
+        self._store("value_score", d, _engine._value_score(self._sub(
+            ("pe", "eps", "discount_52w", "below_dma200"), d), d.size), changed)
+        self._store("eps_growth_score", d, _engine._eps_growth_score(self._sub(("eps",), d), d.size), changed)
+        touched.append(d)
+
+        d = union("buy_zone")
+        self._store("buy_zone_score", d, _engine._to_score(self._ranks["buy_zone"][d]), changed)
+        touched.append(d)
+
+        d = union("rvol", "vol_spike")
+        d = self._rerank("volume", d, _engine._volume_raw(self._sub(("rvol", "vol_spike"), d), d.size))
+        self._store("volume_score", d, _engine._to_score(self._index["volume"].pct(d)), changed)
+        vol_dirty = d
+        touched.append(d)
+
+        d = _union(n, [union("prox_dma", "prox_low"), rows])
+        d = self._rerank("timing", d, _engine._timing_raw(self._sub(("prox_dma", "prox_low"), d), self._cross[d]))
+        self._store("timing_score", d, _engine._to_score(self._index["timing"].pct(d)), changed)
+        touched.append(d)
+
+        d = _union(n, [dirty["momentum"], vol_dirty])
+        d = self._rerank("confirmation", d, _engine._confirmation_raw(
+            self._out["momentum_score"][d], self._out["volume_score"][d]))
+        self._store("confirmation_score", d, _engine._to_score(self._index["confirmation"].pct(d)), changed)
+        touched.append(d)
+
+        d = _union(n, touched)
+        scores = {col: self._out[col][d] for col in _engine.SCORE_COLUMNS[:6]}
+        self._store("smartscore", d, _engine.smartscore_from(scores, self.weights), changed)
+        self._store("tag", d, _engine.tags_from(self._out["smartscore"][d], self.buy_th, self.watch_th), changed)
+
+        d = _union(n, changed)
+        return self._base.iloc[d].assign(**cast_scores({col: vals[d] for col, vals in self._out.items()}))
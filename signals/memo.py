@@ -0,0 +1,263 @@
+# signals/memo.py
+"""Stage Memoization
+
+Splits the fused scoring engine into its sub-score stages and keeps each
+stage's outputs in a bounded LRU keyed by a content fingerprint of exactly
+the input columns the stage reads, plus its parameters:
+
+    momentum · value · volume · timing · buy_zone   ← raw input columns
+    confirmation                                    ← momentum, volume
+
+Re-scoring a frame whose inputs did not change — only `SMART_WEIGHTS` or
+the BUY / WATCH thresholds did — serves every sub-score from the cache and
+recomputes just `smartscore` and `tag`.  A new sheet that only moved prices
+leaves e.g. the volume stage cached.
+
+Fingerprints are SHA-1 digests of the input columns' buffers (hardware
+accelerated; collisions are not a security concern here), so equal content
+hits the cache whatever frame object it arrives in, and the input matrix is
+only built when a stage misses.  Results are identical to
+`signals.engine.compute_scores`.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Final, Mapping
+
+import numpy as np
+import pandas as pd
+
+from clean.schema import cast_scores
+from config import BUY_THRESHOLD, SCORE_MEMO_BYTES, SMART_WEIGHTS, WATCH_THRESHOLD
+from metrics.metrics import cache_event, stage
+from signals import confirmation as _confirmation
+from signals import engine as _engine
+from signals import momentum as _momentum
+from signals import timing as _timing
+from signals import value as _value
+from signals import volume as _volume
+
+__all__ = ["StageMemo", "MEMO", "STAGES"]
+
+_Outputs = dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class _Stage:
+    """One memoized sub-score stage.
+
+    Attributes:
+        name: Stage name (also the metrics cache label ``stage.<name>``).
+        columns: Raw input columns the stage reads (absent ones included).
+        after: Stages whose outputs it reads.
+        params: Module constants folded into the key.
+        run: ``(inputs, upstream outputs) → outputs``.
+    """
+
+    name: str
+    columns: tuple[str, ...]
+    after: tuple[str, ...]
+    params: tuple
+    run: Callable[[_engine._Inputs, Mapping[str, np.ndarray]], _Outputs]
+
+
+def _momentum_stage(inp: _engine._Inputs, _: Mapping[str, np.ndarray]) -> _Outputs:
+    ranks = _engine._ranked(_engine._momentum_raws(inp))
+    return {"momentum_score": _engine._to_score(ranks["momentum"])}
+
+
+def _value_stage(inp: _engine._Inputs, _: Mapping[str, np.ndarray]) -> _Outputs:
+    ranks = _engine._ranked(_engine._value_raws(inp))
+    return {
+        "value_score": _engine._value_score(ranks, inp.n),
+        "eps_growth_score": _engine._eps_growth_score(ranks, inp.n),
+    }
+
+
+def _volume_stage(inp: _engine._Inputs, _: Mapping[str, np.ndarray]) -> _Outputs:
+    ranks = _engine._ranked(_engine._volume_raws(inp))
+    return {"volume_score": _engine._score(_engine._volume_raw(ranks, inp.n))}
+
+
+def _timing_stage(inp: _engine._Inputs, _: Mapping[str, np.ndarray]) -> _Outputs:
+    ranks = _engine._ranked(_engine._timing_raws(inp))
+    dma20, dma50 = _engine._dma_crossover(inp)
+    return {
+        "timing_score": _engine._score(_engine._timing_raw(ranks, _engine._cross_pct(inp))),
+        "dma20_above_50": dma20,
+        "dma50_above_200": dma50,
+    }
+
+
+def _confirmation_stage(_: _engine._Inputs, up: Mapping[str, np.ndarray]) -> _Outputs:
+    raw = _engine._confirmation_raw(up["momentum_score"], up["volume_score"])
+    return {"confirmation_score": _engine._score(raw)}
+
+
+def _buy_zone_stage(inp: _engine._Inputs, _: Mapping[str, np.ndarray]) -> _Outputs:
+    ranks = _engine._ranked(_engine._buy_zone_raws(inp))
+    return {"buy_zone_score": _engine._to_score(ranks["buy_zone"])}
+
+
+def _params(weights: Mapping[str, float]) -> tuple:
+    return tuple(sorted(weights.items()))
+
+
+# In dependency order
+STAGES: Final[tuple[_Stage, ...]] = (
+    _Stage("momentum", tuple(_momentum._COLUMNS_MAP.values()), (),
+           _params(_momentum._WEIGHTS), _momentum_stage),
+    _Stage("value", ("pe", "eps_pct_change", "eps_change", "pct_from_high",
+                     _engine._COL_PRICE, _engine._COL_DMA200), (),
+           _params(_value._WEIGHTS), _value_stage),
+    _Stage("volume", (_volume._COLUMN_RVOL, _volume._COLUMN_7D_VOL, _volume._COLUMN_30D_VOL), (),
+           _params(_volume._WEIGHTS), _volume_stage),
+    _Stage("timing", (_engine._COL_PRICE, _engine._COL_DMA20, _engine._COL_DMA50,
+                      _engine._COL_DMA200, _engine._COL_LOW52), (),
+           _params(_timing._WEIGHTS), _timing_stage),
+    _Stage("confirmation", (), ("momentum", "volume"),
+           _params(_confirmation._WEIGHTS), _confirmation_stage),
+    _Stage("buy_zone", (_engine._COL_PRICE, _engine._COL_DMA20, _engine._COL_DMA50,
+                        _engine._COL_DMA200, _engine._COL_LOW52, _engine._COL_HIGH52), (),
+           (), _buy_zone_stage),
+)
+
+_ABSENT: Final[bytes] = b"\x00absent"
+
+
+def _fingerprint(col: pd.Series) -> bytes:
+    """Digest of a column's dtype and values."""
+    values = col.to_numpy()
+    if values.dtype.kind not in "biuf":
+        values = col.to_numpy(dtype=np.float64, na_value=np.nan)
+    h = hashlib.sha1(values.dtype.str.encode(), usedforsecurity=False)
+    h.update(np.ascontiguousarray(values))
+    return h.digest()
+
+
+class StageMemo:
+    """Bounded LRU of sub-score stage outputs.
+
+    Args:
+        max_bytes: Upper bound on the cached arrays; the least recently
+            used stage outputs are evicted beyond it.
+
+    Attributes:
+        recomputed: Stages that missed the cache in the latest call.
+    """
+
+    def __init__(self, max_bytes: int = SCORE_MEMO_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.recomputed: tuple[str, ...] = ()
+        self._entries: OrderedDict[bytes, _Outputs] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    # -- LRU -------------------------------------------------------------------
+
+    def _get(self, key: bytes) -> _Outputs | None:
+        with self._lock:
+            out = self._entries.get(key)
+            if out is not None:
+                self._entries.move_to_end(key)
+            return out
+
+    def _put(self, key: bytes, out: _Outputs) -> None:
+        size = sum(arr.nbytes for arr in out.values())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = out
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._nbytes -= sum(arr.nbytes for arr in old.values())
+
+    # -- scoring ---------------------------------------------------------------
+
+    def sub_scores(self, df: pd.DataFrame) -> _Outputs:
+        """Every sub-score column of *df*, from the cache where possible.
+
+        The arrays are shared with the cache: treat them as read-only.
+        """
+        fingerprints: dict[str, bytes] = {}
+        inp: _engine._Inputs | None = None
+
+        def fingerprint(col: str) -> bytes:
+            if col not in fingerprints:
+                fingerprints[col] = _fingerprint(df[col]) if col in df.columns else _ABSENT
+            return fingerprints[col]
+
+        keys: dict[str, bytes] = {}
+        outputs: _Outputs = {}
+        missed: list[str] = []
+        for st in STAGES:
+            h = hashlib.sha1(f"{st.name}|{len(df)}|{st.params!r}".encode(), usedforsecurity=False)
+            for col in st.columns:
+                h.update(col.encode())
+                h.update(fingerprint(col))
+            for up in st.after:
+                h.update(keys[up])
+            keys[st.name] = key = h.digest()
+
+            out = self._get(key)
+            cache_event(f"stage.{st.name}", hit=out is not None)
+            if out is None:
+                missed.append(st.name)
+                if inp is None:
+                    inp = _engine._Inputs(df)
+                out = st.run(inp, outputs)
+                for arr in out.values():
+                    arr.flags.writeable = False
+                self._put(key, out)
+            outputs.update(out)
+        self.recomputed = tuple(missed)
+        return outputs
+
+    def compute(
+        self,
+        df: pd.DataFrame,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> dict[str, np.ndarray]:
+        """Memoized `compute_scores`: same ``{column: array}`` result."""
+        subs = self.sub_scores(df)
+        out = {col: subs[col].copy() for col in _engine.SCORE_COLUMNS[:-2]}
+        out["smartscore"] = _engine.smartscore_from(out, weights)
+        out["tag"] = _engine.tags_from(out["smartscore"], buy_th, watch_th)
+        return out
+
+    def score_frame(
+        self,
+        df: pd.DataFrame,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> pd.DataFrame:
+        """Memoized `score_frame`: *df* with every engine output attached."""
+        with stage("score.memo", rows_in=len(df)) as run:
+            scored = df.assign(**cast_scores(self.compute(df, weights, buy_th, watch_th)))
+            run.rows_out = len(scored)
+        return scored
+
+
+# Shared by the loader and what-if re-scoring in this process
+MEMO: Final[StageMemo] = StageMemo()
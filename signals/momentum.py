@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ["add_momentum"]
 
 # ---------------------------------------------------------------------------
@@ -53,10 +56,10 @@ def add_momentum(df: pd.DataFrame) -> pd.DataFrame:  # noqa: WPS231 length ok
     for key, weight in _WEIGHTS.items():
         col = _COLUMNS_MAP[key]
         if col in work.columns:
-            momentum_raw += work[col].fillna(0) * weight
+            momentum_raw += work[col].astype("float64").fillna(0) * weight
 
     # 2️⃣ Convert to percentile 0‑100 (higher = stronger momentum)
-    momentum_score = momentum_raw.rank(pct=True) * 100.0
+    momentum_score = rank_series(momentum_raw, nan="keep") * 100.0
 
-    work["momentum_score"] = momentum_score.round(2)
+    work["momentum_score"] = momentum_score.round(2).astype(SCORE_DTYPE)
     return work
@@ -0,0 +1,231 @@
+# signals/ranking.py
+"""Ranking Kernel
+
+The percentile-rank implementation behind every batch signal and feature
+score.  `rank_columns` ranks all columns of an ``(N, K)`` array with a
+single column-wise argsort; `pct_rank` / `rank_series` are the 1-D and
+pandas front ends.  Results equal ``Series.rank(pct=True)`` under the
+default policies.  `signals.incremental.RankIndex` answers point updates
+from its own sorted array but only under the defaults (``nan="keep"``,
+``ties="average"``, ``tie_tol``); its full re-rank calls `pct_rank`.
+
+NaN policy (``nan=``) — stated at every call site instead of an ad-hoc
+``fillna(0)`` before or after ``rank``:
+
+* ``"keep"``  – NaN in, NaN out; percentiles are over the non-NaN values;
+* ``"zero"``  – NaN inputs are ranked as the value 0;
+* ``"floor"`` – NaN inputs get the percentile 0 (ranked below everything).
+
+Tie policy (``ties=``): ``"average"`` (pandas' default), ``"min"``,
+``"max"`` or ``"first"`` (sorted order, earlier row first).  ``tie_tol``
+chains neighbouring sorted values closer than the tolerance into one tie
+group, as pandas does when ranking object columns.
+
+Approximate mode (``compression=``) ranks each column against a merging
+t-digest built in bounded-memory chunks instead of an exact sort.  The
+digest (`TDigest`) can also be fed batch by batch and merged across
+workers, for streaming or very large universes; rank error is roughly
+``1 / compression`` around the median and smaller in the tails.
+"""
+from __future__ import annotations
+
+from typing import Final, Literal, Sequence
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["rank_columns", "pct_rank", "rank_series", "TDigest", "NanPolicy", "TieMethod"]
+
+NanPolicy = Literal["keep", "zero", "floor"]
+TieMethod = Literal["average", "min", "max", "first"]
+
+_CHUNK: Final[int] = 1 << 16  # values per digest update in approximate mode
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎯 Exact
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _tie_breaks(ordered: np.ndarray, tie_tol: float) -> np.ndarray:
+    """True where a sorted value starts a new tie group (positions 1..N-1)."""
+    if not tie_tol:
+        return ordered[1:] != ordered[:-1]
+    return np.abs(ordered[1:] - ordered[:-1]) > tie_tol
+
+
+def _exact(rows: np.ndarray, ties: TieMethod, tie_tol: np.ndarray) -> np.ndarray:
+    """Ranks along each row of the C-contiguous ``(K, N)`` array *rows*."""
+    order = np.argsort(rows, axis=1, kind="stable")  # one sort for all rows; NaN last
+    valid = np.count_nonzero(~np.isnan(rows), axis=1)
+    out = np.full(rows.shape, np.nan)
+    for j, n in enumerate(valid.tolist()):
+        if not n:
+            continue
+        idx = order[j, :n]
+        if ties == "first":
+            rank = np.arange(1.0, n + 1)
+        else:
+            starts = np.flatnonzero(np.r_[True, _tie_breaks(rows[j, idx], float(tie_tol[j]))])
+            ends = np.r_[starts[1:], n]
+            if ties == "min":
+                group = starts + 1.0
+            elif ties == "max":
+                group = ends.astype(np.float64)
+            else:
+                group = (starts + 1 + ends) / 2.0
+            rank = np.repeat(group, ends - starts)
+        out[j, idx] = rank / n
+    return out
+
+
+def rank_columns(
+    values: np.ndarray,
+    nan: NanPolicy = "keep",
+    ties: TieMethod = "average",
+    tie_tol: float | Sequence[float] = 0.0,
+    compression: int | None = None,
+) -> np.ndarray:
+    """Percentile rank (0–1] of every column of *values* ``(N, K)``.
+
+    Args:
+        values: Numbers to rank, one column per input.
+        nan: NaN policy (see module docstring).
+        ties: Tie policy for equal (or *tie_tol*-close) values.
+        tie_tol: Tie tolerance, one for all columns or one per column.
+        compression: Rank approximately through a `TDigest` of this
+            compression (``"average"`` ties, no *tie_tol*); None ranks
+            exactly.
+    """
+    x = np.array(values, dtype=np.float64, order="F", ndmin=2)
+    if x.ndim != 2:
+        raise ValueError("rank_columns expects a 1-D or 2-D array")
+    if nan == "zero":
+        x[np.isnan(x)] = 0.0
+    elif nan not in ("keep", "floor"):
+        raise ValueError(f"Unknown NaN policy {nan!r}")
+    if ties not in ("average", "min", "max", "first"):
+        raise ValueError(f"Unknown tie method {ties!r}")
+    if compression is not None and ties != "average":
+        raise ValueError("Approximate ranks only support average ties")
+
+    if x.shape[0] == 0:
+        return np.empty(x.shape)
+    tol = np.asarray(tie_tol, dtype=np.float64)
+    if compression is not None:
+        out = np.column_stack([TDigest.from_values(col, compression).pct(col) for col in x.T])
+    else:
+        # Column-major input → each column is one contiguous row of x.T
+        out = _exact(x.T, ties, np.broadcast_to(tol, x.shape[1:])).T
+    if nan == "floor":
+        out[np.isnan(out)] = 0.0
+    return out
+
+
+def pct_rank(
+    values: np.ndarray,
+    nan: NanPolicy = "keep",
+    ties: TieMethod = "average",
+    tie_tol: float = 0.0,
+    compression: int | None = None,
+) -> np.ndarray:
+    """`rank_columns` for one 1-D array."""
+    x = np.asarray(values, dtype=np.float64)
+    return rank_columns(x[:, None], nan, ties, tie_tol, compression)[:, 0]
+
+
+def rank_series(
+    series: pd.Series,
+    nan: NanPolicy = "keep",
+    ties: TieMethod = "average",
+    tie_tol: float = 0.0,
+) -> pd.Series:
+    """`pct_rank` of a Series (``pd.NA`` counts as NaN), same index."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.Series(pct_rank(values, nan, ties, tie_tol), index=series.index)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📐 Approximate
+# ────────────────────────────────────────────────────────────────────────────────
+
+class TDigest:
+    """Merging t-digest (k1 scale) with average-tie percentile lookups.
+
+    Centroids are kept sorted by mean; every update merges the new values
+    in and re-compresses to at most about *compression* centroids, finer
+    towards the tails.  Equal values always share one centroid, and up to
+    about ``2 / π · compression`` distinct values keep a centroid each, so
+    small universes rank exactly.
+    """
+
+    def __init__(self, compression: int = 200) -> None:
+        if compression < 10:
+            raise ValueError("compression must be at least 10")
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: int = 200, chunk: int = _CHUNK) -> TDigest:
+        digest = cls(compression)
+        for i in range(0, len(values), chunk):
+            digest.update(values[i:i + chunk])
+        return digest
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values (NaN ignored)."""
+        v = np.asarray(values, dtype=np.float64)
+        v = v[~np.isnan(v)]
+        if v.size:
+            self.min = min(self.min, float(v.min()))
+            self.max = max(self.max, float(v.max()))
+            self._merge(v, np.ones(v.size))
+
+    def merge(self, other: TDigest) -> None:
+        """Fold *other* (e.g. another worker's digest) into this one."""
+        if other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._merge(other.means, other.weights)
+
+    def _merge(self, means: np.ndarray, weights: np.ndarray) -> None:
+        m = np.concatenate([self.means, means])
+        w = np.concatenate([self.weights, weights])
+        order = np.argsort(m, kind="stable")
+        m, w = m[order], w[order]
+
+        # k1 scale: centroid k-size ≤ 1, i.e. one bucket per unit of k
+        cum = np.cumsum(w)
+        q = (cum - w / 2) / cum[-1]
+        bucket = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        # ...but never split a run of equal values: a centroid starts with a
+        # run that begins in another bucket than the previous run did
+        runs = np.flatnonzero(np.r_[True, m[1:] != m[:-1]])
+        starts = runs[np.r_[True, bucket[runs[1:]] != bucket[runs[:-1]]]]
+        total = np.add.reduceat(w, starts)
+        self.means = np.add.reduceat(m * w, starts) / total
+        self.weights = total
+
+    def pct(self, values: np.ndarray) -> np.ndarray:
+        """Approximate ``rank(pct=True)`` of *values* within the digest."""
+        x = np.asarray(values, dtype=np.float64)
+        n = self.count
+        if n == 0:
+            return np.full(x.shape, np.nan)
+        before = np.cumsum(self.weights) - self.weights
+        # Average rank of the values a centroid stands for, over n
+        xp = self.means
+        fp = (before + (self.weights + 1) / 2) / n
+        if xp[0] > self.min:
+            xp, fp = np.r_[self.min, xp], np.r_[1 / n, fp]
+        if xp[-1] < self.max:
+            xp, fp = np.r_[xp, self.max], np.r_[fp, 1.0]
+        out = np.interp(x, xp, fp)
+        out[np.isnan(x)] = np.nan
+        return out
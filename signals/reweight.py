@@ -0,0 +1,80 @@
+# signals/reweight.py
+"""SmartScore Re-weighting
+
+What-if SmartScores for other weights and thresholds without re-running
+any signal.  The six sub-scores of a scored frame are pulled once into a
+contiguous float32 ``(N, K)`` matrix (NaN → 0, as in `smartscore_from`);
+every re-weighting is then one matrix–vector product followed by
+vectorized tag bucketing straight into categorical codes.
+
+Same maths as `signals.engine.smartscore_from` / `tags_from`.  The product
+runs in float64: two-decimal sub-scores times integer weights land exactly
+on cent rounding ties often enough that float32 sums would move ~2% of the
+scores by one cent; in float64 only about one score in 10,000 (a tie
+resolved the other way by the summation order) differs, by one cent.
+Pure computation.
+"""
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from clean.schema import SCORE_DTYPE, TAG_DTYPE
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from signals.smartscore import _SCORE_COLS
+
+__all__ = ["SubScoreMatrix", "tag_categorical"]
+
+
+def tag_categorical(
+    smartscore: np.ndarray,
+    buy_th: float = BUY_THRESHOLD,
+    watch_th: float = WATCH_THRESHOLD,
+) -> pd.Categorical:
+    """Bucket SmartScores into BUY / WATCH / AVOID (`TAG_DTYPE` codes)."""
+    score = np.nan_to_num(np.asarray(smartscore), nan=0.0)
+    codes = np.full(score.shape[0], 2, dtype=np.int8)  # AVOID
+    codes[score >= watch_th] = 1
+    codes[score >= buy_th] = 0
+    return pd.Categorical.from_codes(codes, dtype=TAG_DTYPE)
+
+
+class SubScoreMatrix:
+    """Float32 sub-score matrix of one (read-only) scored frame.
+
+    Weight keys without a sub-score column in the frame contribute 0 but
+    still count towards the total weight, as in `smartscore_from`.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.keys = tuple(key for key, col in _SCORE_COLS.items() if col in df.columns)
+        matrix = np.empty((len(df), len(self.keys)), dtype=np.float32)
+        for j, key in enumerate(self.keys):
+            matrix[:, j] = df[_SCORE_COLS[key]].to_numpy(dtype=np.float32, na_value=np.nan)
+        self.matrix = np.nan_to_num(matrix, copy=False)
+
+    def smartscore(self, weights: Mapping[str, float] = SMART_WEIGHTS) -> np.ndarray:
+        """0–100 composite for *weights*, rounded to cents (float32)."""
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("SmartScore weights must have a positive sum")
+        w = np.array([weights.get(key, 0) for key in self.keys], dtype=np.float64)
+        raw = np.matmul(self.matrix, w / 100.0, dtype=np.float64)
+        return np.round((raw / total) * 100, 2).astype(SCORE_DTYPE)
+
+    def rescore(
+        self,
+        df: pd.DataFrame,
+        weights: Mapping[str, float] = SMART_WEIGHTS,
+        buy_th: float = BUY_THRESHOLD,
+        watch_th: float = WATCH_THRESHOLD,
+    ) -> pd.DataFrame:
+        """*df* (the frame this matrix was built from) with `smartscore` and
+        `tag` replaced; the other columns are shared, not copied."""
+        score = self.smartscore(weights)
+        out = df.copy(deep=False)
+        out["smartscore"] = score
+        out["tag"] = tag_categorical(score, buy_th, watch_th)
+        return out
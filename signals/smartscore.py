@@ -8,6 +8,8 @@ Pure function only.
 from __future__ import annotations
 
 import pandas as pd
+
+from clean.schema import SCORE_DTYPE
 from config import SMART_WEIGHTS
 
 __all__ = ["add_smartscore"]
@@ -34,8 +36,8 @@ def add_smartscore(df: pd.DataFrame) -> pd.DataFrame:
         col = _SCORE_COLS.get(key)
         if col and col in work.columns:
             # sub-score is 0–100; convert to 0–1, weight, then accumulate
-            raw += (work[col].fillna(0) / 100.0) * weight
+            raw += (work[col].astype("float64").fillna(0) / 100.0) * weight
 
     # Normalize to 0–100
-    work["smartscore"] = ((raw / total_weight) * 100).round(2)
+    work["smartscore"] = ((raw / total_weight) * 100).round(2).astype(SCORE_DTYPE)
     return work
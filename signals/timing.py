@@ -13,9 +13,13 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ["add_timing"]
 
-# Weights for timing components\_WEIGHTS: dict[str, float] = {
+# Weights for timing components
+_WEIGHTS: dict[str, float] = {
     "dma_cross": 0.5,   # crossover count
     "prox_dma": 0.3,    # distance above DMA20/50
     "prox_low": 0.2,    # proximity to 52-week low
@@ -43,12 +47,12 @@ def add_timing(df: pd.DataFrame) -> pd.DataFrame:
     # 2️⃣ Proximity to DMA20 & DMA50: price - DMA / price
     prox_dma20 = (work[_COL_PRICE] - work[_COL_DMA20]) / work[_COL_PRICE]
     prox_dma50 = (work[_COL_PRICE] - work[_COL_DMA50]) / work[_COL_PRICE]
-    prox_dma = ((prox_dma20 + prox_dma50) / 2).fillna(0)
-    prox_dma_pct = prox_dma.rank(pct=True)
+    prox_dma = (prox_dma20 + prox_dma50) / 2
+    prox_dma_pct = rank_series(prox_dma, nan="zero")
 
     # 3️⃣ Proximity to 52W low: 1 - (price - low)/price  (closer to low=>higher)
     prox_low = 1 - ((work[_COL_PRICE] - work[_COL_LOW52]) / work[_COL_PRICE])
-    prox_low_pct = prox_low.rank(pct=True)
+    prox_low_pct = rank_series(prox_low, nan="keep")
 
     # Composite raw
     raw = (
@@ -57,5 +61,5 @@ def add_timing(df: pd.DataFrame) -> pd.DataFrame:
         + _WEIGHTS["prox_low"] * prox_low_pct
     )
 
-    work["timing_score"] = (raw.rank(pct=True) * 100).round(2)
+    work["timing_score"] = (rank_series(raw, nan="keep") * 100).round(2).astype(SCORE_DTYPE)
     return work
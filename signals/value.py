@@ -14,6 +14,9 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ["add_value"]
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -33,8 +36,8 @@ _WEIGHTS: dict[str, float] = {
 # ──────────────────────────────────────────────────────────────────────────────
 
 def _percentile(series: pd.Series, higher_is_better: bool = True) -> pd.Series:  # noqa: WPS110
-    """Return series ranked 0…1 (percentile)."""
-    ranked = series.rank(pct=True)
+    """Return series ranked 0…1 (percentile); NaN stays NaN."""
+    ranked = rank_series(series, nan="keep")
     return ranked if higher_is_better else 1 - ranked
 
 
@@ -85,7 +88,7 @@ def add_value(df: pd.DataFrame) -> pd.DataFrame:  # noqa: WPS231 length ok
         + _WEIGHTS["discount_52w"] * work["_52w_score"]
         + _WEIGHTS["below_dma200"] * work["_dma200_score"]
     )
-    work["value_score"] = (value_raw * 100).round(2)
+    work["value_score"] = (value_raw * 100).round(2).astype(SCORE_DTYPE)
 
     # Drop helper cols
     work.drop(columns=[c for c in work.columns if c.startswith("_")], inplace=True)
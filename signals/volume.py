@@ -8,9 +8,13 @@ from __future__ import annotations
 
 import pandas as pd
 
+from clean.schema import SCORE_DTYPE
+from signals.ranking import rank_series
+
 __all__ = ["add_volume"]
 
-# Weights for volume components\_WEIGHTS: dict[str, float] = {
+# Weights for volume components
+_WEIGHTS: dict[str, float] = {
     "rvol": 0.6,   # relative volume today vs 90-day average
     "vol_spike": 0.4,  # recent 7-day vs 30-day average spike
 }
@@ -20,6 +24,8 @@ _COLUMN_RVOL: str = "rvol"
 _COLUMN_7D_VOL: str = "7_days_volume"
 _COLUMN_30D_VOL: str = "30_days_volume"
 
+_SPIKE_TIE_TOL: float = 1e-13
+
 
 def add_volume(df: pd.DataFrame) -> pd.DataFrame:
     """Return df with new `volume_score` column (0–100)."""
@@ -27,14 +33,15 @@ def add_volume(df: pd.DataFrame) -> pd.DataFrame:
 
     # 1️⃣ RVOL percentile (higher is more active)
     if _COLUMN_RVOL in work.columns:
-        rvol_scores = work[_COLUMN_RVOL].rank(pct=True).fillna(0)
+        rvol_scores = rank_series(work[_COLUMN_RVOL], nan="floor")
     else:
         rvol_scores = pd.Series(0.5, index=work.index)
 
     # 2️⃣ Volume spike: compare 7d vs 30d average
     if _COLUMN_7D_VOL in work.columns and _COLUMN_30D_VOL in work.columns:
         spike = work[_COLUMN_7D_VOL].fillna(0) / work[_COLUMN_30D_VOL].replace(0, pd.NA)
-        spike_scores = spike.rank(pct=True).fillna(0)
+        # Object column (pd.NA): pandas ranks those with an absolute tie tolerance
+        spike_scores = rank_series(spike, nan="floor", tie_tol=_SPIKE_TIE_TOL)
     else:
         spike_scores = pd.Series(0.5, index=work.index)
 
@@ -44,5 +51,5 @@ def add_volume(df: pd.DataFrame) -> pd.DataFrame:
         + _WEIGHTS["vol_spike"] * spike_scores
     )
 
-    work["volume_score"] = (raw.rank(pct=True) * 100).round(2)
+    work["volume_score"] = (rank_series(raw, nan="keep") * 100).round(2).astype(SCORE_DTYPE)
     return work
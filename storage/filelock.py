@@ -0,0 +1,44 @@
+# storage/filelock.py
+"""Cross-process File Lock
+
+Serializes writers of state shared by several processes under
+``SNAPSHOT_DIR`` — the snapshot history, alert state — when the refresher,
+dashboard workers and batch runs touch the same files.  An exclusive
+``fcntl.flock`` on a lock file guards against other processes (and other
+threads: each holder opens the file itself); without ``fcntl`` only the
+threads of this process are serialized.
+"""
+from __future__ import annotations
+
+import contextlib
+import threading
+from pathlib import Path
+from typing import Iterator
+
+try:  # POSIX only; elsewhere the lock is per process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = ["file_lock"]
+
+_LOCAL: dict[str, threading.Lock] = {}
+_LOCAL_GUARD = threading.Lock()
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on *path* (created if missing) for the block."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:  # pragma: no cover
+        with _LOCAL_GUARD:
+            local = _LOCAL.setdefault(str(path.resolve()), threading.Lock())
+        with local:
+            yield
+        return
+    with open(path, "a+b") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
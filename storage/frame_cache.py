@@ -0,0 +1,123 @@
+# storage/frame_cache.py
+"""Persistent Frame Cache
+
+Stores pipeline frames (cleaned, scored) as Parquet files under
+``SNAPSHOT_DIR/cache``, keyed by a content hash of the source CSV, so a
+restarted app or a new worker can reuse the last result instead of
+re-downloading and re-scoring.
+
+Layout::
+
+    cache/<stage>/<key>.parquet   one file per source version
+    cache/<stage>/<key>.prev      key of the frame this one replaced
+    cache/<stage>/LATEST          key of the last good frame
+
+Writes are atomic (temp file + rename), so readers never see half files.
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from config import SNAPSHOT_DIR
+from metrics.metrics import cache_event
+
+__all__ = ["FrameCache"]
+
+_LATEST: str = "LATEST"
+
+
+class FrameCache:
+    """Content-addressed Parquet store with a "last good frame" pointer.
+
+    Args:
+        root: Cache directory (default ``SNAPSHOT_DIR / "cache"``).
+        keep: Files kept per stage; older ones are pruned on write.
+    """
+
+    def __init__(self, root: Path | None = None, keep: int = 3) -> None:
+        self.root = Path(root) if root is not None else SNAPSHOT_DIR / "cache"
+        self.keep = keep
+
+    def _dir(self, stage: str) -> Path:
+        path = self.root / stage
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self._dir(stage) / f"{key}.parquet"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self._path(stage, key).exists()
+
+    def get(self, stage: str, key: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        """Return the frame stored for *key* (only *columns* if given), or
+        None (counted as a *stage* cache miss)."""
+        path = self._path(stage, key)
+        if not path.exists():
+            cache_event(stage, hit=False)
+            return None
+        cache_event(stage, hit=True)
+        return pd.read_parquet(path, columns=columns)
+
+    def put(self, stage: str, key: str, df: pd.DataFrame, replaces: str | None = None) -> Path:
+        """Persist *df* under *key* and mark it as the latest good frame.
+
+        *replaces* records the key of the frame this one supersedes (see
+        `previous_key`).
+        """
+        path = self._path(stage, key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        if replaces is not None and replaces != key:
+            link = path.with_suffix(".prev")
+            tmp = link.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(replaces)
+            os.replace(tmp, link)
+        self.mark_latest(stage, key)
+        self._prune(stage)
+        return path
+
+    def previous_key(self, stage: str, key: str) -> str | None:
+        """Key of the frame *key* replaced when it was stored, if still cached."""
+        try:
+            prev = self._path(stage, key).with_suffix(".prev").read_text().strip()
+        except FileNotFoundError:
+            return None
+        return prev if self.has(stage, prev) else None
+
+    # -- "last good frame" pointer ----------------------------------------
+
+    def mark_latest(self, stage: str, key: str) -> None:
+        """Point LATEST at *key* (also resets its age)."""
+        pointer = self._dir(stage) / _LATEST
+        tmp = pointer.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(key)
+        os.replace(tmp, pointer)
+
+    def latest_key(self, stage: str) -> str | None:
+        pointer = self._dir(stage) / _LATEST
+        try:
+            key = pointer.read_text().strip()
+        except FileNotFoundError:
+            return None
+        return key if self.has(stage, key) else None
+
+    def latest_age(self, stage: str) -> float:
+        """Seconds since LATEST was last written (inf if never)."""
+        try:
+            return time.time() - (self._dir(stage) / _LATEST).stat().st_mtime
+        except FileNotFoundError:
+            return float("inf")
+
+    def _prune(self, stage: str) -> None:
+        files = sorted(self._dir(stage).glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+        latest = self.latest_key(stage)
+        for path in files[: max(len(files) - self.keep, 0)]:
+            if path.stem != latest:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".prev").unlink(missing_ok=True)
@@ -0,0 +1,141 @@
+# storage/shared_frame.py
+"""Shared Frame Segments
+
+Versioned, read-only hand-off of the live scored frame from the refresh
+worker (`pipeline.refresher`) to any number of dashboard processes.
+
+Layout::
+
+    live/frame-000042.arrow   uncompressed Arrow IPC segment, mode 0444
+    live/VERSION              number of the newest complete segment
+    live/HEARTBEAT            touched by the writer on every successful run
+
+The writer creates the segment first and only then bumps ``VERSION``
+(both atomically), so a reader that sees version *n* can always open
+segment *n*.  Readers memory-map the segment: the Arrow buffers point
+straight into the page cache and are shared by every process attached to
+the same version.  Old segments are unlinked after ``keep`` newer ones;
+processes still mapping them keep their view until they let go.
+
+`frame` hands the segment to pandas without copying what Arrow can share:
+float columns are written with NaN as values (not nulls), so every numeric
+column and the codes of categorical columns are read-only views of the
+mapping.  Only text (``ticker``, ``name`` …) and bool columns are copied
+into each process.
+
+`age` measures the writer's heartbeat, not the newest version: a worker
+whose sheet did not change publishes nothing but is still alive.
+"""
+from __future__ import annotations
+
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Final
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from config import SNAPSHOT_DIR
+
+__all__ = ["SharedFrame"]
+
+_VERSION: Final[str] = "VERSION"
+_HEARTBEAT: Final[str] = "HEARTBEAT"
+_READ_ONLY: Final[int] = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _table(df: pd.DataFrame) -> pa.Table:
+    """*df* as Arrow with float NaN kept as values, so readers map floats
+    zero-copy (Arrow nulls would force pandas to copy and fill them)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, name in enumerate(table.column_names):
+        if isinstance(df[name].dtype, np.dtype) and df[name].dtype.kind == "f":
+            values = pa.array(df[name].to_numpy(), from_pandas=False)
+            table = table.set_column(i, table.field(i).with_type(values.type), values)
+    return table
+
+
+class SharedFrame:
+    """Publish / attach versioned Arrow IPC segments of one frame.
+
+    Args:
+        root: Segment directory (default ``SNAPSHOT_DIR / "live"``).
+        keep: Segments kept on disk, newest first.
+    """
+
+    def __init__(self, root: Path | None = None, keep: int = 3) -> None:
+        self.root = Path(root) if root is not None else SNAPSHOT_DIR / "live"
+        self.keep = keep
+
+    def _segment(self, version: int) -> Path:
+        return self.root / f"frame-{version:06d}.arrow"
+
+    # -- writer ------------------------------------------------------------
+
+    def publish(self, df: pd.DataFrame) -> int:
+        """Write *df* as the next version and return its number."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = (self.version() or 0) + 1
+        path = self._segment(version)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        table = _table(df)
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.chmod(tmp, _READ_ONLY)
+        os.replace(tmp, path)
+
+        pointer = self.root / _VERSION
+        tmp = pointer.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(str(version))
+        os.replace(tmp, pointer)
+        self.heartbeat()
+        self._prune(version)
+        return version
+
+    def heartbeat(self) -> None:
+        """Record that the writer is alive (also when nothing changed)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / _HEARTBEAT).touch()
+
+    def _prune(self, newest: int) -> None:
+        for path in self.root.glob("frame-*.arrow"):
+            if int(path.stem.split("-")[1]) <= newest - self.keep:
+                path.unlink(missing_ok=True)
+
+    # -- readers -----------------------------------------------------------
+
+    def version(self) -> int | None:
+        """Newest published version, or None if nothing was published."""
+        try:
+            return int((self.root / _VERSION).read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def age(self) -> float:
+        """Seconds since the writer's last heartbeat or publish (inf if never)."""
+        seen = []
+        for name in (_HEARTBEAT, _VERSION):
+            try:
+                seen.append((self.root / name).stat().st_mtime)
+            except FileNotFoundError:
+                pass
+        return time.time() - max(seen) if seen else float("inf")
+
+    def attach(self, version: int | None = None) -> pa.Table:
+        """Memory-map segment *version* (default newest) as a zero-copy table."""
+        version = self.version() if version is None else version
+        if version is None:
+            raise FileNotFoundError(f"No frame published under {self.root}")
+        with pa.memory_map(str(self._segment(version))) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def frame(self, version: int | None = None, columns: list[str] | None = None) -> pd.DataFrame:
+        """Segment *version* (only *columns* if given) as a read-only frame
+        over the mapping (see the module docstring for what is copied)."""
+        table = self.attach(version)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas(split_blocks=True)
@@ -0,0 +1,306 @@
+# storage/snapshot_store.py
+"""Snapshot History Store
+
+Append-only history of scored watchlist frames under
+``SNAPSHOT_DIR/history``, for charts and research over months of daily
+snapshots without loading them all into RAM.
+
+Layout::
+
+    history/date=YYYY-MM-DD/0000.arrow   one file per appended snapshot
+    history/date=YYYY-MM-DD/index.arrow  that day's (seq, ticker_id) → (batch, row)
+    history/tickers.arrow                ticker → ticker_id, shared by every writer
+    history/.lock                        cross-process writer lock
+
+Snapshots are Arrow IPC files with zstd-compressed record batches of
+``BATCH_ROWS`` rows.  Reads go through memory-mapped files and only
+decompress what is asked for: one day's universe reads a single file (and
+only the requested columns), one ticker's history reads one batch per day,
+located through the small per-day indexes.
+
+Appends are serialized across processes (refresher, dashboard warm starts)
+by a file lock and only touch their own day: the snapshot file is written
+first, then that day's index is rewritten atomically, so a reader never
+sees index rows for a file that is not fully written.  Readers cache each
+day's index and re-read only days whose index file changed.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+from pathlib import Path
+from typing import Final, Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from clean.schema import TickerRegistry, apply_schema
+from config import SNAPSHOT_DIR
+from storage.filelock import file_lock
+
+__all__ = ["SnapshotStore", "BATCH_ROWS"]
+
+BATCH_ROWS: Final[int] = 1024
+
+_INDEX: Final[str] = "index.arrow"
+_TICKERS: Final[str] = "tickers.arrow"
+_LOCK: Final[str] = ".lock"
+_INDEX_SCHEMA: Final = pa.schema([
+    ("date", pa.date32()),
+    ("seq", pa.int16()),
+    ("ticker_id", pa.int32()),
+    ("batch", pa.int32()),
+    ("row", pa.int32()),
+])
+
+
+def _write_ipc(path: Path, table: pa.Table, compression: str | None = None) -> None:
+    """Write *table* to *path* atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    os.replace(tmp, path)
+
+
+def _read_ipc(path: Path) -> pa.Table:
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class _FileRegistry(TickerRegistry):
+    """`TickerRegistry` shared through an Arrow file.
+
+    Unseen tickers are registered under a cross-process file lock after
+    re-reading the file, so every process appending to the store hands out
+    the same IDs; tickers or IDs not known locally are looked up again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stamp: tuple[int, int] | None = None
+        super().__init__()
+
+    def _reload(self) -> None:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return
+        if (st.st_mtime_ns, st.st_ino) == self._stamp:
+            return
+        frame = _read_ipc(self.path).to_pandas().sort_values("ticker_id")
+        persisted = pd.Index(frame["ticker"].to_numpy(dtype=object), dtype=object)
+        if len(persisted) >= len(self._index):  # append-only: ours is a prefix
+            self._index = persisted
+        self._stamp = (st.st_mtime_ns, st.st_ino)
+
+    def _register(self, fresh: np.ndarray) -> None:
+        with file_lock(self.path.with_suffix(".lock")):
+            self._reload()
+            fresh = fresh[self._index.get_indexer(fresh) < 0]
+            if not len(fresh):
+                return
+            super()._register(fresh)
+            _write_ipc(self.path, pa.Table.from_pandas(self.to_frame(), preserve_index=False))
+            st = self.path.stat()
+            self._stamp = (st.st_mtime_ns, st.st_ino)
+
+
+def _as_date(when: dt.date | dt.datetime | str | None) -> dt.date:
+    if when is None:
+        return dt.date.today()
+    return pd.Timestamp(when).date()
+
+
+class SnapshotStore:
+    """Date-partitioned, append-only store of scored frames.
+
+    Args:
+        root: Store directory (default ``SNAPSHOT_DIR / "history"``).
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = Path(root) if root is not None else SNAPSHOT_DIR / "history"
+        self._lock = threading.Lock()
+        # date → ((mtime, inode) of its index file, index columns)
+        self._parts: dict[dt.date, tuple[tuple[int, int], dict[str, np.ndarray]]] = {}
+        self._registry: TickerRegistry | None = None
+
+    # -- paths -------------------------------------------------------------
+
+    def _file(self, date: dt.date, seq: int) -> Path:
+        return self.root / f"date={date.isoformat()}" / f"{seq:04d}.arrow"
+
+    # -- index & registry ----------------------------------------------------
+
+    @property
+    def registry(self) -> TickerRegistry:
+        """Ticker IDs used by every stored snapshot (shared by all writers)."""
+        if self._registry is None:
+            self._registry = _FileRegistry(self.root / _TICKERS)
+        return self._registry
+
+    def _partitions(self) -> dict[dt.date, dict[str, np.ndarray]]:
+        """Every stored day's index, oldest first (cached per day file)."""
+        parts: dict[dt.date, tuple[tuple[int, int], dict[str, np.ndarray]]] = {}
+        for path in self.root.glob(f"date=*/{_INDEX}"):
+            date = dt.date.fromisoformat(path.parent.name.removeprefix("date="))
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            stamp = (st.st_mtime_ns, st.st_ino)
+            cached = self._parts.get(date)
+            if cached is None or cached[0] != stamp:
+                table = _read_ipc(path)
+                cached = (stamp, {name: table[name].to_numpy() for name in table.column_names})
+            parts[date] = cached
+        self._parts = parts
+        return {date: parts[date][1] for date in sorted(parts)}
+
+    def _load_index(self, start: dt.date | None = None, end: dt.date | None = None) -> dict[str, np.ndarray]:
+        chosen = [
+            idx for date, idx in self._partitions().items()
+            if (start is None or date >= start) and (end is None or date <= end)
+        ]
+        if not chosen:
+            return {f.name: pa.array([], type=f.type).to_numpy() for f in _INDEX_SCHEMA}
+        return {name: np.concatenate([idx[name] for idx in chosen]) for name in _INDEX_SCHEMA.names}
+
+    def index(self) -> pd.DataFrame:
+        """The (date, seq, ticker_id) → (batch, row) index as a frame."""
+        return pd.DataFrame(self._load_index())
+
+    def snapshots(self) -> list[tuple[dt.date, int]]:
+        """Stored ``(date, seq)`` pairs in chronological order."""
+        return [
+            (date, int(seq))
+            for date, idx in self._partitions().items()
+            for seq in np.unique(idx["seq"])
+        ]
+
+    def dates(self) -> list[dt.date]:
+        """Days with at least one snapshot, oldest first."""
+        return [date for date, idx in self._partitions().items() if len(idx["seq"])]
+
+    # -- write -----------------------------------------------------------------
+
+    def append(self, df: pd.DataFrame, when: dt.date | dt.datetime | str | None = None) -> Path:
+        """Store *df* as a new snapshot for *when* (default today).
+
+        Several snapshots per day are kept; reads default to the last one.
+        Ticker IDs are re-encoded with the store's own persisted registry so
+        they stay stable across processes and restarts.
+        """
+        date = _as_date(when)
+        with self._lock, file_lock(self.root / _LOCK):
+            part = self._file(date, 0).parent
+            taken = [int(p.stem) for p in part.glob("[0-9]*.arrow")]
+            seq = max(taken) + 1 if taken else 0
+
+            ids = self.registry.encode(df["ticker"])
+            frame = df.drop(columns=["ticker_id"], errors="ignore")
+            frame.insert(frame.columns.get_loc("ticker") + 1, "ticker_id", ids)
+
+            path = self._file(date, seq)
+            _write_ipc(path, pa.Table.from_pandas(frame, preserve_index=False), compression="zstd")
+
+            n = len(frame)
+            rows = np.arange(n, dtype=np.int32)
+            added = pa.table({
+                "date": pa.array(np.full(n, np.datetime64(date, "D"))),
+                "seq": pa.array(np.full(n, seq, dtype=np.int16)),
+                "ticker_id": pa.array(ids),
+                "batch": pa.array(rows // BATCH_ROWS),
+                "row": pa.array(rows % BATCH_ROWS),
+            }, schema=_INDEX_SCHEMA)
+            index = part / _INDEX
+            if index.exists():
+                added = pa.concat_tables([_read_ipc(index), added])
+            _write_ipc(index, added)
+        return path
+
+    # -- read ------------------------------------------------------------------
+
+    def _read(
+        self,
+        date: dt.date,
+        seq: int,
+        columns: Iterable[str] | None,
+        batch: int | None = None,
+    ) -> pa.Table:
+        """One snapshot (or one record *batch* of it), *columns* only."""
+        with pa.memory_map(str(self._file(date, seq))) as source:
+            options = None
+            if columns is not None:
+                schema = pa.ipc.open_file(source).schema
+                wanted = ["ticker", "ticker_id", *columns]
+                fields = sorted({schema.get_field_index(c) for c in wanted if c in schema.names})
+                options = pa.ipc.IpcReadOptions(included_fields=fields)
+            reader = pa.ipc.open_file(source, options=options)
+            if batch is None:
+                return reader.read_all()
+            return pa.Table.from_batches([reader.get_batch(batch)])
+
+    def _latest_seq(self, date: dt.date) -> int:
+        idx = self._partitions().get(date)
+        if idx is None or not len(idx["seq"]):
+            raise KeyError(f"No snapshot stored for {date}")
+        return int(idx["seq"].max())
+
+    def _frame(self, tables: list[pa.Table]) -> pd.DataFrame:
+        parts = [t.to_pandas() for t in tables]
+        return apply_schema(pd.concat(parts, ignore_index=True), self.registry)
+
+    def day(
+        self,
+        when: dt.date | dt.datetime | str,
+        columns: Iterable[str] | None = None,
+        seq: int | None = None,
+    ) -> pd.DataFrame:
+        """Return the universe stored for one day (its last snapshot by default).
+
+        Only *columns* (plus ``ticker``/``ticker_id``) are decompressed.
+        """
+        date = _as_date(when)
+        seq = self._latest_seq(date) if seq is None else seq
+        return self._frame([self._read(date, seq, columns)])
+
+    def history(
+        self,
+        ticker: str,
+        columns: Iterable[str] | None = None,
+        start: dt.date | str | None = None,
+        end: dt.date | str | None = None,
+        all_snapshots: bool = False,
+    ) -> pd.DataFrame:
+        """Return one ticker's rows over time, with a leading ``date`` column.
+
+        Uses the per-day indexes (only the days in range) to read a single
+        record batch per snapshot.  By default only the last snapshot of
+        each day is returned.
+        """
+        idx = self._load_index(
+            _as_date(start) if start is not None else None,
+            _as_date(end) if end is not None else None,
+        )
+        tid = self.registry.lookup(pd.Series([ticker], dtype=object))[0]
+        if tid < 0:
+            return pd.DataFrame(columns=["date", "ticker"])
+        hit = idx["ticker_id"] == tid
+        found = pd.DataFrame({k: v[hit] for k, v in idx.items()}).sort_values(["date", "seq"])
+        if not all_snapshots:
+            found = found.drop_duplicates("date", keep="last")
+        if found.empty:
+            return pd.DataFrame(columns=["date", "ticker"])
+
+        tables = []
+        for date, seq, batch, row in found[["date", "seq", "batch", "row"]].itertuples(index=False):
+            table = self._read(pd.Timestamp(date).date(), int(seq), columns, int(batch))
+            tables.append(table.slice(int(row), 1))
+        out = self._frame(tables)
+        out.insert(0, "date", found["date"].to_numpy().astype("datetime64[ns]"))
+        return out
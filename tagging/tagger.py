@@ -12,7 +12,11 @@ from __future__ import annotations
 import pandas as pd
 from config import BUY_THRESHOLD, WATCH_THRESHOLD
 
-__all__ = ["apply_tags"]
+__all__ = ["apply_tags", "TAG_BUY", "TAG_WATCH", "TAG_AVOID"]
+
+TAG_BUY: str = '🟢 BUY'
+TAG_WATCH: str = '🟡 WATCH'
+TAG_AVOID: str = '🔴 AVOID'
 
 
 def apply_tags(df: pd.DataFrame, buy_th: int = BUY_THRESHOLD, watch_th: int = WATCH_THRESHOLD) -> pd.DataFrame:
@@ -20,10 +24,13 @@ def apply_tags(df: pd.DataFrame, buy_th: int = BUY_THRESHOLD, watch_th: int = WA
     work = df.copy()
     def tag_row(score: float) -> str:
         if score >= buy_th:
-            return '🟢 BUY'
+            return TAG_BUY
         if score >= watch_th:
-            return '🟡 WATCH'
-        return '🔴 AVOID'
+            return TAG_WATCH
+        return TAG_AVOID
 
-    work['tag'] = work['smartscore'].fillna(0).apply(tag_row)
+    work['tag'] = pd.Categorical(
+        work['smartscore'].fillna(0).apply(tag_row),
+        categories=[TAG_BUY, TAG_WATCH, TAG_AVOID],
+    )
     return work
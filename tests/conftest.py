@@ -0,0 +1,41 @@
+# tests/conftest.py
+"""Shared fixtures: repo root on ``sys.path`` and synthetic frames."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+NUMERIC_COLUMNS = (
+    "1_day_change", "7_days_returns", "30_days_returns", "3_months", "6_months", "1_year",
+    "3_year", "5_year", "pe", "eps_pct_change", "pct_from_high", "pct_from_low",
+    "current_price", "20_day_avg", "50_day_avg", "200_day_avg", "52_week_low",
+    "52_week_high", "rvol", "7_days_volume", "30_days_volume", "eps_current",
+)
+
+
+def make_watchlist(n: int, seed: int = 0) -> pd.DataFrame:
+    """Cleaned-watchlist-like frame with NaN, zeros and coarse (tied) values."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in NUMERIC_COLUMNS:
+        values = np.round(rng.normal(50, 30, n))  # whole numbers: plenty of ties
+        values[rng.random(n) < 0.05] = np.nan
+        values[rng.random(n) < 0.02] = 0
+        data[col] = values
+    df = pd.DataFrame(data)
+    df.insert(0, "ticker", [f"T{i}" for i in range(n)])
+    df["name"] = df["ticker"]
+    df["sector"] = rng.choice(["Energy", "Banks", "IT", None], n)
+    df["category"] = rng.choice(["Large", "Mid", "Small"], n)
+    return df
+
+
+@pytest.fixture
+def watchlist() -> pd.DataFrame:
+    return make_watchlist(400, seed=1)
@@ -0,0 +1,65 @@
+# tests/test_engine.py
+"""`score_frame` against the legacy ``add_*`` chain it replaces."""
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clean.schema import SCORE_COLS, apply_schema
+from config import BUY_THRESHOLD, SMART_WEIGHTS, WATCH_THRESHOLD
+from conftest import make_watchlist
+from features.buy_zone_map import add_buy_zone
+from features.dma_crossover import add_dma_crossover
+from features.eps_growth_screener import add_eps_growth_score
+from signals.confirmation import add_confirmation
+from signals.engine import score_frame
+from signals.momentum import add_momentum
+from signals.smartscore import add_smartscore
+from signals.timing import add_timing
+from signals.value import add_value
+from signals.volume import add_volume
+from tagging.tagger import apply_tags
+
+_CHAIN = (
+    add_momentum, add_value, add_volume, add_timing, add_confirmation,
+    add_buy_zone, add_dma_crossover, add_eps_growth_score, add_smartscore, apply_tags,
+)
+
+
+def _legacy(df: pd.DataFrame) -> pd.DataFrame:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        for stage in _CHAIN:
+            df = stage(df)
+    return df
+
+
+def _frames() -> dict[str, pd.DataFrame]:
+    frames = {f"n{n}-s{seed}": make_watchlist(n, seed) for n, seed in ((400, 1), (2000, 2), (7, 3), (1, 4))}
+    sparse = make_watchlist(300, 5)
+    sparse["rvol"] = np.nan
+    sparse["30_days_volume"] = 0.0
+    frames["all-nan-rvol"] = sparse
+    frames["missing-columns"] = make_watchlist(300, 6).drop(columns=["pe", "rvol", "7_days_volume", "eps_pct_change"])
+    return frames
+
+
+@pytest.mark.parametrize("name", list(_frames()))
+def test_score_frame_matches_legacy_chain(name: str) -> None:
+    df = apply_schema(_frames()[name])
+    expected = _legacy(df.copy())
+    actual = score_frame(df, SMART_WEIGHTS, BUY_THRESHOLD, WATCH_THRESHOLD)
+    for col in [*SCORE_COLS, "tag", "dma20_above_50", "dma50_above_200"]:
+        if col in expected.columns:
+            pd.testing.assert_series_equal(actual[col], expected[col], check_exact=True, obj=col)
+    assert list(actual.columns[: len(df.columns)]) == list(df.columns)
+
+
+def test_score_frame_leaves_input_alone(watchlist: pd.DataFrame) -> None:
+    df = apply_schema(watchlist)
+    before = df.copy()
+    score_frame(df)
+    pd.testing.assert_frame_equal(df, before)
@@ -0,0 +1,141 @@
+# tests/test_fetch.py
+"""`SheetFetcher` against a local HTTP stand-in server."""
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from ingest.fetch import SheetFetcher
+
+
+class _Sheet:
+    """Server state: body versions, failures to inject and what was seen."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.version = 1
+        self.fail = 0          # next requests answered 503
+        self.stale = 0         # next requests answered 304 regardless
+        self.delay = 0.0
+        self.active = 0
+        self.peak = 0
+        self.requests: list[dict[str, str]] = []
+
+
+def _handler(sheet: _Sheet) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+        def _reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            with sheet.lock:
+                sheet.requests.append(dict(self.headers))
+                sheet.active += 1
+                sheet.peak = max(sheet.peak, sheet.active)
+                fail, sheet.fail = sheet.fail > 0, max(sheet.fail - 1, 0)
+                stale, sheet.stale = sheet.stale > 0, max(sheet.stale - 1, 0)
+            try:
+                time.sleep(sheet.delay)
+                gid = self.path.rsplit("=", 1)[-1]
+                etag = f'"v{sheet.version}-{gid}"'
+                if fail:
+                    return self._reply(503)
+                if stale or self.headers.get("If-None-Match") == etag:
+                    return self._reply(304, headers={"ETag": etag})
+                body = f"skip\ngid,version\n{gid},{sheet.version}\n".encode()
+                headers = {"ETag": etag, "Content-Type": "text/csv"}
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+                self._reply(200, body, headers)
+            finally:
+                with sheet.lock:
+                    sheet.active -= 1
+
+    return Handler
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[str, _Sheet]]:
+    sheet = _Sheet()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(sheet))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}/export?gid=", sheet
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def fetcher() -> SheetFetcher:
+    fetcher = SheetFetcher(backoff=0.0, timeout=(2.0, 5.0))
+    fetcher.session.trust_env = False  # never route the stand-in through a proxy
+    return fetcher
+
+
+def test_etag_then_not_modified(server: tuple[str, _Sheet], fetcher: SheetFetcher) -> None:
+    base, sheet = server
+    first = fetcher.fetch(base + "7", skiprows=1)
+    assert not first.not_modified and first.etag == '"v1-7"'
+    assert first.frame.to_dict("list") == {"gid": [7], "version": [1]}
+
+    second = fetcher.fetch(base + "7", skiprows=1)
+    assert second.not_modified and second.frame is first.frame
+    assert second.content_hash == first.content_hash
+    assert sheet.requests[-1]["If-None-Match"] == '"v1-7"'
+
+    sheet.version = 2
+    third = fetcher.fetch(base + "7", skiprows=1)
+    assert not third.not_modified and third.frame["version"].tolist() == [2]
+    assert third.content_hash != first.content_hash
+
+
+def test_gzip(server: tuple[str, _Sheet], fetcher: SheetFetcher) -> None:
+    base, sheet = server
+    result = fetcher.fetch(base + "1", skiprows=1)
+    assert "gzip" in sheet.requests[-1]["Accept-Encoding"]
+    assert result.frame["gid"].tolist() == [1]
+
+
+def test_retries_on_503(server: tuple[str, _Sheet], fetcher: SheetFetcher) -> None:
+    base, sheet = server
+    sheet.fail = 2
+    result = fetcher.fetch(base + "3", skiprows=1)
+    assert result.frame["gid"].tolist() == [3]
+    assert len(sheet.requests) == 3
+
+
+def test_not_modified_without_cache_refetches(server: tuple[str, _Sheet], fetcher: SheetFetcher) -> None:
+    base, sheet = server
+    sheet.stale = 1
+    result = fetcher.fetch(base + "4", skiprows=1)
+    assert not result.not_modified and result.frame["gid"].tolist() == [4]
+    assert len(sheet.requests) == 2 and "If-None-Match" not in sheet.requests[-1]
+
+
+def test_fetch_many_is_concurrent(server: tuple[str, _Sheet], fetcher: SheetFetcher) -> None:
+    base, sheet = server
+    sheet.delay = 0.3
+    gids = {f"tab{g}": base + str(g) for g in range(4)}
+    start = time.perf_counter()
+    results = fetcher.fetch_many(gids, skiprows=1)
+    elapsed = time.perf_counter() - start
+    assert {name: r.frame["gid"].item() for name, r in results.items()} == {f"tab{g}": g for g in range(4)}
+    assert sheet.peak > 1 and elapsed < 4 * sheet.delay
@@ -0,0 +1,56 @@
+# tests/test_filters.py
+"""`FilterIndex` against a boolean-mask filter plus a stable sort."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.filters import FilterIndex
+
+
+@pytest.fixture
+def scored() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 300
+    score = np.round(rng.uniform(0, 100, n) / 5) * 5  # ties
+    score[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "smartscore": score,
+        "sector": rng.choice(["Energy", "Banks", "IT", None], n),
+        "category": pd.Categorical(rng.choice(["Large", "Mid", "Small"], n)),
+        "tag": rng.choice(["BUY", "WATCH", "AVOID"], n),
+    })
+
+
+def _reference(df: pd.DataFrame, selections: dict, score_range: tuple[float, float]) -> np.ndarray:
+    mask = df["smartscore"].between(*score_range)
+    for col, values in selections.items():
+        if values:
+            mask &= df[col].isin(values)
+    hits = df[mask.to_numpy()].reset_index()
+    return hits.sort_values("smartscore", ascending=False, kind="stable")["index"].to_numpy()
+
+
+@pytest.mark.parametrize("selections, score_range", [
+    ({}, (0, 100)),
+    ({"sector": ["IT"]}, (0, 100)),
+    ({"sector": ["IT", "Banks"], "tag": ["BUY"]}, (20, 80)),
+    ({"category": ["Mid"], "tag": []}, (50, 50)),
+    ({"sector": ["Nowhere"]}, (0, 100)),
+    ({}, (90, 10)),
+])
+def test_query_matches_pandas(scored: pd.DataFrame, selections: dict, score_range: tuple) -> None:
+    index = FilterIndex(scored)
+    np.testing.assert_array_equal(index.query(selections, score_range), _reference(scored, selections, score_range))
+
+
+def test_unindexed_column(scored: pd.DataFrame) -> None:
+    with pytest.raises(KeyError):
+        FilterIndex(scored).query({"industry": ["x"]})
+
+
+def test_empty_frame(scored: pd.DataFrame) -> None:
+    index = FilterIndex(scored.iloc[:0])
+    assert len(index) == 0
+    assert index.query({"sector": ["IT"]}).size == 0
@@ -0,0 +1,23 @@
+# tests/test_import_budget.py
+"""The dashboard's startup imports stay within `benchmarks.import_budget`."""
+from __future__ import annotations
+
+from benchmarks.import_budget import DEFERRED, STARTUP, ImportProfile, check, profile_imports
+
+
+def test_startup_within_budget() -> None:
+    best = min((profile_imports() for _ in range(3)), key=lambda p: p.total_us)
+    assert check(best) == [], best.heaviest()
+
+
+def test_startup_modules_are_known() -> None:
+    assert "dashboard.data_handle" in STARTUP
+    assert not any(m == d or m.startswith(d + ".") for m in STARTUP for d in DEFERRED)
+
+
+def test_deferred_import_fails_check() -> None:
+    profile = ImportProfile(1000, {"config": 500, "signals.engine": 400, "alerts.rules": 100})
+    problems = check(profile)
+    assert len(problems) == 2
+    assert any("signals.engine" in p for p in problems) and any("alerts" in p for p in problems)
+    assert check(ImportProfile(1000, {"config": 1000}), budget_ms=0.5)[0].startswith("startup imports took")
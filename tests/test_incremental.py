@@ -0,0 +1,113 @@
+# tests/test_incremental.py
+"""`RankIndex` and `LiveScorer` against a full recompute."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.engine import score_frame
+from signals.incremental import LiveScorer, RankIndex
+from signals.ranking import pct_rank
+
+
+def _pandas_pct(values: np.ndarray) -> np.ndarray:
+    return pd.Series(values).rank(pct=True).to_numpy()
+
+
+def test_rank_index_matches_pandas() -> None:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(0, 3, 300))
+    values[rng.random(300) < 0.1] = np.nan
+    index = RankIndex(values)
+    np.testing.assert_allclose(index.pct(), _pandas_pct(values), atol=1e-12)
+    assert len(index) == np.count_nonzero(~np.isnan(values))
+
+
+def test_rank_index_updates_match_recompute() -> None:
+    rng = np.random.default_rng(1)
+    values = np.round(rng.normal(0, 3, 200))
+    values[:10] = np.nan
+    index = RankIndex(values)
+    for _ in range(50):
+        rows = rng.choice(values.size, rng.integers(1, 6), replace=False)
+        new = np.round(rng.normal(0, 3, rows.size))
+        new[rng.random(rows.size) < 0.2] = np.nan  # values appear and vanish
+        before = index.pct()
+        dirty = index.update(rows, new)
+        values[rows] = new
+        after = index.pct()
+        np.testing.assert_allclose(after, _pandas_pct(values), atol=1e-12)
+        moved = np.flatnonzero(~np.isclose(before, after, equal_nan=True))
+        assert np.isin(moved, dirty).all()
+
+
+@pytest.mark.parametrize("tie_tol", [0.0, 0.3])
+def test_rank_index_point_ranks_match_pct_rank(tie_tol: float) -> None:
+    rng = np.random.default_rng(2)
+    values = np.round(rng.normal(0, 3, 300), 1)
+    values[rng.random(300) < 0.1] = np.nan
+    index = RankIndex(values, tie_tol)
+    for _ in range(20):
+        rows = rng.choice(values.size, 4, replace=False)
+        new = np.round(rng.normal(0, 3, rows.size), 1)
+        index.update(rows, new)
+        values[rows] = new
+        expected = pct_rank(values, nan="keep", ties="average", tie_tol=tie_tol)
+        np.testing.assert_allclose(index.pct(np.arange(values.size)), expected, atol=1e-12)
+        np.testing.assert_allclose(index.pct(), expected, atol=1e-12)
+
+
+def test_rank_index_noop_update() -> None:
+    index = RankIndex(np.array([1.0, np.nan, 2.0]))
+    assert index.update(np.array([0, 1]), np.array([1.0, np.nan])).size == 0
+
+
+def test_rank_index_empty() -> None:
+    index = RankIndex(np.array([]))
+    assert len(index) == 0 and index.pct().shape == (0,)
+
+
+def test_rank_index_tie_tolerance() -> None:
+    values = np.array([1.0, 1.0 + 1e-12, 3.0, 2.0])
+    index = RankIndex(values, tie_tol=1e-9)
+    np.testing.assert_allclose(index.pct(), [1.5 / 4, 1.5 / 4, 1.0, 3 / 4])
+    index.update(np.array([3]), np.array([1.0 - 1e-12]))
+    np.testing.assert_allclose(index.pct(), [2 / 4, 2 / 4, 1.0, 2 / 4])
+
+
+def test_live_scorer_matches_score_frame(watchlist: pd.DataFrame) -> None:
+    live = LiveScorer(watchlist)
+    pd.testing.assert_frame_equal(live.frame, score_frame(watchlist), check_exact=True)
+
+
+def test_live_scorer_updates_match_recompute(watchlist: pd.DataFrame) -> None:
+    rng = np.random.default_rng(2)
+    live = LiveScorer(watchlist)
+    current = watchlist.copy()
+    columns = ["current_price", "rvol", "7_days_volume", "pe", "1_year", "20_day_avg", "eps_pct_change"]
+    for step in range(20):
+        rows = rng.choice(len(current), rng.integers(1, 6), replace=False)
+        changes = pd.DataFrame({"ticker": current["ticker"].to_numpy()[rows]})
+        for col in rng.choice(columns, 3, replace=False):
+            new = np.round(rng.normal(50, 30, rows.size))
+            new[rng.random(rows.size) < 0.2] = np.nan
+            if step % 5 == 0:  # unchanged values
+                new = current[col].to_numpy()[rows]
+            changes[col] = new
+            current.iloc[rows, current.columns.get_loc(col)] = new
+        before = live.frame
+        rescored = live.update_tickers(changes)
+        after = live.frame
+        pd.testing.assert_frame_equal(after, score_frame(current), check_exact=True)
+        moved = ~(before.eq(after) | (before.isna() & after.isna())).all(axis=1)
+        assert set(rescored.index) == set(after.index[moved]) | set(rows)
+
+
+def test_live_scorer_edge_cases(watchlist: pd.DataFrame) -> None:
+    live = LiveScorer(watchlist)
+    unchanged = live.update_tickers(pd.DataFrame({"ticker": pd.Series([], dtype=object)}))
+    assert unchanged.empty
+    pd.testing.assert_frame_equal(live.frame, score_frame(watchlist), check_exact=True)
+    with pytest.raises(KeyError):
+        live.update_tickers(pd.DataFrame({"ticker": ["NOPE"], "pe": [1.0]}))
@@ -0,0 +1,72 @@
+# tests/test_memo.py
+"""`StageMemo` invalidation: each stage reruns only when what it reads changes."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clean.schema import apply_schema
+from config import SMART_WEIGHTS
+from conftest import make_watchlist
+from signals.engine import compute_scores
+from signals.memo import STAGES, StageMemo
+
+_READ = sorted({col for st in STAGES for col in st.columns})
+
+
+def _readers(col: str) -> set[str]:
+    """Stages reading *col*, directly or through an upstream stage."""
+    hit = set()
+    for st in STAGES:  # dependency order
+        if col in st.columns or hit.intersection(st.after):
+            hit.add(st.name)
+    return hit
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return apply_schema(make_watchlist(300, seed=3))
+
+
+def _assert_same(actual: dict[str, np.ndarray], expected: dict[str, np.ndarray]) -> None:
+    assert actual.keys() == expected.keys()
+    for col, values in expected.items():
+        np.testing.assert_array_equal(actual[col], values, err_msg=col)
+
+
+def test_cold_then_warm(frame: pd.DataFrame) -> None:
+    memo = StageMemo()
+    _assert_same(memo.compute(frame), compute_scores(frame))
+    assert set(memo.recomputed) == {st.name for st in STAGES}
+    _assert_same(memo.compute(frame.copy()), compute_scores(frame))
+    assert memo.recomputed == ()
+
+
+@pytest.mark.parametrize("col", [c for c in _READ if c in make_watchlist(1).columns])
+def test_column_change_reruns_its_readers(frame: pd.DataFrame, col: str) -> None:
+    memo = StageMemo()
+    memo.sub_scores(frame)
+    changed = frame.copy()
+    changed.loc[changed.index[:5], col] = changed[col].iloc[:5] + 1.5
+    _assert_same(memo.compute(changed), compute_scores(changed))
+    assert set(memo.recomputed) == _readers(col)
+
+
+def test_unread_column_change_hits(frame: pd.DataFrame) -> None:
+    memo = StageMemo()
+    memo.sub_scores(frame)
+    unread = [c for c in frame.select_dtypes("number").columns if c not in _READ]
+    assert unread
+    changed = frame.assign(**{col: frame[col] + 1 for col in unread}, name="x")
+    memo.sub_scores(changed)
+    assert memo.recomputed == ()
+
+
+def test_weights_and_thresholds_rescore_only(frame: pd.DataFrame) -> None:
+    memo = StageMemo()
+    memo.compute(frame)
+    weights = dict(zip(SMART_WEIGHTS, reversed(list(SMART_WEIGHTS.values()))))
+    for args in ((weights,), (weights, 55.0, 35.0)):
+        _assert_same(memo.compute(frame, *args), compute_scores(frame, *args))
+        assert memo.recomputed == ()
@@ -0,0 +1,62 @@
+# tests/test_metrics.py
+"""Per-stage peak memory (tracemalloc) alongside the end-of-run RSS delta."""
+from __future__ import annotations
+
+import tracemalloc
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import metrics
+
+
+@pytest.fixture
+def traced() -> Iterator[None]:
+    was_tracing = tracemalloc.is_tracing()
+    metrics.set_enabled(True)
+    metrics.set_trace_memory(True)
+    metrics.METRICS.reset()
+    try:
+        yield
+    finally:
+        metrics.set_trace_memory(False)
+        metrics.set_enabled(metrics.METRICS_ENABLED)
+        metrics.METRICS.reset()
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def _peaks() -> pd.Series:
+    return metrics.METRICS.frame().set_index("stage")["max_peak_mb"]
+
+
+def test_transient_peak_is_recorded(traced: None) -> None:
+    with metrics.stage("outer"):
+        scratch = np.ones(4_000_000)  # 30.5 MB, freed before the stage ends
+        del scratch
+        with metrics.stage("inner"):
+            scratch = np.ones(1_000_000)  # 7.6 MB
+            del scratch
+    peaks = _peaks()
+    assert 29 < peaks["outer"] < 33
+    assert 7 < peaks["inner"] < 9
+    assert metrics.METRICS.frame().set_index("stage").loc["outer", "max_rss_growth_mb"] < 29
+
+
+def test_nested_peak_counts_for_the_outer_stage(traced: None) -> None:
+    with metrics.stage("outer"):
+        with metrics.stage("inner"):
+            scratch = np.ones(2_000_000)
+            del scratch
+    peaks = _peaks()
+    assert peaks["outer"] >= peaks["inner"] > 14
+
+
+def test_untraced_stage_reports_zero(traced: None) -> None:
+    metrics.set_trace_memory(False)
+    with metrics.stage("untraced"):
+        np.ones(1_000_000)
+    assert _peaks()["untraced"] == 0
+    assert 'mantra_stage_peak_bytes{process="' in metrics.METRICS.to_prometheus()
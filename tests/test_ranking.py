@@ -0,0 +1,93 @@
+# tests/test_ranking.py
+"""`signals.ranking` against ``Series.rank(pct=True)``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.ranking import TDigest, pct_rank, rank_columns, rank_series
+
+TIES = ("average", "min", "max", "first")
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    x = np.round(rng.normal(0, 3, (500, 4)))  # many ties
+    x[rng.random(x.shape) < 0.1] = np.nan
+    x[:, 3] = np.nan  # one all-NaN column
+    return x
+
+
+@pytest.mark.parametrize("ties", TIES)
+def test_rank_columns_matches_pandas(values: np.ndarray, ties: str) -> None:
+    expected = pd.DataFrame(values).rank(pct=True, method=ties).to_numpy()
+    np.testing.assert_allclose(rank_columns(values, ties=ties), expected, rtol=0, atol=1e-12)
+
+
+def test_nan_policies(values: np.ndarray) -> None:
+    frame = pd.DataFrame(values)
+    np.testing.assert_allclose(rank_columns(values, nan="zero"), frame.fillna(0).rank(pct=True).to_numpy())
+    np.testing.assert_allclose(rank_columns(values, nan="floor"), frame.rank(pct=True).fillna(0).to_numpy())
+
+
+def test_empty_and_single() -> None:
+    assert rank_columns(np.empty((0, 3))).shape == (0, 3)
+    assert pct_rank(np.array([])).shape == (0,)
+    assert pct_rank(np.array([7.0])).tolist() == [1.0]
+    assert np.isnan(pct_rank(np.array([np.nan, np.nan]))).all()
+
+
+def test_tie_tolerance_chains_close_values() -> None:
+    x = np.array([1.0, 1.0 + 1e-12, 2.0, 1.0 - 1e-12])
+    np.testing.assert_allclose(pct_rank(x, tie_tol=1e-9), [2 / 4, 2 / 4, 4 / 4, 2 / 4])
+    np.testing.assert_allclose(pct_rank(x), pd.Series(x).rank(pct=True).to_numpy())
+
+
+def test_rank_series_keeps_index_and_na() -> None:
+    s = pd.Series([3, pd.NA, 1, 3], index=list("abcd"), dtype="Int64")
+    pd.testing.assert_series_equal(rank_series(s), s.astype("float64").rank(pct=True))
+
+
+def test_invalid_policies() -> None:
+    with pytest.raises(ValueError):
+        rank_columns(np.ones(3), nan="drop")
+    with pytest.raises(ValueError):
+        rank_columns(np.ones(3), ties="dense")
+    with pytest.raises(ValueError):
+        rank_columns(np.ones(3), ties="min", compression=100)
+
+
+def test_digest_is_exact_for_small_universes() -> None:
+    x = np.round(np.random.default_rng(1).normal(0, 10, 300))  # < compression distinct values
+    x[::17] = np.nan
+    expected = pd.Series(x).rank(pct=True).to_numpy()
+    np.testing.assert_allclose(pct_rank(x, compression=200), expected, atol=1e-12)
+
+
+def test_digest_error_is_bounded() -> None:
+    x = np.random.default_rng(2).normal(size=50_000)
+    exact = pct_rank(x)
+    approx = pct_rank(x, compression=200)
+    assert np.abs(approx - exact).max() < 0.01
+
+
+def test_digest_merge_matches_single_pass() -> None:
+    x = np.random.default_rng(3).normal(size=20_000)
+    merged = TDigest(200)
+    for part in np.array_split(x, 4):
+        worker = TDigest(200)
+        worker.update(part)
+        merged.merge(worker)
+    assert merged.count == x.size
+    assert np.abs(merged.pct(x) - pct_rank(x)).max() < 0.01
+
+
+def test_empty_digest() -> None:
+    digest = TDigest()
+    digest.update(np.array([np.nan]))
+    assert digest.count == 0
+    assert np.isnan(digest.pct(np.array([1.0, 2.0]))).all()
+    with pytest.raises(ValueError):
+        TDigest(5)
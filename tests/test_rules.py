@@ -0,0 +1,124 @@
+# tests/test_rules.py
+"""`RuleSet` against pandas comparisons, and `AlertEngine` de-duplication."""
+from __future__ import annotations
+
+import operator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alerts.rules import AlertEngine, All, Condition, RuleSet, parse_rule
+
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+        "==": operator.eq, "!=": operator.ne}
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 200
+    score = np.round(rng.uniform(0, 100, n))
+    score[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "ticker": [f"T{i}" for i in range(n)],
+        "momentum_score": score,
+        "value_score": np.round(rng.uniform(0, 100, n)),
+        "name": rng.choice(["alpha", "beta", "gamma", None], n),
+        "sector": pd.Categorical(rng.choice(["Energy", "IT", None], n)),
+    })
+
+
+def _reference(df: pd.DataFrame, node) -> pd.Series:
+    """Nulls only satisfy ``!=``, like NaN in a numeric comparison."""
+    if isinstance(node, Condition):
+        col = df[node.column]
+        if isinstance(node.value, str):
+            col = col.astype(object)
+            present = col.notna()
+            result = pd.Series(node.op == "!=", index=df.index)
+            result[present] = _OPS[node.op](col[present].astype(str), node.value).to_numpy(dtype=bool)
+            return result
+        return _OPS[node.op](col, node.value).fillna(False).astype(bool)
+    parts = [_reference(df, p) for p in node.parts]
+    combine = operator.and_ if isinstance(node, All) else operator.or_
+    out = parts[0]
+    for part in parts[1:]:
+        out = combine(out, part)
+    return out
+
+
+RULES = [
+    {"name": "momentum", "when": "momentum_score >= 90"},
+    {"name": "contrast", "when": {"all": ["value_score <= 30", "momentum_score >= 70"]}},
+    {"name": "either", "when": {"any": ["momentum_score < 5", {"all": ["value_score > 95", "name == beta"]}]}},
+    {"name": "not_nan", "when": "momentum_score != 50"},
+    {"name": "text_order", "when": "name >= beta"},
+    {"name": "text_ne", "when": "sector != IT"},
+    {"name": "categorical", "when": {"all": ["sector == Energy", "momentum_score > 50"]}},
+]
+
+
+def test_ruleset_matches_pandas(frame: pd.DataFrame) -> None:
+    rules = [parse_rule(r) for r in RULES]
+    hits, available = RuleSet(rules).evaluate(frame)
+    assert available.all()
+    for r, rule in enumerate(rules):
+        np.testing.assert_array_equal(hits[:, r], _reference(frame, rule.when).to_numpy(), err_msg=rule.name)
+
+
+def test_missing_column_makes_rule_unavailable(frame: pd.DataFrame) -> None:
+    hits, available = RuleSet([
+        {"name": "gone", "when": "industry == Banks"},
+        {"name": "partly", "when": {"any": ["industry == Banks", "value_score > 50"]}},
+    ]).evaluate(frame)
+    assert available.tolist() == [False, True]
+    assert not hits[:, 0].any()
+    np.testing.assert_array_equal(hits[:, 1], frame["value_score"].gt(50).to_numpy())
+
+
+def test_empty_frame(frame: pd.DataFrame) -> None:
+    hits, _ = RuleSet(RULES).evaluate(frame.iloc[:0])
+    assert hits.shape == (0, len(RULES))
+
+
+@pytest.mark.parametrize("literal, value", [
+    ("70", 70.0), ("-1.5", -1.5), ("1e3", 1000.0), (".5", 0.5),
+    ("nan", "nan"), ("inf", "inf"), ("1_000", "1_000"), ("'70'", "70"), ('"nan"', "nan"), ("beta", "beta"),
+])
+def test_condition_literals(literal: str, value: object) -> None:
+    cond = parse_rule({"name": "r", "when": f"name == {literal}"}).when
+    assert cond == Condition("name", "==", value) and type(cond.value) is type(value)
+
+
+def test_nan_text_is_not_a_number() -> None:
+    df = pd.DataFrame({"ticker": ["A", "B", "C"], "name": ["nan", None, "x"]})
+    hits, _ = RuleSet([{"name": "r", "when": "name == nan"}]).evaluate(df)
+    assert hits[:, 0].tolist() == [True, False, False]
+
+
+def test_invalid_rules() -> None:
+    with pytest.raises(ValueError):
+        parse_rule({"name": "r", "when": "momentum_score ~ 5"})
+    with pytest.raises(ValueError):
+        RuleSet([{"name": "r", "when": "a > 1"}, {"name": "r", "when": "b > 1"}])
+
+
+def test_engine_fires_once_per_version(frame: pd.DataFrame, tmp_path: Path) -> None:
+    clock = iter(range(0, 10_000, 10)).__next__
+    rules = [{"name": "top", "when": "momentum_score >= 90", "cooldown": 1000}]
+    engine = AlertEngine(rules, state_path=tmp_path / "state.json", clock=clock)
+    first = engine.evaluate(frame, "v1")
+    expected = frame.loc[frame["momentum_score"] >= 90, "ticker"].tolist()
+    assert [list(e.tickers) for e in first] == [expected]
+
+    # Same version again, here or in another process sharing the state file
+    assert engine.evaluate(frame, "v1") is first
+    other = AlertEngine(rules, state_path=tmp_path / "state.json", clock=clock)
+    assert [list(e.tickers) for e in other.evaluate(frame, "v1")] == [expected]
+
+    # Still active, and inside the cooldown after dropping out: nothing new
+    assert engine.evaluate(frame, "v2") == []
+    engine.evaluate(frame.assign(momentum_score=0.0), "v3")
+    assert other.evaluate(frame, "v4") == []
@@ -0,0 +1,91 @@
+# tests/test_snapshot_diff.py
+"""`diff_snapshots` against a ``merge``-based reference."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.snapshot_diff import TAGS, diff_snapshots, transition_alerts
+from tagging.tagger import TAG_AVOID, TAG_BUY, TAG_WATCH
+
+
+def _scored(tickers: list[object], seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = len(tickers)
+    score = np.round(rng.uniform(0, 100, n), 2)
+    score[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "ticker": tickers,
+        "name": [f"{t} Ltd" for t in tickers],
+        "smartscore": score,
+        "tag": rng.choice(TAGS, n),
+    })
+
+
+@pytest.fixture
+def frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    previous = _scored([f"T{i}" for i in range(200)], seed=1)
+    current = _scored([f"T{i}" for i in range(20, 230)], seed=2)
+    return previous, current
+
+
+def _joined(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    prev = previous.dropna(subset=["ticker"]).drop_duplicates("ticker", keep="last")
+    cur = current.dropna(subset=["ticker"]).drop_duplicates("ticker", keep="last")
+    joined = cur.merge(prev[["ticker", "tag", "smartscore"]], on="ticker", suffixes=("", "_prev"))
+    joined["delta"] = np.round(joined["smartscore"] - joined["smartscore_prev"], 2)
+    return joined
+
+
+def test_transitions_and_matrix(frames: tuple[pd.DataFrame, pd.DataFrame]) -> None:
+    previous, current = frames
+    diff = diff_snapshots(previous, current)
+    joined = _joined(previous, current)
+    expected = joined[joined["tag"] != joined["tag_prev"]]
+    assert diff.transitions["ticker"].tolist() == expected["ticker"].tolist()
+    assert (diff.transitions["tag"] != diff.transitions["tag_prev"]).all()
+
+    matrix = diff.matrix()
+    reference = pd.crosstab(expected["tag_prev"], expected["tag"]).reindex(index=TAGS, columns=TAGS, fill_value=0)
+    np.testing.assert_array_equal(matrix.to_numpy(), reference.to_numpy())
+    assert np.diag(matrix.to_numpy()).sum() == 0
+    assert matrix.to_numpy().sum() == len(diff.transitions)
+
+
+@pytest.mark.parametrize("top", [0, 5, 1000])
+def test_movers(frames: tuple[pd.DataFrame, pd.DataFrame], top: int) -> None:
+    previous, current = frames
+    diff = diff_snapshots(previous, current, top=top)
+    joined = _joined(previous, current).dropna(subset=["delta"])
+    expected = joined.assign(size=joined["delta"].abs()).sort_values("size", ascending=False, kind="stable")
+    assert diff.movers["ticker"].tolist() == expected["ticker"].iloc[:top].tolist()
+    np.testing.assert_allclose(diff.movers["delta"], expected["delta"].iloc[:top])
+
+
+def test_added_removed(frames: tuple[pd.DataFrame, pd.DataFrame]) -> None:
+    previous, current = frames
+    diff = diff_snapshots(previous, current)
+    assert diff.added["ticker"].tolist() == [f"T{i}" for i in range(200, 230)]
+    assert diff.removed["ticker"].tolist() == [f"T{i}" for i in range(20)]
+    assert list(diff.added.columns) == ["ticker", "name", "smartscore", "tag"]
+
+
+def test_missing_tickers_and_duplicates() -> None:
+    previous = pd.DataFrame({
+        "ticker": ["A", "B", None, "B"],
+        "smartscore": [10.0, 20.0, 30.0, 25.0],
+        "tag": [TAG_WATCH, TAG_AVOID, TAG_BUY, TAG_WATCH],
+    })
+    current = pd.DataFrame({
+        "ticker": ["A", np.nan, "C", "B"],
+        "smartscore": [50.0, 60.0, 70.0, 25.0],
+        "tag": [TAG_BUY, TAG_BUY, TAG_WATCH, TAG_WATCH],
+    })
+    diff = diff_snapshots(previous, current)
+    # The last key slot ("C") must not be claimed by a ticker-less row
+    assert diff.added["ticker"].tolist() == ["C"]
+    assert diff.removed.empty
+    assert diff.transitions[["ticker", "tag_prev", "tag"]].values.tolist() == [["A", TAG_WATCH, TAG_BUY]]
+    assert diff.movers["ticker"].tolist() == ["A", "B"]
+    assert transition_alerts(diff) == [f"🔼 Upgraded to {TAG_BUY}: A", "🆕 New tickers: C"]
@@ -0,0 +1,43 @@
+# tests/test_sweep.py
+"""`sweep` tag counts against the scoring engine, and empty inputs."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.sweep import sweep, threshold_pairs, weight_candidates
+from signals.engine import score_frame, smartscore_from, tags_from
+from tagging.tagger import TAG_BUY, TAG_WATCH
+
+
+@pytest.fixture
+def scored(watchlist: pd.DataFrame) -> pd.DataFrame:
+    return score_frame(watchlist)
+
+
+def test_counts_match_engine(scored: pd.DataFrame) -> None:
+    weights = weight_candidates(4, seed=2)
+    pairs = threshold_pairs(buy=(60, 70), watch=(40, 50))
+    out = sweep(scored, weights, pairs)
+    assert len(out) == len(weights) * len(pairs)
+    subs = {col: scored[col].to_numpy(dtype=np.float64) for col in scored.columns if col.endswith("_score")}
+    for row in out.itertuples(index=False):
+        score = smartscore_from(subs, weights.iloc[row.candidate].to_dict())
+        tags = tags_from(score, row.buy_th, row.watch_th)
+        assert row.n_buy == np.count_nonzero(tags == TAG_BUY)
+        assert row.n_watch == np.count_nonzero(tags == TAG_WATCH)
+        assert row.n_buy + row.n_watch + row.n_avoid == len(scored)
+
+
+@pytest.mark.parametrize("empty", ["weights", "thresholds"])
+def test_empty_inputs_keep_columns(scored: pd.DataFrame, empty: str) -> None:
+    weights, pairs = weight_candidates(3), threshold_pairs()
+    full = sweep(scored, weights, pairs)
+    out = sweep(
+        scored,
+        weights.iloc[:0] if empty == "weights" else weights,
+        pairs.iloc[:0] if empty == "thresholds" else pairs,
+    )
+    assert out.empty
+    pd.testing.assert_series_equal(out.dtypes, full.dtypes)
@@ -0,0 +1,71 @@
+# tests/test_topk.py
+"""`Ranker` against ``nlargest`` / ``sort_values`` / ``groupby().head``."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.topk import Ranker
+
+
+@pytest.fixture
+def scored() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 500
+    score = np.round(rng.uniform(0, 100, n) / 2) * 2  # ties
+    score[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "smartscore": score,
+        "momentum_score": np.round(rng.uniform(0, 100, n)),
+        "sector": rng.choice(["Energy", "Banks", "IT", None], n),
+    })
+
+
+def _positions(df: pd.DataFrame, index: pd.Index) -> np.ndarray:
+    return df.index.get_indexer(index)
+
+
+@pytest.mark.parametrize("k", [0, 1, 10, 64, 65, 499, 600])
+def test_top_matches_nlargest(scored: pd.DataFrame, k: int) -> None:
+    # nlargest(keep="first") semantics; pandas itself loses stability once k reaches the non-NaN count
+    ranked = scored["smartscore"].dropna().sort_values(ascending=False, kind="stable")
+    expected = _positions(scored, ranked.index[:k])
+    if k < scored["smartscore"].count():
+        np.testing.assert_array_equal(expected, _positions(scored, scored["smartscore"].nlargest(k).index))
+    np.testing.assert_array_equal(Ranker(scored).top(k), expected)
+    warm = Ranker(scored)
+    warm.order()
+    np.testing.assert_array_equal(warm.top(k), expected)
+
+
+def test_top_keeps_nan_last_without_dropna(scored: pd.DataFrame) -> None:
+    ordered = scored.sort_values("smartscore", ascending=False, kind="stable", na_position="last")
+    np.testing.assert_array_equal(Ranker(scored).top(len(scored), dropna=False), _positions(scored, ordered.index))
+    np.testing.assert_array_equal(Ranker(scored).order(), _positions(scored, ordered.index))
+
+
+def test_top_within_mask(scored: pd.DataFrame) -> None:
+    mask = scored["sector"].eq("IT")
+    expected = scored.loc[mask, "smartscore"].nlargest(7, keep="first").index
+    np.testing.assert_array_equal(Ranker(scored).top(7, mask=mask), _positions(scored, expected))
+
+
+@pytest.mark.parametrize("then", [None, "momentum_score"])
+def test_top_by_matches_groupby_head(scored: pd.DataFrame, then: str | None) -> None:
+    keys = ["smartscore"] if then is None else ["smartscore", then]
+    ordered = scored.sort_values(keys, ascending=False, kind="stable", na_position="last")
+    expected = {
+        sector: _positions(scored, group.index)
+        for sector, group in ordered.groupby("sector", sort=False).head(3).groupby("sector", sort=False)
+    }
+    got = Ranker(scored).top_by("sector", 3, then=then)
+    assert got.keys() == expected.keys()
+    for sector, positions in expected.items():
+        np.testing.assert_array_equal(got[sector], positions)
+
+
+def test_empty_frame(scored: pd.DataFrame) -> None:
+    ranker = Ranker(scored.iloc[:0])
+    assert ranker.top(5).size == 0
+    assert ranker.top_by("sector", 3) == {}
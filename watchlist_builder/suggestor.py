@@ -7,16 +7,20 @@ Pure function only.
 """
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 from typing import Optional
 
+from features.topk import Ranker
+
 __all__ = ['build_watchlist']
 
 def build_watchlist(
     df: pd.DataFrame,
     tag: Optional[str] = None,
     min_score: Optional[float] = None,
-    max_items: int = 50
+    max_items: int = 50,
+    ranker: Optional[Ranker] = None,
 ) -> pd.DataFrame:
     """
     Build a watchlist by filtering on tag and SmartScore threshold,
@@ -27,20 +31,17 @@ def build_watchlist(
         tag: If set, filter by this tag (e.g., '🟢 BUY').
         min_score: If set, only include stocks with SmartScore >= min_score.
         max_items: Maximum number of items in the watchlist.
+        ranker: Shared `Ranker` of the data version (reuses its order).
 
     Returns:
         A DataFrame of the selected watchlist.
     """
-    work = df.copy()
-
+    mask = np.ones(len(df), dtype=bool)
     if tag:
-        work = work[work['tag'] == tag]
+        mask &= (df['tag'] == tag).to_numpy()
     if min_score is not None:
-        work = work[work['smartscore'] >= min_score]
-
-    watch = (
-        work.sort_values('smartscore', ascending=False)
-        .head(max_items)
-        .reset_index(drop=True)
-    )
-    return watch
+        mask &= (df['smartscore'] >= min_score).to_numpy()
+
+    ranker = ranker or Ranker(df)
+    rows = ranker.top(max_items, 'smartscore', mask=mask, dropna=False)
+    return df.take(rows).reset_index(drop=True)